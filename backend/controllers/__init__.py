@@ -2,10 +2,12 @@ from .bot import BotController
 from .recipe import RecipeController
 from .item import ItemController
 from .transaction import TransactionController
+from .dashboard import DashboardController
 
 __all__ = [
   'RecipeController', 
   'ItemController', 
   'BotController',
-  'TransactionController'
+  'TransactionController',
+  'DashboardController'
 ]
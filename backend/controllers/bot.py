@@ -1,34 +1,45 @@
 from fastapi import Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
-from database.database import get_db
-from models import Bot
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_async_db, get_async_sessionmaker
+from models import Bot, Item, Transaction, Recipe, RecipeItem
 from services.graph.agents.extractor import optical_extractor, audio_extractor
-from repositories import BotRepository
-from schemas import BotRequest, BotResponse
-from datetime import datetime
+from repositories import AsyncBotRepository
+from schemas import BotRequest, BotResponse, JobResponse
+from utils.cache import response_cache
+from utils.semantic_cache import bot_answer_cache, is_cacheable_question
+from utils.executor import graph_executor, ExecutorBusy
+from utils.jobs import job_queue, JobError, JobQueueFull, run_with_backoff
+from services.graph.router import log_route
+from datetime import datetime, date
+from typing import Any, AsyncIterator
+import asyncio
+import json
+import re
 import uuid
-import base64
-import binascii
+
+# Tabelas que as respostas do bot consultam; uma escrita em qualquer uma muda o carimbo do cache
+BOT_TABLES = (Item.__tablename__, Transaction.__tablename__, Recipe.__tablename__, RecipeItem.__tablename__)
+# Nós cujo texto gerado já é a resposta final e pode ir para o cliente token a token
+STREAMED_NODES = ("trivial", "web")
+BOT_BUSY_DETAIL = "Chatbot ocupado, tente novamente em instantes."
+# Tempo máximo que a consulta de um job pode esperar ele terminar
+JOB_MAX_WAIT_SECONDS = 30
+BASE64_PATTERN = re.compile(r"[A-Za-z0-9+/]*={0,2}")
 
 class BotController:
     @staticmethod
-    async def process_message(request: BotRequest, db: Session = Depends(get_db)):
+    async def process_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
         """Processa a mensagem do usuário, interage com o grafo e salva a resposta."""
-        from services.graph.graph import graph
-
         user_msg = request.user_message.strip()
         if request.thread_id is not None:
             thread_id = request.thread_id
         else:
             thread_id = str(uuid.uuid4())
 
-        response = graph.invoke({'user_input': user_msg}, {"configurable": {"thread_id": str(thread_id)}})
-        final_answer = response.get("final_answer")
-        ai_message = parse_final_answer(final_answer)
-
-        create_at = response.get("create_at", datetime.now())
+        ai_message, create_at = await run_graph(user_msg, thread_id)
 
-        message = BotRepository.save(db, Bot(
+        message = await AsyncBotRepository.save(db, Bot(
             thread_id=thread_id,
             user_message=user_msg,
             ai_message=ai_message,
@@ -37,14 +48,31 @@ class BotController:
         return BotResponse.model_validate(message)
 
     @staticmethod
-    async def process_image_message(request: BotRequest, db: Session = Depends(get_db)):
+    async def stream_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)) -> StreamingResponse:
+        """
+            Processa a mensagem do usuário enviando eventos SSE enquanto o grafo executa:
+            start, node (a cada nó concluído), token (texto da resposta final sendo gerado),
+            answer (resposta completa) e done (mensagem salva). Em caso de falha envia error.
+        """
+        user_msg = request.user_message.strip()
+        if request.thread_id is not None:
+            thread_id = request.thread_id
+        else:
+            thread_id = str(uuid.uuid4())
+
+        return StreamingResponse(
+            stream_events(user_msg, thread_id, db),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    @staticmethod
+    async def process_image_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
         """
             Processa imagens enviadas pelo usuário, interage com o grafo e salva a resposta.
             Args:
                 request: Corpo enviado pela requisição, precisa ter o atributo image_b64
         """
-        from services.graph.graph import graph
-
         if not request.image_b64 or not is_valid_base64(request.image_b64):
             raise HTTPException(400, "Imagem inválida")
 
@@ -54,18 +82,14 @@ class BotController:
         else:
             thread_id = str(uuid.uuid4())
 
-        extractor_response = optical_extractor(image_b64)
+        extractor_response = await run_blocking(optical_extractor, image_b64)
         extractor_answer = extractor_response.get("final_answer")
         extractor_message = parse_final_answer(extractor_answer)
 
         if extractor_message != "":
-            response = graph.invoke({'user_input': extractor_message}, {"configurable": {"thread_id": str(thread_id)}})
-            final_answer = response.get("final_answer")
-            ai_message = parse_final_answer(final_answer)
-
-            create_at = response.get("create_at", datetime.now())
+            ai_message, create_at = await run_graph(extractor_message, thread_id)
 
-            message = BotRepository.save(db, Bot(
+            message = await AsyncBotRepository.save(db, Bot(
                 thread_id=thread_id,
                 user_message=extractor_message,
                 ai_message=ai_message,
@@ -76,14 +100,12 @@ class BotController:
         raise HTTPException(400, "Imagem inválida")
 
     @staticmethod
-    async def process_audio_message(request: BotRequest, db: Session = Depends(get_db)):
+    async def process_audio_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
         """
             Processa áudios enviados pelo usuário, interage com o grafo e salva a resposta.
             Args:
                 request: Corpo enviado pela requisição, precisa ter o atributo audio_b64
         """
-        from services.graph.graph import graph
-
         if not request.audio_b64 or not is_valid_base64(request.audio_b64):
             raise HTTPException(400, "Áudio inválido")
 
@@ -93,18 +115,14 @@ class BotController:
         else:
             thread_id = str(uuid.uuid4())
 
-        extractor_response = audio_extractor(audio_b64)
+        extractor_response = await run_blocking(audio_extractor, audio_b64)
         extractor_answer = extractor_response.get("final_answer")
         extractor_message = parse_final_answer(extractor_answer)
 
         if extractor_message != "":
-            response = graph.invoke({'user_input': extractor_message}, {"configurable": {"thread_id": str(thread_id)}})
-            final_answer = response.get("final_answer")
-            ai_message = parse_final_answer(final_answer)
-
-            create_at = response.get("create_at", datetime.now())
+            ai_message, create_at = await run_graph(extractor_message, thread_id)
 
-            message = BotRepository.save(db, Bot(
+            message = await AsyncBotRepository.save(db, Bot(
                 thread_id=thread_id,
                 user_message=extractor_message,
                 ai_message=ai_message,
@@ -115,9 +133,55 @@ class BotController:
         raise HTTPException(400, "Áudio inválido")
 
     @staticmethod
-    def get_all_messages(db: Session = Depends(get_db)):
+    async def submit_image_job(request: BotRequest) -> JobResponse:
+        """
+            Valida a imagem e agenda a extração e o processamento pelo grafo, sem esperar.
+            O resultado é consultado em get_job.
+            Args:
+                request: Corpo enviado pela requisição, precisa ter o atributo image_b64
+        """
+        if not request.image_b64 or not is_valid_base64(request.image_b64):
+            raise HTTPException(400, "Imagem inválida")
+
+        job = submit_job("image", {
+            "media_b64": request.image_b64,
+            "thread_id": request.thread_id if request.thread_id is not None else str(uuid.uuid4())
+        })
+        return JobResponse.model_validate(job.to_dict())
+
+    @staticmethod
+    async def submit_audio_job(request: BotRequest) -> JobResponse:
+        """
+            Valida o áudio e agenda a extração e o processamento pelo grafo, sem esperar.
+            O resultado é consultado em get_job.
+            Args:
+                request: Corpo enviado pela requisição, precisa ter o atributo audio_b64
+        """
+        if not request.audio_b64 or not is_valid_base64(request.audio_b64):
+            raise HTTPException(400, "Áudio inválido")
+
+        job = submit_job("audio", {
+            "media_b64": extract_base64_from_data_url(request.audio_b64),
+            "thread_id": request.thread_id if request.thread_id is not None else str(uuid.uuid4())
+        })
+        return JobResponse.model_validate(job.to_dict())
+
+    @staticmethod
+    async def get_job(job_id: str, wait: float = 0) -> JobResponse:
+        """
+            Retorna o estado de um job.
+            Args:
+                wait: Segundos para esperar o job terminar antes de responder (long polling)
+        """
+        job = await job_queue.wait(job_id, min(max(wait, 0), JOB_MAX_WAIT_SECONDS))
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado.")
+        return JobResponse.model_validate(job.to_dict())
+
+    @staticmethod
+    async def get_all_messages(db: AsyncSession = Depends(get_async_db)):
         """Retorna todas as mensagens trocadas com o bot."""
-        messages = BotRepository.get_messages(db)
+        messages = await AsyncBotRepository.get_messages(db)
         if not messages:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Sem mensagens encontradas."
@@ -125,18 +189,213 @@ class BotController:
         return [BotResponse.model_validate(message) for message in messages]
 
 
+async def run_blocking(func, *args):
+    """
+        Executa uma chamada bloqueante (grafo ou extrator) no pool de threads do chatbot,
+        sem ocupar as threads das rotas síncronas. Com o pool cheio responde 503.
+    """
+    try:
+        return await graph_executor.run(func, *args)
+    except ExecutorBusy:
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, BOT_BUSY_DETAIL, headers={"Retry-After": "5"})
+
+def submit_job(kind: str, payload: dict):
+    """Coloca o job na fila; com a fila cheia responde 503 para o cliente tentar mais tarde"""
+    try:
+        return job_queue.submit(kind, payload)
+    except JobQueueFull:
+        raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, BOT_BUSY_DETAIL, headers={"Retry-After": "5"})
+
+async def run_job_blocking(func, *args):
+    """
+        Como run_blocking, mas para jobs: com o pool do chatbot cheio espera e tenta de
+        novo (backoff) em vez de falhar, já que o cliente não está esperando a resposta.
+    """
+    try:
+        return await run_with_backoff(graph_executor, func, *args)
+    except ExecutorBusy:
+        raise JobError(BOT_BUSY_DETAIL)
+
+async def run_extraction_job(extractor, payload: dict, invalid_detail: str) -> dict:
+    """
+        Executa um job de imagem ou áudio: extrai a mensagem, responde pelo grafo e salva a conversa.
+        Cada etapa respeita o limite de chamadas simultâneas do seu modelo.
+    """
+    async with job_queue.limit("extractor"):
+        extractor_response = await run_job_blocking(extractor, payload["media_b64"])
+    extractor_message = parse_final_answer(extractor_response.get("final_answer"))
+    if extractor_message == "":
+        raise JobError(invalid_detail)
+
+    async with job_queue.limit("graph"):
+        ai_message, create_at = await run_graph(extractor_message, payload["thread_id"], run_job_blocking)
+
+    async with get_async_sessionmaker()() as db:
+        message = await AsyncBotRepository.save(db, Bot(
+            thread_id=payload["thread_id"],
+            user_message=extractor_message,
+            ai_message=ai_message,
+            create_at=create_at
+        ))
+    return BotResponse.model_validate(message).model_dump()
+
+async def run_image_job(payload: dict) -> dict:
+    return await run_extraction_job(optical_extractor, payload, "Imagem inválida")
+
+async def run_audio_job(payload: dict) -> dict:
+    return await run_extraction_job(audio_extractor, payload, "Áudio inválido")
+
+job_queue.register("image", run_image_job)
+job_queue.register("audio", run_audio_job)
+
+def answer_stamp() -> tuple:
+    """
+        Carimbo das respostas em cache: versões das tabelas do bot e o dia atual
+        (respostas como "o que está vencido?" mudam com a data)
+    """
+    return response_cache.versions.snapshot(BOT_TABLES), date.today().isoformat()
+
+async def run_graph(user_input: str, thread_id: str, run=run_blocking) -> tuple[str, datetime]:
+    """
+        Responde a mensagem pelo grafo, ou pelo cache quando é uma pergunta somente
+        leitura já respondida com os mesmos dados.
+        Args:
+            run: Como executar o grafo bloqueante (run_blocking nas rotas, run_job_blocking nos jobs)
+        Returns:
+            Resposta do agente e data da resposta
+    """
+    from services.graph.graph import graph
+
+    cacheable = is_cacheable_question(user_input)
+    stamp = answer_stamp()
+    if cacheable:
+        cached_answer = bot_answer_cache.get(user_input, stamp)
+        if cached_answer is not None:
+            return cached_answer, datetime.now()
+
+    response = await run(graph.invoke, {'user_input': user_input}, {"configurable": {"thread_id": str(thread_id)}})
+    ai_message = record_graph_answer(user_input, response, cacheable, stamp)
+    return ai_message, response.get("create_at", datetime.now())
+
+def record_graph_answer(user_input: str, state: dict, cacheable: bool, stamp: tuple) -> str:
+    """
+        Extrai a resposta final do estado do grafo, registra a rota seguida e guarda
+        a resposta no cache quando a pergunta permite.
+    """
+    ai_message = parse_final_answer(state.get("final_answer"))
+    log_route(
+        user_input,
+        state.get("route"),
+        "fast" if state.get("fast_route") else "llm",
+        state.get("route_confidence")
+    )
+
+    # Só guarda se nenhuma tabela mudou durante a execução (o grafo também pode escrever)
+    if cacheable and ai_message and answer_stamp() == stamp:
+        bot_answer_cache.set(user_input, stamp, ai_message)
+    return ai_message
+
+async def stream_graph(user_input: str, thread_id: str) -> AsyncIterator[tuple[str, Any]]:
+    """
+        Executa graph.stream (atualizações dos nós e tokens dos modelos) em uma thread
+        e repassa cada parte (modo, conteúdo) ao loop assíncrono assim que é produzida.
+        Uma falha no grafo chega como ("error", exceção); sem vaga no pool levanta ExecutorBusy.
+    """
+    from services.graph.graph import graph
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    finished = object()
+
+    def produce():
+        try:
+            for part in graph.stream(
+                {'user_input': user_input},
+                {"configurable": {"thread_id": str(thread_id)}},
+                stream_mode=["updates", "messages"]
+            ):
+                loop.call_soon_threadsafe(queue.put_nowait, part)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, ("error", e))
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, finished)
+
+    producer = graph_executor.submit(produce)
+    while (part := await queue.get()) is not finished:
+        yield part
+    await producer
+
+async def stream_events(user_input: str, thread_id: str, db: AsyncSession) -> AsyncIterator[str]:
+    """Eventos SSE de uma mensagem; a resposta é salva no banco depois que o grafo termina"""
+    yield format_sse("start", {"thread_id": thread_id})
+
+    state = {}
+    cacheable = is_cacheable_question(user_input)
+    stamp = answer_stamp()
+    ai_message = bot_answer_cache.get(user_input, stamp) if cacheable else None
+
+    if ai_message is None:
+        try:
+            async for mode, chunk in stream_graph(user_input, thread_id):
+                if mode == "error":
+                    yield format_sse("error", {"detail": str(chunk)})
+                    return
+                if mode == "updates":
+                    for node, update in chunk.items():
+                        state.update(update or {})
+                        yield format_sse("node", {"node": node})
+                elif mode == "messages":
+                    message, metadata = chunk
+                    text = message_text(message)
+                    if text and graph_node(metadata) in STREAMED_NODES:
+                        yield format_sse("token", {"text": text})
+        except ExecutorBusy:
+            yield format_sse("error", {"detail": BOT_BUSY_DETAIL})
+            return
+        ai_message = record_graph_answer(user_input, state, cacheable, stamp)
+
+    yield format_sse("answer", {"text": ai_message})
+
+    message = await AsyncBotRepository.save(db, Bot(
+        thread_id=thread_id,
+        user_message=user_input,
+        ai_message=ai_message,
+        create_at=state.get("create_at", datetime.now())
+    ))
+    yield format_sse("done", BotResponse.model_validate(message).model_dump(mode="json"))
+
+def format_sse(event: str, data: dict) -> str:
+    """Formata um evento no padrão Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def graph_node(metadata: dict) -> str | None:
+    """
+        Nó do grafo principal que gerou um token. Os agentes dentro dos nós também
+        são grafos, então o nó externo é o primeiro trecho do namespace do checkpoint.
+    """
+    namespace = metadata.get("langgraph_checkpoint_ns") or ""
+    return namespace.split(":")[0] or metadata.get("langgraph_node")
+
+def message_text(message) -> str:
+    """Texto de um pedaço de mensagem do modelo (ignora chamadas de ferramenta)"""
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+        if not isinstance(part, dict) or part.get("type", "text") == "text"
+    )
+
 def is_valid_base64(data: str) -> bool:
     """
         Valida se uma str está em formato base64
         Args:
             data: informação no formato base64
     """
-    try:
-        clean_data = extract_base64_from_data_url(data)
-        base64.b64decode(clean_data, validate=True)
-        return True
-    except (binascii.Error, ValueError):
-        return False
+    # Mesma regra de b64decode(validate=True), sem decodificar (e descartar) o conteúdo inteiro
+    clean_data = extract_base64_from_data_url(data)
+    return len(clean_data) % 4 == 0 and BASE64_PATTERN.fullmatch(clean_data) is not None
 
 def parse_final_answer(final_answer: str) -> str:
     """
@@ -0,0 +1,47 @@
+import json
+import hashlib
+from typing import Optional, Dict, Any
+from fastapi import Depends, HTTPException, status, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+from database.database import get_db
+from models import Item, Transaction, Recipe, RecipeItem
+from repositories import DashboardRepository
+from utils.cache import cached
+
+DASHBOARD_TABLES = (Item.__tablename__, Transaction.__tablename__, Recipe.__tablename__, RecipeItem.__tablename__)
+
+
+class DashboardController:
+    @staticmethod
+    def get_dashboard(if_none_match: Optional[str] = None, db: Session = Depends(get_db)):
+        """
+        Retorna os dados consolidados do dashboard com um carimbo de versão (ETag).
+        Se o cliente já tiver a mesma versão, responde 304 sem corpo.
+        """
+        dashboard = DashboardController.get_dashboard_data(db)
+
+        etag = f'"{dashboard["version"]}"'
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        return JSONResponse(content=dashboard, headers={"ETag": etag})
+
+    @staticmethod
+    @cached("dashboard", DASHBOARD_TABLES)
+    def get_dashboard_data(db: Session = Depends(get_db)) -> Dict[str, Any]:
+        """Calcula os dados do dashboard junto com o carimbo de versão"""
+        try:
+            dashboard = DashboardRepository.find_dashboard(db)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+            )
+
+        return {**dashboard, "version": dashboard_version(dashboard)}
+
+
+def dashboard_version(dashboard: Dict[str, Any]) -> str:
+    """Carimbo de versão do dashboard: hash estável do conteúdo"""
+    payload = json.dumps(dashboard, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
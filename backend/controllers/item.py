@@ -2,19 +2,53 @@ from typing import List, Dict, Any
 from fastapi import Depends, HTTPException, status, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from database.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
 from models import Item
-from repositories import ItemRepository
-from schemas import ItemResponse, ItemRequest
+from repositories import ItemRepository, AsyncItemRepository
+from schemas import ItemResponse, ItemRequest, BulkResponse, BulkRowError
+from utils.unit_converter import apply_unit_codes
+from utils.cache import cached
+
+ITEM_TABLES = (Item.__tablename__,)
 
 class ItemController:
     @staticmethod
     def create(request: ItemRequest, db: Session = Depends(get_db)):
         """Cria um novo item após validações padrão."""
         default_validators(request)
-        item = ItemRepository.save(db, Item(**request.model_dump()))
+        item = Item(**request.model_dump())
+        apply_unit_codes(item)
+        item = ItemRepository.save(db, item)
         return ItemResponse.model_validate(item)
 
+    @staticmethod
+    def create_many(requests: List[ItemRequest], db: Session = Depends(get_db)) -> BulkResponse:
+        """
+        Cria vários itens de uma vez. Linhas que não passam nas validações padrão
+        são devolvidas em `errors` (com a posição na lista) e as demais são
+        inseridas juntas, em um único commit.
+        """
+        rows, errors = [], []
+        for index, request in enumerate(requests):
+            try:
+                default_validators(request)
+            except HTTPException as e:
+                errors.append(BulkRowError(index=index, detail=e.detail))
+                continue
+
+            item = Item(**request.model_dump())
+            apply_unit_codes(item)
+            rows.append({
+                **request.model_dump(),
+                "measure_code": item.measure_code,
+                "price_code": item.price_code,
+                "unit_factor": item.unit_factor
+            })
+
+        ids = ItemRepository.bulk_insert(db, rows)
+        return BulkResponse(created=len(ids), ids=ids, errors=errors)
+
     @staticmethod
     def find_all(db: Session = Depends(get_db)):
         """Retorna todos os itens cadastrados."""
@@ -37,6 +71,28 @@ class ItemController:
         items = ItemRepository.find_by_name(db, name)
         return [ItemResponse.model_validate(item) for item in items]
 
+    @staticmethod
+    async def find_all_async(db: AsyncSession = Depends(get_async_db)):
+        """Versão assíncrona de find_all, usada pelas rotas."""
+        items = await AsyncItemRepository.find_all(db)
+        return [ItemResponse.model_validate(item) for item in items]
+
+    @staticmethod
+    async def find_by_id_async(id: int, db: AsyncSession = Depends(get_async_db)):
+        """Versão assíncrona de find_by_id, usada pelas rotas."""
+        item = await AsyncItemRepository.find_by_id(db, id)
+        if not item:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Item não encontrado"
+            )
+        return ItemResponse.model_validate(item)
+
+    @staticmethod
+    async def find_by_name_async(name: str, db: AsyncSession = Depends(get_async_db)):
+        """Versão assíncrona de find_by_name, usada pelas rotas."""
+        items = await AsyncItemRepository.find_by_name(db, name)
+        return [ItemResponse.model_validate(item) for item in items]
+
     @staticmethod
     def delete_by_id(id: int, db: Session = Depends(get_db)):
         """Remove um item pelo seu ID após verificar sua existência."""
@@ -59,10 +115,13 @@ class ItemController:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Item não encontrado"
             )
 
-        item = ItemRepository.save(db, Item(id=id, **request.model_dump()))
+        item = Item(id=id, **request.model_dump())
+        apply_unit_codes(item)
+        item = ItemRepository.save(db, item)
         return ItemResponse.model_validate(item)
 
     @staticmethod
+    @cached("items/low-stock", ITEM_TABLES)
     def get_low_stock_items(threshold: int, db: Session = Depends(get_db)):
         """Retorna itens com estoque abaixo do limite especificado"""
         try:
@@ -74,6 +133,7 @@ class ItemController:
         )
     
     @staticmethod
+    @cached("items/expiring", ITEM_TABLES)
     def get_items_near_expiration(days: int, db: Session = Depends(get_db)):
         """Retorna itens que vencem nos próximos N dias"""
         try:
@@ -85,6 +145,7 @@ class ItemController:
         )
 
     @staticmethod
+    @cached("items/expired", ITEM_TABLES)
     def get_expired_items(db: Session = Depends(get_db)):
         """Retorna itens já vencidos"""
         try:
@@ -96,6 +157,7 @@ class ItemController:
         )
 
     @staticmethod
+    @cached("items/total-value", ITEM_TABLES)
     def get_total_item_value_by_id(id: int, db: Session = Depends(get_db)):
         """Retorna o valor total do estoque de um item específico"""
         if not ItemRepository.exists_by_id(db, id):
@@ -113,6 +175,7 @@ class ItemController:
             )
 
     @staticmethod
+    @cached("items/inventory-value", ITEM_TABLES)
     def get_total_inventory_value(db: Session = Depends(get_db)):
         """Retorna o valor total do estoque atual"""
         try:
@@ -126,6 +189,7 @@ class ItemController:
             )
     
     @staticmethod
+    @cached("items/summary", ITEM_TABLES)
     def get_inventory_summary(db: Session = Depends(get_db)) -> Dict[str, Any]:
         """Retorna resumo completo do estoque"""
         try:
@@ -136,6 +200,7 @@ class ItemController:
             )
 
     @staticmethod
+    @cached("items/top-value", ITEM_TABLES)
     def get_items_by_value_ranking(limit: int = 10, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
         """Retorna os itens ordenados pelo valor total em estoque (amount * price)"""
         try:
@@ -3,9 +3,12 @@ from fastapi import Depends, HTTPException, status, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 from database.database import get_db
-from models import Recipe, RecipeItem
-from repositories import RecipeRepository
-from schemas import RecipeResponse, RecipeRequest
+from models import Recipe, RecipeItem, Item
+from repositories import RecipeRepository, RecipeAvailabilityRepository, RecipePlanRepository
+from schemas import RecipeResponse, RecipeRequest, RecipePlanRequest
+from utils.cache import cached
+
+RECIPE_TABLES = (Recipe.__tablename__, RecipeItem.__tablename__, Item.__tablename__)
 
 class RecipeController:
     @staticmethod
@@ -87,6 +90,7 @@ class RecipeController:
         return RecipeResponse.model_validate(recipe)
     
     @staticmethod
+    @cached("recipes/cost", RECIPE_TABLES)
     def get_recipe_cost(recipe_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
         """
         Retorna o custo detalhado.
@@ -112,6 +116,7 @@ class RecipeController:
             )
 
     @staticmethod
+    @cached("recipes/costs", RECIPE_TABLES)
     def get_all_recipes_with_cost(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
         """Retorna todas as receitas com seus custos detalhados."""
         try:
@@ -123,6 +128,7 @@ class RecipeController:
             )
 
     @staticmethod
+    @cached("recipes/feasible", RECIPE_TABLES)
     def get_feasible_recipes(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
         """Retorna todas as receitas que podem ser preparadas com os ingredientes disponíveis."""
         try:
@@ -134,6 +140,48 @@ class RecipeController:
             )
 
     @staticmethod
+    @cached("recipes/availability", RECIPE_TABLES)
+    def get_recipes_availability(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+        """Retorna, para cada receita, se pode ser feita, quantas vezes e o que falta no estoque."""
+        try:
+            return RecipeAvailabilityRepository.find_availability(db)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+                detail=str(e)
+            )
+
+    @staticmethod
+    @cached("recipes/max-batches", RECIPE_TABLES)
+    def get_max_batches(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
+        """Retorna quantas vezes cada receita pode ser feita com o estoque atual."""
+        try:
+            return RecipePlanRepository.find_max_batches(db)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, 
+                detail=str(e)
+            )
+
+    @staticmethod
+    def plan(request: RecipePlanRequest, db: Session = Depends(get_db)) -> Dict[str, Any]:
+        """Retorna a lista de compras mais barata para fazer as receitas do plano."""
+        plan = {}
+        for entry in request.recipes:
+            if entry.batches <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Quantidade de vezes deve ser maior que zero"
+                )
+            plan[entry.recipe_id] = plan.get(entry.recipe_id, 0) + entry.batches
+
+        try:
+            return RecipePlanRepository.find_shopping_list(db, plan)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    @staticmethod
+    @cached("recipes/popular-ingredients", RECIPE_TABLES)
     def get_most_used_ingredients(limit: int = 10, db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
         """Retorna os ingredientes mais utilizados nas receitas."""
         try:
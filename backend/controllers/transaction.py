@@ -1,12 +1,37 @@
-from typing import Optional, Dict, Any, List
+import base64
+from typing import Optional, Dict, Any, List, Tuple
 from fastapi import Depends, HTTPException, status, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from database.database import get_db
-from models import Transaction
-from repositories import TransactionRepository, ItemRepository
-from schemas import TransactionResponse, TransactionRequest
-from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import get_db, get_async_db
+from models import Transaction, Item
+from repositories import TransactionRepository, ItemRepository, AsyncTransactionRepository
+from schemas import TransactionResponse, TransactionRequest, BulkResponse, BulkRowError
+from datetime import datetime, date
+from utils.cache import cached
+from utils.export import ndjson_chunks, csv_chunks, gzip_chunks
+
+TRANSACTION_TABLES = (Transaction.__tablename__, Item.__tablename__)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+EXPORT_COLUMNS = [
+    "id", "create_at", "order_type", "description", "item_id", "item_name",
+    "measure_unity", "amount", "price", "price_unit", "total_value"
+]
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", ndjson_chunks),
+    "csv": ("text/csv; charset=utf-8", csv_chunks),
+}
+
+
+def summary_period_key(arguments: dict) -> tuple:
+    """O resumo considera apenas a data do período, então o horário fica fora da chave"""
+    return tuple(
+        value.date() if isinstance(value, datetime) else value
+        for value in (arguments["start_date"], arguments["end_date"])
+    )
+
 
 class TransactionController:
     @staticmethod
@@ -16,17 +41,113 @@ class TransactionController:
         transaction = TransactionRepository.save(db, Transaction(**request.model_dump()))
         return TransactionResponse.model_validate(transaction)
 
+    @staticmethod
+    def create_many(requests: List[TransactionRequest], db: Session = Depends(get_db)) -> BulkResponse:
+        """
+        Cria várias transações de uma vez. A existência dos itens é verificada com
+        uma única consulta; linhas inválidas são devolvidas em `errors` (com a
+        posição na lista) e as demais são inseridas juntas, em um único commit.
+        """
+        existing_items = ItemRepository.find_existing_ids(db, [request.item_id for request in requests])
+
+        rows, errors = [], []
+        for index, request in enumerate(requests):
+            try:
+                field_validators(request)
+                if request.item_id not in existing_items:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item não encontrado")
+            except HTTPException as e:
+                errors.append(BulkRowError(index=index, detail=e.detail))
+                continue
+            rows.append(request.model_dump())
+
+        ids = TransactionRepository.bulk_insert(db, rows)
+        return BulkResponse(created=len(ids), ids=ids, errors=errors)
+
     @staticmethod
     def find_all(db: Session = Depends(get_db)):
         """Retorna todas as transações cadastradas com nome do item."""
-        transactions = TransactionRepository.find_all(db)
-        result = []
-        for transaction in transactions:
-            trans_dict = TransactionResponse.model_validate(transaction).model_dump()
-            item = ItemRepository.find_by_id(db, transaction.item_id)
-            trans_dict['item_name'] = item.name if item else 'Item não encontrado'
-            result.append(trans_dict)
-        return result
+        return [with_item_name(row) for row in TransactionRepository.find_page(db)]
+
+    @staticmethod
+    def find_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        order_type: Optional[str] = None,
+        item_id: Optional[int] = None,
+        db: Session = Depends(get_db)
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retorna uma página de transações (mais recentes primeiro) com nome do item
+        e o cursor da próxima página (None quando não há mais transações).
+        """
+        rows = TransactionRepository.find_page(
+            db,
+            limit=limit + 1,
+            after=decode_cursor(cursor) if cursor else None,
+            start_date=start_date,
+            end_date=end_date,
+            order_type=order_type,
+            item_id=item_id
+        )
+        return page_result(rows, limit)
+
+    @staticmethod
+    async def find_page_async(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        order_type: Optional[str] = None,
+        item_id: Optional[int] = None,
+        db: AsyncSession = Depends(get_async_db)
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Versão assíncrona de find_page, usada pelas rotas."""
+        rows = await AsyncTransactionRepository.find_page(
+            db,
+            limit=limit + 1,
+            after=decode_cursor(cursor) if cursor else None,
+            start_date=start_date,
+            end_date=end_date,
+            order_type=order_type,
+            item_id=item_id
+        )
+        return page_result(rows, limit)
+
+    @staticmethod
+    def export(
+        format: str = "ndjson",
+        compress: bool = False,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        db: Session = Depends(get_db)
+    ) -> StreamingResponse:
+        """
+        Exporta o histórico de transações (com dados do item) em NDJSON ou CSV,
+        gerado em blocos à medida que as linhas chegam do banco.
+        """
+        if format not in EXPORT_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Formato inválido. Use: {', '.join(EXPORT_FORMATS)}"
+            )
+
+        media_type, encoder = EXPORT_FORMATS[format]
+        chunks = encoder(TransactionRepository.stream_ledger(db, start_date, end_date), EXPORT_COLUMNS)
+        filename = f"transacoes.{format}"
+
+        if compress:
+            chunks = gzip_chunks(chunks)
+            media_type = "application/gzip"
+            filename += ".gz"
+
+        return StreamingResponse(
+            chunks,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
 
     @staticmethod
     def find_by_id(id: int, db: Session = Depends(get_db)):
@@ -38,19 +159,20 @@ class TransactionController:
             )
         return TransactionResponse.model_validate(transaction)
 
+    @staticmethod
+    async def find_by_id_async(id: int, db: AsyncSession = Depends(get_async_db)):
+        """Versão assíncrona de find_by_id, usada pelas rotas."""
+        transaction = await AsyncTransactionRepository.find_by_id(db, id)
+        if not transaction:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Transação não encontrada"
+            )
+        return TransactionResponse.model_validate(transaction)
+
     @staticmethod
     def find_by_item_id(item_id: int, db: Session = Depends(get_db)):
         """Retorna todas as transações associadas a um item específico com nome do item."""
-        transactions = TransactionRepository.find_by_item_id(db, item_id)
-        result = []
-        item = ItemRepository.find_by_id(db, item_id)
-        item_name = item.name if item else 'Item não encontrado'
-
-        for transaction in transactions:
-            trans_dict = TransactionResponse.model_validate(transaction).model_dump()
-            trans_dict['item_name'] = item_name
-            result.append(trans_dict)
-        return result
+        return [with_item_name(row) for row in TransactionRepository.find_page(db, item_id=item_id)]
 
     @staticmethod
     def delete_by_id(id: int, db: Session = Depends(get_db)):
@@ -78,6 +200,7 @@ class TransactionController:
         return TransactionResponse.model_validate(transaction)
     
     @staticmethod
+    @cached("transactions/summary", TRANSACTION_TABLES, key=summary_period_key)
     def get_transaction_summary_by_period(
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
@@ -104,6 +227,7 @@ class TransactionController:
             )
     
     @staticmethod
+    @cached("transactions/most-transacted", TRANSACTION_TABLES)
     def get_most_transacted_items(
         order_type: Optional[str] = None,
         limit: int = 10,
@@ -128,6 +252,7 @@ class TransactionController:
             )
     
     @staticmethod
+    @cached("transactions/daily", TRANSACTION_TABLES)
     def get_daily_transactions(
         days: int = 30,
         db: Session = Depends(get_db)
@@ -145,6 +270,7 @@ class TransactionController:
             )
 
     @staticmethod
+    @cached("transactions/price-analysis", TRANSACTION_TABLES)
     def get_average_transaction_value_by_item(db: Session = Depends(get_db)) -> List[Dict[str, Any]]:
         """
         Retorna estatísticas de preço (média, mínimo, máximo) para cada item
@@ -159,6 +285,7 @@ class TransactionController:
             )
     
     @staticmethod
+    @cached("transactions/consumption-rate", TRANSACTION_TABLES)
     def get_consumption_rate_by_item(
         days: int = 30,
         db: Session = Depends(get_db)
@@ -176,6 +303,7 @@ class TransactionController:
             )
 
     @staticmethod
+    @cached("transactions/monthly-expenses", TRANSACTION_TABLES)
     def get_monthly_expenses(
         months: int = 6,
         db: Session = Depends(get_db)
@@ -192,7 +320,45 @@ class TransactionController:
                 detail=str(e)
             )
 
+def page_result(rows: list, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Recebe até limit + 1 linhas e separa a página do cursor da próxima (None se for a última)"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].Transaction)
+
+    return [with_item_name(row) for row in rows], next_cursor
+
+
+def with_item_name(row) -> Dict[str, Any]:
+    """Converte uma linha (transação, nome do item) no dicionário de resposta"""
+    trans_dict = TransactionResponse.model_validate(row.Transaction).model_dump()
+    trans_dict['item_name'] = row.item_name
+    return trans_dict
+
+
+def encode_cursor(transaction: Transaction) -> str:
+    """Cursor opaco com a posição (create_at, id) de uma transação"""
+    position = f"{transaction.create_at.isoformat()}|{transaction.id}"
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Lê a posição (create_at, id) de um cursor gerado por encode_cursor"""
+    try:
+        day, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(day[:10]), int(id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
 def default_validators(request: TransactionRequest, db: Session):
+    field_validators(request)
+    if not ItemRepository.exists_by_id(db, request.item_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item não encontrado")
+
+
+def field_validators(request: TransactionRequest):
     if request.price and request.price < 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="O preço não pode ser negativo")
     if request.order_type == "":
@@ -203,5 +369,3 @@ def default_validators(request: TransactionRequest, db: Session):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A quantidade não pode ser negativa")
     if request.amount == 0 and request.order_type != "ajuste":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A quantidade deve ser maior que zero")
-    if not ItemRepository.exists_by_id(db, request.item_id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Item não encontrado")
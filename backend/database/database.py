@@ -1,9 +1,13 @@
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from dotenv import load_dotenv
 import os
 
+from database.pool import engine_options, pool_usage
+from utils.cache import track_writes
+
 load_dotenv()
 
 DB_USER = os.getenv("POSTGRES_USER")
@@ -13,7 +17,10 @@ DB_HOST = os.getenv("POSTGRES_HOST")
 DB_PORT = os.getenv("POSTGRES_PORT")
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DATABASE_URL)
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Engine único da aplicação: rotas, tools e agentes SQL compartilham o mesmo pool
+engine = create_engine(DATABASE_URL, **engine_options())
+track_writes(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -23,3 +30,29 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Engine assíncrono (asyncpg), criado no primeiro uso para que o driver só seja
+# carregado quando alguma rota assíncrona for chamada
+async_engine = None
+AsyncSessionLocal = None
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(is_async=True))
+        track_writes(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return AsyncSessionLocal
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def get_pool_metrics() -> dict:
+    """Uso e métricas de checkout dos pools síncrono e assíncrono"""
+    return {
+        "sync": pool_usage(engine),
+        "async": pool_usage(async_engine.sync_engine) if async_engine is not None else None
+    }
@@ -0,0 +1,160 @@
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, String, DateTime, inspect, text, select, insert, delete
+from sqlalchemy.engine import Connection, Engine
+
+migrations_metadata = MetaData()
+
+schema_migrations = Table(
+    "Schema_Migrations",
+    migrations_metadata,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _is_postgres(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def _add_item_unit_columns(connection: Connection) -> None:
+    """Colunas de unidade normalizada do Item (measure_code, price_code, unit_factor)"""
+    existing = {column["name"] for column in inspect(connection).get_columns("Item")}
+    for name, column_type in (("measure_code", "INTEGER"), ("price_code", "INTEGER"), ("unit_factor", "NUMERIC")):
+        if name not in existing:
+            connection.execute(text(f'ALTER TABLE "Item" ADD COLUMN {name} {column_type}'))
+
+
+def _drop_item_unit_columns(connection: Connection) -> None:
+    for name in ("measure_code", "price_code", "unit_factor"):
+        connection.execute(text(f'ALTER TABLE "Item" DROP COLUMN {name}'))
+
+
+def _model_indexes():
+    """Índices declarados nos modelos (__table_args__) para os filtros e ordenações mais usados"""
+    from models import Item, Transaction, RecipeItem
+    return [
+        index
+        for model in (Transaction, Item, RecipeItem)
+        for index in sorted(model.__table__.indexes, key=lambda index: index.name)
+    ]
+
+
+# Índices só do Postgres: busca por trecho do nome (ILIKE '%x%' e lower(...) LIKE '%x%')
+TRIGRAM_INDEXES = {
+    "ix_item_name_trgm": 'ON "Item" USING gin (name gin_trgm_ops)',
+    "ix_item_name_lower_trgm": 'ON "Item" USING gin (lower(name) gin_trgm_ops)',
+    "ix_recipe_title_lower_trgm": 'ON "Recipe" USING gin (lower(title) gin_trgm_ops)',
+}
+
+
+def _index_definition(connection: Connection, index) -> str:
+    preparer = connection.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column.name) for column in index.columns)
+    return f"ON {preparer.format_table(index.table)} ({columns})"
+
+
+def _drop_invalid_index(connection: Connection, name: str) -> None:
+    """Remove o índice deixado inválido por um CREATE INDEX CONCURRENTLY interrompido"""
+    invalid = connection.execute(
+        text("SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name AND NOT i.indisvalid"),
+        {"name": name},
+    ).first()
+    if invalid:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def _create_hot_path_indexes(connection: Connection) -> None:
+    """
+    No Postgres os índices são criados com CONCURRENTLY para não bloquear
+    escritas em Transaction e Item durante a construção; por isso esta
+    migração roda fora de transação (ver NON_TRANSACTIONAL_MIGRATIONS).
+    """
+    if not _is_postgres(connection):
+        for index in _model_indexes():
+            index.create(connection, checkfirst=True)
+        return
+
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    definitions = {index.name: _index_definition(connection, index) for index in _model_indexes()}
+    definitions.update(TRIGRAM_INDEXES)
+    for name, definition in definitions.items():
+        _drop_invalid_index(connection, name)
+        connection.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}"))
+
+
+def _drop_hot_path_indexes(connection: Connection) -> None:
+    if not _is_postgres(connection):
+        for index in _model_indexes():
+            index.drop(connection, checkfirst=True)
+        return
+
+    for name in [index.name for index in _model_indexes()] + list(TRIGRAM_INDEXES):
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+# Migrações em ordem de aplicação: (versão, upgrade, downgrade)
+MIGRATIONS = [
+    ("0001_item_unit_columns", _add_item_unit_columns, _drop_item_unit_columns),
+    ("0002_hot_path_indexes", _create_hot_path_indexes, _drop_hot_path_indexes),
+]
+
+# Migrações que não podem rodar dentro de uma transação (CREATE/DROP INDEX CONCURRENTLY)
+NON_TRANSACTIONAL_MIGRATIONS = {"0002_hot_path_indexes"}
+
+
+def applied_versions(connection: Connection) -> list[str]:
+    """Versões já aplicadas no banco, na ordem em que foram registradas"""
+    schema_migrations.create(connection, checkfirst=True)
+    rows = connection.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version))
+    return [row.version for row in rows]
+
+
+def _run_outside_transaction(engine: Engine, step) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        step(connection)
+
+
+def run_migrations(engine: Engine) -> list[str]:
+    """
+    Aplica as migrações pendentes, cada uma na sua própria transação (ou em
+    autocommit, se estiver em NON_TRANSACTIONAL_MIGRATIONS), e retorna as
+    versões aplicadas. Pode ser executado a cada inicialização.
+    """
+    applied = []
+    with engine.begin() as connection:
+        done = set(applied_versions(connection))
+
+    for version, upgrade, _ in MIGRATIONS:
+        if version in done:
+            continue
+        if version in NON_TRANSACTIONAL_MIGRATIONS:
+            _run_outside_transaction(engine, upgrade)
+            with engine.begin() as connection:
+                connection.execute(insert(schema_migrations).values(version=version, applied_at=datetime.now()))
+        else:
+            with engine.begin() as connection:
+                upgrade(connection)
+                connection.execute(insert(schema_migrations).values(version=version, applied_at=datetime.now()))
+        applied.append(version)
+
+    return applied
+
+
+def rollback_migration(engine: Engine) -> str | None:
+    """Desfaz a última migração aplicada e retorna sua versão (None se não houver nenhuma)"""
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    if not done:
+        return None
+
+    version = done[-1]
+    downgrade = next(down for v, _, down in MIGRATIONS if v == version)
+    if version in NON_TRANSACTIONAL_MIGRATIONS:
+        _run_outside_transaction(engine, downgrade)
+        with engine.begin() as connection:
+            connection.execute(delete(schema_migrations).where(schema_migrations.c.version == version))
+    else:
+        with engine.begin() as connection:
+            downgrade(connection)
+            connection.execute(delete(schema_migrations).where(schema_migrations.c.version == version))
+    return version
@@ -0,0 +1,126 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+load_dotenv()
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Tempo máximo de cada comando no Postgres, em milissegundos (0 desativa)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+
+class PoolMetrics:
+    """Métricas de checkout de um pool: quantidade, espera, uso de overflow e timeouts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.overflow_checkouts = 0
+            self.timeouts = 0
+
+    def record_checkout(self, wait: float, used_overflow: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if used_overflow:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "avg_checkout_ms": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+                "max_checkout_ms": self.max_wait * 1000,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts
+            }
+
+
+class InstrumentedPoolMixin:
+    """
+    Mede o tempo que cada checkout espera por uma conexão (incluindo a abertura
+    de conexões novas e o pre-ping) e conta quando o pool precisou abrir conexões
+    de overflow. Usa só a API pública do pool (connect, size, checkedout, overflow)
+    e guarda métricas próprias de cada instância.
+    """
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(
+            time.perf_counter() - start,
+            used_overflow=self.checkedout() > self.size()
+        )
+        return connection
+
+    def usage(self) -> dict:
+        """Situação atual do pool junto com as métricas acumuladas"""
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self.max_overflow,
+            **self.metrics.as_dict()
+        }
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(is_async: bool = False) -> dict:
+    """Argumentos de create_engine/create_async_engine com as configurações de pool do ambiente"""
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+    return options
+
+
+def pool_usage(engine) -> dict | None:
+    """Uso do pool de um engine (None se o pool não for instrumentado)"""
+    pool = engine.pool
+    return pool.usage() if isinstance(pool, InstrumentedPoolMixin) else None
@@ -1,6 +1,7 @@
 from models import Item, Recipe, RecipeItem, Bot, Transaction
 from sqlalchemy.exc import OperationalError
 from database.database import engine, Base
+from database.migrations import run_migrations
 import time
 
 def wait_for_db(max_retries=10, delay=3):
@@ -8,7 +9,10 @@ def wait_for_db(max_retries=10, delay=3):
     for i in range(max_retries):
         try:
             Base.metadata.create_all(bind=engine)
+            applied = run_migrations(engine)
             print("Tabelas criadas/verificadas com sucesso!")
+            if applied:
+                print(f"Migrações aplicadas: {', '.join(applied)}")
             return
         except OperationalError:
             print(f"⚠Banco ainda não está pronto... Tentativa {i+1}/{max_retries}")
@@ -17,7 +21,7 @@ def wait_for_db(max_retries=10, delay=3):
 
 wait_for_db()
 
-from routes import bot_routes, recipe_routes, item_routes, transaction_routes, dashboard_routes
+from routes import bot_routes, recipe_routes, item_routes, transaction_routes, dashboard_routes, metrics_routes
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -32,6 +36,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 app.include_router(item_routes, tags=["Item"])
@@ -39,6 +44,7 @@ app.include_router(recipe_routes, tags=["Recipe"])
 app.include_router(bot_routes, tags=["Bot"])
 app.include_router(transaction_routes, tags=["Transaction"])
 app.include_router(dashboard_routes, tags=["Dashboard"])
+app.include_router(metrics_routes, tags=["Metrics"])
 
 
 if __name__ == "__main__":
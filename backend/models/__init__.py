@@ -3,6 +3,8 @@ from .item import Item
 from .recipe_item import RecipeItem
 from .bot import Bot
 from .transaction import Transaction
+from .item_transaction_stats import ItemTransactionStats
+from .transaction_daily_rollup import TransactionDailyRollup
 
-__all__ = ["Recipe", "Item", "RecipeItem", "Bot", "Transaction"]
+__all__ = ["Recipe", "Item", "RecipeItem", "Bot", "Transaction", "ItemTransactionStats", "TransactionDailyRollup"]
 
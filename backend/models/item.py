@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, Date
+from sqlalchemy import Column, Integer, String, Text, Numeric, Date, Index
 from sqlalchemy.orm import relationship
 from database.database import Base
 from datetime import datetime
 
 class Item(Base):
     __tablename__ = "Item"
+    __table_args__ = (
+        # Itens vencidos/vencendo e itens com estoque baixo
+        Index("ix_item_expiration_date", "expiration_date"),
+        Index("ix_item_amount", "amount"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False)
@@ -13,6 +18,9 @@ class Item(Base):
     description = Column(Text)
     price = Column(Numeric, default=0)
     price_unit = Column(String, default="unidade")
+    measure_code = Column(Integer)
+    price_code = Column(Integer)
+    unit_factor = Column(Numeric)
     expiration_date = Column(Date)
     create_at = Column(Date, default=datetime.now(), nullable=False)
     update_at = Column(Date)
@@ -28,3 +36,10 @@ class Item(Base):
         back_populates="item",
         cascade="all, delete-orphan"
     )
+
+    transaction_stats = relationship(
+        "ItemTransactionStats",
+        back_populates="item",
+        uselist=False,
+        cascade="all, delete-orphan"
+    )
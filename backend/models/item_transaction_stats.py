@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, Numeric
+from sqlalchemy.orm import relationship
+from database.database import Base
+
+class ItemTransactionStats(Base):
+    __tablename__ = "Item_Transaction_Stats"
+
+    item_id = Column(
+        Integer,
+        ForeignKey("Item.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    transaction_count = Column(Integer, nullable=False, default=0)
+    total_value = Column(Numeric, nullable=False, default=0)
+    min_value = Column(Numeric)
+    max_value = Column(Numeric)
+
+    item = relationship("Item", back_populates="transaction_stats")
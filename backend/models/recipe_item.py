@@ -1,9 +1,11 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship
 from database.database import Base
 
 class RecipeItem(Base):
     __tablename__ = "Recipe_Item"
+    # A chave primária (recipe_id, item_id) não atende buscas pelo item
+    __table_args__ = (Index("ix_recipe_item_item_id", "item_id"),)
 
     recipe_id = Column(
         Integer,
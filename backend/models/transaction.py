@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Numeric, Date
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Numeric, Date, Index
 from sqlalchemy.orm import relationship
 from database.database import Base
 from datetime import datetime
 
 class Transaction(Base):
     __tablename__ = "Transaction"
+    __table_args__ = (
+        # Histórico de um item e paginação por (create_at, id)
+        Index("ix_transaction_item_id_create_at", "item_id", "create_at", "id"),
+        Index("ix_transaction_create_at_id", "create_at", "id"),
+        # Resumos e rankings filtrados por tipo dentro de um período
+        Index("ix_transaction_order_type_create_at", "order_type", "create_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     item_id = Column(Integer, ForeignKey("Item.id"), nullable=False)
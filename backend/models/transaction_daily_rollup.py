@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date
+from database.database import Base
+
+class TransactionDailyRollup(Base):
+    __tablename__ = "Transaction_Daily_Rollup"
+
+    day = Column(Date, primary_key=True)
+    item_id = Column(
+        Integer,
+        ForeignKey("Item.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    order_type = Column(String, primary_key=True)
+
+    transaction_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric, nullable=False, default=0)
+    total_value = Column(Numeric, nullable=False, default=0)
+    priced_value = Column(Numeric, nullable=False, default=0)
@@ -2,5 +2,13 @@ from .recipe import RecipeRepository
 from .item import ItemRepository
 from .bot import BotRepository
 from .transaction import TransactionRepository
+from .item_transaction_stats import ItemTransactionStatsRepository
+from .transaction_rollup import TransactionRollupRepository
+from .dashboard import DashboardRepository
+from .recipe_availability import RecipeAvailabilityRepository
+from .recipe_plan import RecipePlanRepository
+from .async_item import AsyncItemRepository
+from .async_transaction import AsyncTransactionRepository
+from .async_bot import AsyncBotRepository
 
-__all__ = ["RecipeRepository", "ItemRepository", "BotRepository", "TransactionRepository"]
+__all__ = ["RecipeRepository", "ItemRepository", "BotRepository", "TransactionRepository", "ItemTransactionStatsRepository", "TransactionRollupRepository", "DashboardRepository", "RecipeAvailabilityRepository", "RecipePlanRepository", "AsyncItemRepository", "AsyncTransactionRepository", "AsyncBotRepository"]
@@ -0,0 +1,22 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from models import Bot
+
+
+class AsyncBotRepository:
+    @staticmethod
+    async def save(db: AsyncSession, bot: Bot) -> Bot:
+        """Salva uma mensagem do bot no banco de dados."""
+        db.add(bot)
+        await db.commit()
+        await db.refresh(bot)
+        return bot
+
+    @staticmethod
+    async def get_messages(db: AsyncSession):
+        """Recupera todas as mensagens do bot do banco de dados."""
+        messages = list(await db.scalars(select(Bot)))
+        if not messages:
+            return None
+        return messages
@@ -0,0 +1,26 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from models import Item
+
+
+class AsyncItemRepository:
+    @staticmethod
+    async def find_all(db: AsyncSession) -> list[Item]:
+        """Recupera todos os itens do banco de dados."""
+        return list(await db.scalars(select(Item)))
+
+    @staticmethod
+    async def find_by_id(db: AsyncSession, id: int) -> Item | None:
+        """Recupera um item pelo seu ID."""
+        return await db.get(Item, id)
+
+    @staticmethod
+    async def find_by_name(db: AsyncSession, name: str) -> list[Item]:
+        """Recupera itens pelo seu nome."""
+        return list(await db.scalars(select(Item).where(Item.name.ilike(f"%{name}%"))))
+
+    @staticmethod
+    async def exists_by_id(db: AsyncSession, id: int) -> bool:
+        """Verifica se um item existe pelo seu ID."""
+        return await db.scalar(select(Item.id).where(Item.id == id)) is not None
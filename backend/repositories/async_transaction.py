@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+
+from models import Transaction
+from .transaction import transaction_page_query
+
+
+class AsyncTransactionRepository:
+    @staticmethod
+    async def find_page(
+            db: AsyncSession,
+            limit: int | None = None,
+            after: tuple[date, int] | None = None,
+            start_date: date | None = None,
+            end_date: date | None = None,
+            order_type: str | None = None,
+            item_id: int | None = None
+    ) -> list:
+        """Versão assíncrona de TransactionRepository.find_page"""
+        result = await db.execute(
+            transaction_page_query(limit, after, start_date, end_date, order_type, item_id)
+        )
+        return result.all()
+
+    @staticmethod
+    async def find_by_id(db: AsyncSession, id: int) -> Transaction | None:
+        """Recupera uma transação pelo seu ID."""
+        return await db.get(Transaction, id)
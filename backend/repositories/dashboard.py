@@ -0,0 +1,67 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from models import Item
+from .item import inventory_value_expression
+from .recipe_availability import RecipeAvailabilityRepository
+from .transaction import TransactionRepository
+
+
+class DashboardRepository:
+    @staticmethod
+    def find_overview(
+            db: Session,
+            low_stock_threshold: Decimal = Decimal('5'),
+            expiring_days: int = 7
+    ) -> dict:
+        """
+        Calcula em uma única consulta o resumo do estoque e as contagens do dashboard
+        (estoque baixo e vencendo em breve), sem carregar objetos. As receitas viáveis
+        vêm do mesmo cálculo de max_batches de /recipes/feasible.
+        """
+        today = datetime.now().date()
+        target_date = today + timedelta(days=expiring_days)
+
+        overview = db.query(
+            func.count(Item.id).label('total_items'),
+            func.sum(case((Item.amount > 0, 1), else_=0)).label('items_with_stock'),
+            func.sum(case((Item.amount == 0, 1), else_=0)).label('items_out_of_stock'),
+            func.sum(inventory_value_expression()).label('total_value'),
+            func.sum(case((Item.amount < low_stock_threshold, 1), else_=0)).label('low_stock_count'),
+            func.sum(case(
+                (and_(Item.expiration_date >= today, Item.expiration_date <= target_date), 1),
+                else_=0
+            )).label('expiring_soon_count')
+        ).select_from(Item).one()
+
+        return {
+            "inventory": {
+                "total_items": overview.total_items,
+                "items_with_stock": int(overview.items_with_stock or 0),
+                "items_out_of_stock": int(overview.items_out_of_stock or 0),
+                "total_inventory_value": float(overview.total_value or 0)
+            },
+            "low_stock_count": int(overview.low_stock_count or 0),
+            "expiring_soon_count": int(overview.expiring_soon_count or 0),
+            "feasible_recipes_count": RecipeAvailabilityRepository.count_feasible(db)
+        }
+
+    @staticmethod
+    def find_dashboard(db: Session, days: int = 30) -> dict:
+        """Retorna os dados consolidados do dashboard"""
+        end_date = datetime.now()
+        overview = DashboardRepository.find_overview(db)
+
+        return {
+            "inventory": overview["inventory"],
+            "transactions_30d": TransactionRepository.find_transaction_summary_by_period(
+                db,
+                end_date - timedelta(days=days),
+                end_date
+            ),
+            "low_stock_count": overview["low_stock_count"],
+            "expiring_soon_count": overview["expiring_soon_count"],
+            "feasible_recipes_count": overview["feasible_recipes_count"]
+        }
@@ -1,10 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case, desc, insert
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 from models import Item
 from utils.unit_converter import calculate_item_total_value
+from utils.cache import invalidate_tables
+from utils.name_index import item_name_index
+from .item_transaction_stats import ItemTransactionStatsRepository, item_unit_factor_expression
+from .transaction_rollup import TransactionRollupRepository
 
 class ItemRepository:
     @staticmethod
@@ -16,12 +20,43 @@ class ItemRepository:
     def save(db: Session, item: Item) -> Item:
         """Salva ou atualiza um item no banco de dados."""
         if item.id:
+            current = db.query(Item.price, Item.measure_unity, Item.price_unit).filter(Item.id == item.id).first()
             db.merge(item)
+            if current is not None and _value_inputs_changed(current, item):
+                # O valor das transações sem preço depende do preço e das unidades do item
+                db.flush()
+                ItemTransactionStatsRepository.refresh(db, [item.id])
+                TransactionRollupRepository.refresh(db, item_ids=[item.id])
         else:
             db.add(item)
         db.commit()
+        invalidate_tables(Item.__tablename__)
+        item_name_index.upsert(item.id, item.name, item.measure_unity)
         return item
 
+    @staticmethod
+    def bulk_insert(db: Session, rows: list[dict]) -> list[int]:
+        """
+        Insere vários itens em uma única transação (executemany) e retorna os IDs
+        na mesma ordem das linhas recebidas.
+        """
+        if not rows:
+            return []
+        result = db.execute(insert(Item).returning(Item.id, sort_by_parameter_order=True), rows)
+        ids = list(result.scalars())
+        db.commit()
+        invalidate_tables(Item.__tablename__)
+        for id, row in zip(ids, rows):
+            item_name_index.upsert(id, row["name"], row["measure_unity"])
+        return ids
+
+    @staticmethod
+    def find_existing_ids(db: Session, ids: list[int]) -> set[int]:
+        """Retorna, entre os IDs informados, os que existem no banco (uma única consulta IN)."""
+        if not ids:
+            return set()
+        return {row[0] for row in db.query(Item.id).filter(Item.id.in_(set(ids))).all()}
+
     @staticmethod
     def find_by_id(db: Session, id: int) -> Item | None:
         """Recupera um item pelo seu ID."""
@@ -36,6 +71,22 @@ class ItemRepository:
             .all()
         )
 
+    @staticmethod
+    def search_by_name(db: Session, name: str, limit: int = 10, measure_unity: str | None = None) -> list[Item]:
+        """
+        Busca aproximada pelo nome (sem acentos e sem diferenciar maiúsculas) usando o
+        índice de trigramas em memória. Os itens vêm do mais ao menos relevante.
+        """
+        if item_name_index.is_stale():
+            item_name_index.build(db.query(Item.id, Item.name, Item.measure_unity).all())
+
+        matches = item_name_index.search(name, limit, extra=measure_unity)
+        if not matches:
+            return []
+
+        items = {item.id: item for item in db.query(Item).filter(Item.id.in_([m["id"] for m in matches]))}
+        return [items[m["id"]] for m in matches if m["id"] in items]
+
     @staticmethod
     def exists_by_id(db: Session, id: int) -> bool:
         """Verifica se um item existe pelo seu ID."""
@@ -51,8 +102,11 @@ class ItemRepository:
         """Remove um item pelo seu ID."""
         item = db.query(Item).filter(Item.id == id).first()
         if item is not None:
+            TransactionRollupRepository.delete_by_item_id(db, id)
             db.delete(item)
             db.commit()
+            invalidate_tables(Item.__tablename__)
+            item_name_index.remove(id)
 
     @staticmethod
     def find_low_stock_items(db: Session, threshold: Decimal = Decimal('10')) -> list[Item]:
@@ -101,62 +155,70 @@ class ItemRepository:
     @staticmethod
     def find_total_inventory_value(db: Session) -> Decimal:
         """Retorna o valor total do estoque atual considerando conversão de unidades"""
-        items = db.query(Item).all()
-        total = Decimal('0')
-
-        for item in items:
-            item_value = calculate_item_total_value(
-                item.amount,
-                item.price,
-                item.measure_unity,
-                item.price_unit
-            )
-            total += item_value
+        total = db.query(func.sum(inventory_value_expression())).scalar()
 
-        return total
+        return Decimal(str(total)) if total is not None else Decimal('0')
 
     @staticmethod
     def find_inventory_summary(db: Session) -> dict:
-        """Retorna resumo completo do estoque"""
-        total_items = db.query(func.count(Item.id)).scalar()
-        total_value = ItemRepository.find_total_inventory_value(db)
-
-        items_with_stock = db.query(func.count(Item.id)).filter(
-            Item.amount > 0
-        ).scalar()
-
-        items_out_of_stock = db.query(func.count(Item.id)).filter(
-            Item.amount == 0
-        ).scalar()
+        """Retorna resumo completo do estoque em uma única consulta agregada"""
+        summary = db.query(
+            func.count(Item.id).label('total_items'),
+            func.sum(case((Item.amount > 0, 1), else_=0)).label('items_with_stock'),
+            func.sum(case((Item.amount == 0, 1), else_=0)).label('items_out_of_stock'),
+            func.sum(inventory_value_expression()).label('total_value')
+        ).one()
 
         return {
-            "total_items": total_items,
-            "items_with_stock": items_with_stock,
-            "items_out_of_stock": items_out_of_stock,
-            "total_inventory_value": float(total_value)
+            "total_items": summary.total_items,
+            "items_with_stock": int(summary.items_with_stock or 0),
+            "items_out_of_stock": int(summary.items_out_of_stock or 0),
+            "total_inventory_value": float(summary.total_value or 0)
         }
 
     @staticmethod
     def find_items_by_value_ranking(db: Session, limit: int = 10) -> list[dict]:
         """Retorna os N itens com maior valor em estoque considerando conversão de unidades"""
-        items = db.query(Item).filter(Item.amount > 0).all()
-
-        items_with_value = []
-        for item in items:
-            total_value = calculate_item_total_value(
-                item.amount,
-                item.price,
-                item.measure_unity,
-                item.price_unit
-            )
-            items_with_value.append({
-                "id": item.id,
-                "name": item.name,
-                "amount": float(item.amount),
-                "price": float(item.price),
-                "price_unit": item.price_unit,
-                "total_value": float(total_value)
-            })
-
-        items_with_value.sort(key=lambda x: x['total_value'], reverse=True)
-        return items_with_value[:limit]
\ No newline at end of file
+        total_value = inventory_value_expression().label('total_value')
+
+        results = db.query(
+            Item.id,
+            Item.name,
+            Item.amount,
+            Item.price,
+            Item.price_unit,
+            total_value
+        ).filter(
+            Item.amount > 0
+        ).order_by(
+            desc(total_value),
+            Item.id
+        ).limit(limit).all()
+
+        return [
+            {
+                "id": r.id,
+                "name": r.name,
+                "amount": float(r.amount),
+                "price": float(r.price),
+                "price_unit": r.price_unit,
+                "total_value": float(r.total_value or 0)
+            }
+            for r in results
+        ]
+
+
+def inventory_value_expression():
+    """Valor em estoque de cada item em SQL, já com a conversão de unidades"""
+    return (Item.amount / item_unit_factor_expression()) * Item.price
+
+
+def _value_inputs_changed(current, item: Item) -> bool:
+    """Indica se preço ou unidades do item mudaram em relação ao que está salvo"""
+    current_price = Decimal(str(current.price)) if current.price is not None else None
+    new_price = Decimal(str(item.price)) if item.price is not None else None
+    return (
+        current_price != new_price
+        or current.measure_unity != item.measure_unity
+        or current.price_unit != item.price_unit
+    )
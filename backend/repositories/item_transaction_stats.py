@@ -0,0 +1,158 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from decimal import Decimal
+
+from models import ItemTransactionStats, Transaction, Item
+from utils.unit_converter import get_conversion_factor, unit_factor_expression
+
+
+def item_unit_factor_expression():
+    """Fator de conversão do item em SQL (coluna gravada, recalculada apenas em linhas sem backfill)"""
+    return unit_factor_expression(Item.unit_factor, Item.measure_unity, Item.price_unit)
+
+
+def transaction_value_expression(fallback_to_item_price: bool = True):
+    """Valor convertido de cada transação (por padrão usa o preço do item quando a transação não tem preço)"""
+    price = func.coalesce(Transaction.price, Item.price) if fallback_to_item_price else Transaction.price
+    return (Transaction.amount / item_unit_factor_expression()) * price
+
+
+def calculate_transaction_value(item: Item, transaction: Transaction, fallback_to_item_price: bool = True) -> Decimal | None:
+    """
+    Valor convertido de uma transação em Python, equivalente a transaction_value_expression.
+    Retorna None quando não há preço para valorar a transação.
+    """
+    price_to_use = transaction.price
+    if price_to_use is None and fallback_to_item_price:
+        price_to_use = item.price
+    if price_to_use is None:
+        return None
+
+    factor = item.unit_factor
+    if factor is None:
+        factor = get_conversion_factor(item.measure_unity, item.price_unit)
+
+    return (Decimal(str(transaction.amount)) / Decimal(str(factor))) * Decimal(str(price_to_use))
+
+
+def count_transactions(db: Session) -> int:
+    """Transações que entram nas tabelas derivadas (as de itens existentes, como no refresh)"""
+    return db.query(func.count(Transaction.id)).join(Item, Transaction.item_id == Item.id).scalar()
+
+
+def upsert_statement(db: Session, model):
+    """INSERT com suporte a ON CONFLICT no dialeto do banco da sessão (Postgres em produção, SQLite nos testes)"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+
+class ItemTransactionStatsRepository:
+    @staticmethod
+    def refresh(db: Session, item_ids: list[int] = None) -> None:
+        """
+        Recalcula as estatísticas a partir das transações em uma única consulta agrupada.
+        Sem item_ids, reconstrói a tabela inteira. As linhas são gravadas com upsert,
+        então dois recálculos simultâneos do mesmo item não conflitam na chave. Não faz commit.
+        """
+        trans_value = transaction_value_expression()
+
+        query = db.query(
+            Transaction.item_id,
+            func.count(Transaction.id).label('transaction_count'),
+            func.sum(trans_value).label('total_value'),
+            func.min(trans_value).label('min_value'),
+            func.max(trans_value).label('max_value')
+        ).join(
+            Item, Transaction.item_id == Item.id
+        ).group_by(
+            Transaction.item_id
+        )
+
+        stale = db.query(ItemTransactionStats)
+        if item_ids is not None:
+            query = query.filter(Transaction.item_id.in_(item_ids))
+            stale = stale.filter(ItemTransactionStats.item_id.in_(item_ids))
+
+        rows = [
+            {
+                "item_id": r.item_id,
+                "transaction_count": r.transaction_count,
+                "total_value": r.total_value or Decimal('0'),
+                "min_value": r.min_value,
+                "max_value": r.max_value
+            }
+            for r in query.all()
+        ]
+        stale.delete()
+        if rows:
+            statement = upsert_statement(db, ItemTransactionStats).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=[ItemTransactionStats.item_id],
+                set_={name: statement.excluded[name] for name in rows[0] if name != "item_id"}
+            ))
+
+    @staticmethod
+    def ensure_built(db: Session) -> None:
+        """
+        Reconstrói a tabela de estatísticas quando ela não cobre todas as transações:
+        vazia ou com a soma das contagens diferente do total de transações, o que acontece
+        quando transações são inseridas ou apagadas sem passar pelo TransactionRepository
+        (SQL dos agentes, cargas e restaurações manuais). Alterações de valores feitas
+        assim não mudam a contagem; depois delas rode scripts/rebuild_analytics.py.
+        """
+        counted = db.query(func.coalesce(func.sum(ItemTransactionStats.transaction_count), 0)).scalar()
+        if counted == count_transactions(db):
+            return
+        ItemTransactionStatsRepository.refresh(db)
+        db.commit()
+
+    @staticmethod
+    def apply_transaction(db: Session, transaction: Transaction) -> None:
+        """
+        Atualiza incrementalmente as estatísticas do item com uma transação recém inserida.
+        A transação já deve ter sido enviada ao banco (flush). Não faz commit.
+
+        A soma é feita no próprio banco (INSERT ... ON CONFLICT DO UPDATE SET coluna = coluna + valor),
+        então transações simultâneas do mesmo item não perdem atualizações nem conflitam
+        ao criar a primeira linha do item.
+        """
+        if db.query(ItemTransactionStats.item_id).first() is None:
+            # Tabela ainda não construída: as transações antigas também precisam entrar
+            ItemTransactionStatsRepository.refresh(db)
+            return
+
+        trans_value = calculate_transaction_value(db.get(Item, transaction.item_id), transaction)
+
+        stats = ItemTransactionStats.__table__.c
+        statement = upsert_statement(db, ItemTransactionStats).values(
+            item_id=transaction.item_id,
+            transaction_count=1,
+            total_value=trans_value if trans_value is not None else Decimal('0'),
+            min_value=trans_value,
+            max_value=trans_value
+        )
+        changes = {"transaction_count": stats.transaction_count + 1}
+        if trans_value is not None:
+            changes["total_value"] = stats.total_value + trans_value
+            changes["min_value"] = case((or_(stats.min_value.is_(None), stats.min_value > trans_value), trans_value), else_=stats.min_value)
+            changes["max_value"] = case((or_(stats.max_value.is_(None), stats.max_value < trans_value), trans_value), else_=stats.max_value)
+        db.execute(statement.on_conflict_do_update(index_elements=[stats.item_id], set_=changes))
+
+    @staticmethod
+    def find_all_with_item(db: Session) -> list:
+        """Retorna as estatísticas de cada item que possui transações, junto com o nome do item"""
+        return db.query(
+            Item.id,
+            Item.name,
+            ItemTransactionStats.transaction_count,
+            ItemTransactionStats.total_value,
+            ItemTransactionStats.min_value,
+            ItemTransactionStats.max_value
+        ).join(
+            ItemTransactionStats, ItemTransactionStats.item_id == Item.id
+        ).filter(
+            ItemTransactionStats.transaction_count > 0
+        ).order_by(
+            Item.id
+        ).all()
@@ -3,7 +3,10 @@ from sqlalchemy import func
 from decimal import Decimal
 
 from models import Recipe, RecipeItem, Item
-from utils.unit_converter import calculate_item_total_value, calculate_unit_price
+from utils.unit_converter import calculate_unit_prices
+from utils.cache import invalidate_tables, recipe_cost_cache
+from utils.name_index import recipe_title_index
+from .recipe_availability import RecipeAvailabilityRepository, recipe_ingredients_query
 
 class RecipeRepository:
     @staticmethod
@@ -19,7 +22,9 @@ class RecipeRepository:
         else:
             db.add(recipe)
         db.commit()
+        invalidate_tables(Recipe.__tablename__)
         db.refresh(recipe)
+        recipe_title_index.upsert(recipe.id, recipe.title)
         return recipe
 
     @staticmethod
@@ -39,6 +44,8 @@ class RecipeRepository:
         if recipe is not None:
             db.delete(recipe)
             db.commit()
+            invalidate_tables(Recipe.__tablename__)
+            recipe_title_index.remove(id)
 
     @staticmethod
     def find_by_name(db: Session, title: int) -> list[type[Recipe]]:
@@ -49,6 +56,19 @@ class RecipeRepository:
             .all()
         )
 
+    @staticmethod
+    def search_by_title(db: Session, title: str, limit: int = 10) -> list[Recipe]:
+        """Busca aproximada pelo título usando o índice de trigramas em memória, da mais à menos relevante."""
+        if recipe_title_index.is_stale():
+            recipe_title_index.build((id, recipe_title, None) for id, recipe_title in db.query(Recipe.id, Recipe.title))
+
+        matches = recipe_title_index.search(title, limit)
+        if not matches:
+            return []
+
+        recipes = {recipe.id: recipe for recipe in db.query(Recipe).filter(Recipe.id.in_([m["id"] for m in matches]))}
+        return [recipes[m["id"]] for m in matches if m["id"] in recipes]
+
     @staticmethod
     def exist_by_name(db: Session, name: int) -> bool:
         """Verifica se uma receita existe pelo seu nome."""
@@ -58,73 +78,89 @@ class RecipeRepository:
         else:
             return True
 
+    @staticmethod
+    def find_recipes_cost(db: Session, recipe_ids: list[int] = None) -> list[dict]:
+        """
+        Calcula o custo de várias receitas com uma única consulta (receita x ingrediente x item)
+        e uma única conversão de unidades em lote.
+
+        O resultado de cada receita fica em cache; a chave são os próprios dados lidos dos
+        ingredientes (quantidades, preços, unidades e update_at dos itens), então qualquer
+        alteração neles gera uma nova entrada em vez de servir um custo antigo.
+        """
+        rows = db.execute(recipe_ingredients_query(recipe_ids)).all()
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row.recipe_id, []).append(row)
+
+        costs = {}
+        pending = []
+        for recipe_id, recipe_rows in grouped.items():
+            key = ("recipe_cost", tuple(tuple(row) for row in recipe_rows))
+            found, value = recipe_cost_cache.get("recipes/cost", key)
+            if found:
+                costs[recipe_id] = value
+            else:
+                pending.append((recipe_id, key, [row for row in recipe_rows if row.item_id is not None]))
+
+        ingredient_rows = [row for _, _, recipe_rows in pending for row in recipe_rows]
+        unit_prices = iter(calculate_unit_prices(
+            [row.price or 0 for row in ingredient_rows],
+            [row.price_unit for row in ingredient_rows],
+            [row.measure_unity for row in ingredient_rows]
+        ))
+
+        for recipe_id, key, recipe_rows in pending:
+            total_cost = Decimal('0')
+            ingredients = []
+            for row in recipe_rows:
+                unit_price = next(unit_prices)
+                item_cost = Decimal(str(row.required)) * unit_price
+                total_cost += item_cost
+                ingredients.append({
+                    "item_id": row.item_id,
+                    "item_name": row.item_name,
+                    "required_amount": float(row.required),
+                    "measure_unity": row.measure_unity,
+                    "unit_price": float(unit_price),
+                    "price_reference": f"{float(row.price or 0)}/{row.price_unit}",
+                    "total_cost": float(item_cost)
+                })
+
+            costs[recipe_id] = {
+                "recipe_id": recipe_id,
+                "recipe_title": grouped[recipe_id][0].title,
+                "total_cost": float(total_cost),
+                "ingredients": ingredients
+            }
+            recipe_cost_cache.set(key, costs[recipe_id], ())
+
+        return [costs[recipe_id] for recipe_id in grouped]
+
     @staticmethod
     def find_recipe_cost(db: Session, recipe_id: int) -> dict:
         """Calcula o custo total de uma receita baseado nos preços atuais com conversão de unidades"""
-        recipe = db.query(Recipe).options(joinedload(Recipe.recipe_itens)).filter(Recipe.id == recipe_id).first()
-        if not recipe:
-            return None
-
-        total_cost = Decimal('0')
-        ingredients = []
-
-        for recipe_item in recipe.recipe_itens:
-            item = recipe_item.item
-
-            unit_price = calculate_unit_price(
-                Decimal(str(item.price)),
-                item.price_unit,
-                item.measure_unity
-            )
-
-            item_cost = Decimal(str(recipe_item.amount)) * unit_price
-            total_cost += item_cost
-
-            ingredients.append({
-                "item_id": item.id,
-                "item_name": item.name,
-                "required_amount": float(recipe_item.amount),
-                "measure_unity": item.measure_unity,
-                "unit_price": float(unit_price),
-                "price_reference": f"{float(item.price)}/{item.price_unit}",
-                "total_cost": float(item_cost)
-            })
-
-        return {
-            "recipe_id": recipe.id,
-            "recipe_title": recipe.title,
-            "total_cost": float(total_cost),
-            "ingredients": ingredients
-        }
+        costs = RecipeRepository.find_recipes_cost(db, [recipe_id])
+        return costs[0] if costs else None
 
     @staticmethod
     def find_all_recipes_with_cost(db: Session) -> list[dict]:
         """Retorna todas as receitas com seus custos calculados"""
-        recipes = db.query(Recipe).options(joinedload(Recipe.recipe_itens)).all()
-        return [
-            RecipeRepository.find_recipe_cost(db, recipe.id)
-            for recipe in recipes
-        ]
+        return RecipeRepository.find_recipes_cost(db)
 
     @staticmethod
     def find_feasible_recipes(db: Session) -> list[dict]:
-        """Retorna receitas que podem ser feitas com o estoque atual"""
-        recipes = db.query(Recipe).options(joinedload(Recipe.recipe_itens)).all()
-        feasible = []
-        for recipe in recipes:
-            can_make = True
-            for recipe_item in recipe.recipe_itens:
-                item = recipe_item.item
-                if item.amount < recipe_item.amount:
-                    can_make = False
-            if can_make:
-                recipe_cost = RecipeRepository.find_recipe_cost(db, recipe.id)
-                feasible.append({
-                    "recipe_id": recipe.id,
-                    "recipe_title": recipe.title,
-                    "total_cost": recipe_cost['total_cost']
-                })
-        return feasible
+        """Retorna receitas que podem ser feitas com o estoque atual e quantas vezes cada uma"""
+        return [
+            {
+                "recipe_id": recipe["recipe_id"],
+                "recipe_title": recipe["recipe_title"],
+                "total_cost": recipe["total_cost"],
+                "max_batches": recipe["max_batches"]
+            }
+            for recipe in RecipeAvailabilityRepository.find_availability(db)
+            if recipe["feasible"]
+        ]
 
     @staticmethod
     def find_most_used_ingredients(db: Session, limit: int = 10) -> list[dict]:
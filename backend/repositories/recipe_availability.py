@@ -0,0 +1,126 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from decimal import Decimal
+
+from models import Recipe, RecipeItem, Item
+from utils.unit_converter import calculate_unit_prices
+from utils.recipe_planner import RecipeMatrix, max_batches_by_recipe, is_feasible
+
+
+def recipe_ingredients_query(recipe_ids: list[int] = None):
+    """
+    Uma linha por (receita, ingrediente) com a quantidade pedida, o estoque e o preço
+    do item. Receitas sem ingredientes aparecem com as colunas do item nulas.
+    """
+    query = (
+        select(
+            Recipe.id.label("recipe_id"),
+            Recipe.title,
+            Recipe.description,
+            RecipeItem.item_id,
+            RecipeItem.amount.label("required"),
+            Item.name.label("item_name"),
+            Item.amount.label("stock"),
+            Item.measure_unity,
+            Item.price,
+            Item.price_unit,
+            Item.update_at
+        )
+        .select_from(Recipe)
+        .outerjoin(RecipeItem, RecipeItem.recipe_id == Recipe.id)
+        .outerjoin(Item, Item.id == RecipeItem.item_id)
+        .order_by(Recipe.id, RecipeItem.item_id)
+    )
+    if recipe_ids is not None:
+        query = query.where(Recipe.id.in_(recipe_ids))
+    return query
+
+
+def ingredients_matrix(rows) -> RecipeMatrix:
+    """Matriz receitas x itens (com o estoque) montada a partir das linhas de recipe_ingredients_query"""
+    ingredient_rows = [row for row in rows if row.item_id is not None]
+    return RecipeMatrix(
+        list(dict.fromkeys((row.recipe_id, row.title) for row in rows)),
+        sorted({(row.item_id, row.item_name, row.measure_unity, row.stock, 0) for row in ingredient_rows}),
+        [(row.recipe_id, row.item_id, row.required) for row in ingredient_rows]
+    )
+
+
+class RecipeAvailabilityRepository:
+    @staticmethod
+    def count_feasible(db: Session) -> int:
+        """Quantas receitas podem ser feitas ao menos uma vez com o estoque atual"""
+        rows = db.execute(recipe_ingredients_query()).all()
+        return sum(is_feasible(batches) for batches in max_batches_by_recipe(ingredients_matrix(rows)).values())
+
+    @staticmethod
+    def find_availability(db: Session, recipe_ids: list[int] = None) -> list[dict]:
+        """
+        Calcula, com uma única consulta, a viabilidade de cada receita com o estoque atual:
+        se pode ser feita, quantas vezes (max_batches), o custo de uma vez e o que falta.
+
+        Args:
+            recipe_ids: Restringe o cálculo a estas receitas (todas por padrão)
+
+        Returns:
+            Lista ordenada pelo ID da receita
+        """
+        rows = db.execute(recipe_ingredients_query(recipe_ids)).all()
+        ingredient_rows = [row for row in rows if row.item_id is not None]
+        unit_prices = dict(zip(
+            ((row.recipe_id, row.item_id) for row in ingredient_rows),
+            calculate_unit_prices(
+                [row.price or 0 for row in ingredient_rows],
+                [row.price_unit for row in ingredient_rows],
+                [row.measure_unity for row in ingredient_rows]
+            )
+        ))
+
+        recipes = {}
+        for row in rows:
+            recipe = recipes.setdefault(row.recipe_id, {
+                "recipe_id": row.recipe_id,
+                "recipe_title": row.title,
+                "description": row.description,
+                "rows": []
+            })
+            if row.item_id is not None:
+                recipe["rows"].append(row)
+
+        # Mesmo cálculo de /recipes/max-batches, montado a partir das linhas desta consulta;
+        # a viabilidade sai dele (max_batches >= 1) para as duas respostas nunca divergirem
+        batches = max_batches_by_recipe(ingredients_matrix(rows))
+
+        availability = []
+        for recipe in recipes.values():
+            recipe_rows = recipe.pop("rows")
+            required = [Decimal(str(row.required)) for row in recipe_rows]
+            available = [Decimal(str(row.stock)) for row in recipe_rows]
+            total_cost = sum(
+                (amount * unit_prices[(row.recipe_id, row.item_id)] for row, amount in zip(recipe_rows, required)),
+                Decimal("0")
+            )
+            ingredients = [
+                {
+                    "item_id": row.item_id,
+                    "item_name": row.item_name,
+                    "measure_unity": row.measure_unity,
+                    "required_amount": float(amount),
+                    "available_amount": float(stock),
+                    "missing_amount": float(max(amount - stock, Decimal("0")))
+                }
+                for row, amount, stock in zip(recipe_rows, required, available)
+            ]
+            feasible = is_feasible(batches[recipe["recipe_id"]])
+            missing = [] if feasible else [ingredient for ingredient in ingredients if ingredient["missing_amount"] > 0]
+
+            availability.append({
+                **recipe,
+                "feasible": feasible,
+                "max_batches": batches[recipe["recipe_id"]],
+                "total_cost": float(total_cost),
+                "ingredients": ingredients,
+                "missing": missing
+            })
+
+        return availability
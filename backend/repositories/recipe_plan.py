@@ -0,0 +1,96 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+import numpy as np
+
+from models import Recipe, RecipeItem, Item
+from utils.unit_converter import calculate_item_total_values_float
+from utils.recipe_planner import RecipeMatrix, max_batches_by_recipe, shopping_list
+
+
+class RecipePlanRepository:
+    @staticmethod
+    def load_matrix(db: Session) -> RecipeMatrix:
+        """
+        Carrega receitas, ingredientes e itens usados em receitas em três consultas
+        e monta a matriz receita x item com estoque e preço por unidade de medida.
+        """
+        recipes = db.execute(select(Recipe.id, Recipe.title).order_by(Recipe.id)).all()
+        recipe_items = db.execute(select(RecipeItem.recipe_id, RecipeItem.item_id, RecipeItem.amount)).all()
+        items = db.execute(
+            select(Item.id, Item.name, Item.measure_unity, Item.amount, Item.price, Item.price_unit)
+            .where(Item.id.in_(select(RecipeItem.item_id).distinct()))
+            .order_by(Item.id)
+        ).all()
+
+        unit_prices = calculate_item_total_values_float(
+            np.ones(len(items)),
+            [row.price or 0 for row in items],
+            [row.measure_unity for row in items],
+            [row.price_unit for row in items]
+        )
+        return RecipeMatrix(
+            recipes,
+            [
+                (row.id, row.name, row.measure_unity, row.amount, unit_price)
+                for row, unit_price in zip(items, unit_prices)
+            ],
+            recipe_items
+        )
+
+    @staticmethod
+    def find_max_batches(db: Session) -> list[dict]:
+        """Quantas vezes cada receita pode ser feita com o estoque atual (None se não tem ingredientes)"""
+        matrix = RecipePlanRepository.load_matrix(db)
+        batches = max_batches_by_recipe(matrix)
+        return [
+            {"recipe_id": recipe_id, "recipe_title": title, "max_batches": count}
+            for (recipe_id, count), title in zip(batches.items(), matrix.recipe_titles)
+        ]
+
+    @staticmethod
+    def find_shopping_list(db: Session, plan: dict[int, int]) -> dict:
+        """
+        Lista de compras mais barata para produzir um plano.
+
+        Args:
+            plan: Quantas vezes cada receita (pelo ID) será feita
+
+        Returns:
+            Receitas do plano, demanda, estoque, quantidade a comprar e custo por item
+            (só itens usados pelo plano) e o custo total da compra
+
+        Raises:
+            ValueError: Se alguma receita do plano não existir
+        """
+        matrix = RecipePlanRepository.load_matrix(db)
+        positions = {int(recipe_id): index for index, recipe_id in enumerate(matrix.recipe_ids)}
+        unknown = [recipe_id for recipe_id in plan if recipe_id not in positions]
+        if unknown:
+            raise ValueError(f"Receita com id {unknown[0]} não encontrada.")
+
+        batches = np.zeros(len(matrix.recipe_ids), dtype=np.float64)
+        for recipe_id, count in plan.items():
+            batches[positions[recipe_id]] = count
+
+        demand, to_buy, cost = shopping_list(matrix.requirements, matrix.stock, matrix.unit_prices, batches)
+        used = np.flatnonzero(demand > 0)
+
+        return {
+            "recipes": [
+                {"recipe_id": recipe_id, "recipe_title": matrix.recipe_titles[positions[recipe_id]], "batches": count}
+                for recipe_id, count in plan.items()
+            ],
+            "items": [
+                {
+                    "item_id": int(matrix.item_ids[i]),
+                    "item_name": matrix.item_names[i],
+                    "measure_unity": matrix.measure_unities[i],
+                    "required_amount": float(demand[i]),
+                    "available_amount": float(matrix.stock[i]),
+                    "to_buy": float(to_buy[i]),
+                    "cost": float(cost[i])
+                }
+                for i in used
+            ],
+            "total_cost": float(cost.sum())
+        }
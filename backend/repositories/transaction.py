@@ -1,10 +1,52 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc, extract
-from datetime import datetime, timedelta
+from sqlalchemy import func, and_, or_, desc, extract, select, insert
+from typing import Iterator
+from datetime import datetime, timedelta, date
 from decimal import Decimal
 
-from models import Transaction, Item
-from utils.unit_converter import calculate_item_total_value
+from models import Transaction, Item, TransactionDailyRollup
+from .item_transaction_stats import ItemTransactionStatsRepository, transaction_value_expression
+from .transaction_rollup import TransactionRollupRepository, rollup_key
+from utils.cache import invalidate_tables
+
+
+def transaction_page_query(
+        limit: int | None = None,
+        after: tuple[date, int] | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        order_type: str | None = None,
+        item_id: int | None = None
+):
+    """Consulta de uma página de transações com o nome do item, usada pelos repositórios síncrono e assíncrono"""
+    query = select(
+        Transaction,
+        Item.name.label('item_name')
+    ).join(
+        Item, Transaction.item_id == Item.id
+    )
+
+    if item_id is not None:
+        query = query.where(Transaction.item_id == item_id)
+    if order_type:
+        query = query.where(Transaction.order_type == order_type)
+    if start_date is not None:
+        query = query.where(Transaction.create_at >= start_date)
+    if end_date is not None:
+        query = query.where(Transaction.create_at <= end_date)
+    if after is not None:
+        after_date, after_id = after
+        query = query.where(
+            or_(
+                Transaction.create_at < after_date,
+                and_(Transaction.create_at == after_date, Transaction.id < after_id)
+            )
+        )
+
+    query = query.order_by(desc(Transaction.create_at), desc(Transaction.id))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
 
 class TransactionRepository:
@@ -17,12 +59,107 @@ class TransactionRepository:
     def save(db: Session, transaction: Transaction) -> Transaction:
         """Salva ou atualiza uma transação no banco de dados."""
         if transaction.id:
+            previous = db.query(Transaction).filter(Transaction.id == transaction.id).first()
+            previous_key = rollup_key(previous) if previous is not None else None
             db.merge(transaction)
+            db.flush()
+            affected_keys = list({previous_key, rollup_key(transaction)} - {None})
+            ItemTransactionStatsRepository.refresh(db, list({key[1] for key in affected_keys}))
+            TransactionRollupRepository.refresh(db, keys=affected_keys)
         else:
             db.add(transaction)
+            db.flush()
+            ItemTransactionStatsRepository.apply_transaction(db, transaction)
+            TransactionRollupRepository.apply_transaction(db, transaction)
         db.commit()
+        invalidate_tables(Transaction.__tablename__)
         return transaction
 
+    @staticmethod
+    def bulk_insert(db: Session, rows: list[dict]) -> list[int]:
+        """
+        Insere várias transações em uma única transação (executemany) e retorna os IDs
+        na mesma ordem das linhas recebidas. As estatísticas dos itens afetados e os
+        agregados diários só dos dias tocados pela carga são recalculados uma vez, no mesmo commit.
+        """
+        if not rows:
+            return []
+        result = db.execute(
+            insert(Transaction).returning(
+                Transaction.id, Transaction.create_at, Transaction.item_id, Transaction.order_type,
+                sort_by_parameter_order=True
+            ),
+            rows
+        )
+        inserted = result.all()
+        ids = [row.id for row in inserted]
+
+        # Chaves lidas do banco: create_at já gravado como data (ou com o padrão da coluna)
+        keys = list({(row.create_at, row.item_id, row.order_type) for row in inserted})
+        ItemTransactionStatsRepository.refresh(db, list({row.item_id for row in inserted}))
+        TransactionRollupRepository.refresh(db, keys=keys)
+        db.commit()
+        invalidate_tables(Transaction.__tablename__)
+        return ids
+
+    @staticmethod
+    def find_page(
+            db: Session,
+            limit: int | None = None,
+            after: tuple[date, int] | None = None,
+            start_date: date | None = None,
+            end_date: date | None = None,
+            order_type: str | None = None,
+            item_id: int | None = None
+    ) -> list:
+        """
+        Retorna transações da mais recente para a mais antiga junto com o nome do item.
+        A paginação é por chave (create_at, id): `after` é a posição da última linha
+        da página anterior, e a próxima página começa logo depois dela.
+        """
+        return db.execute(
+            transaction_page_query(limit, after, start_date, end_date, order_type, item_id)
+        ).all()
+
+    @staticmethod
+    def stream_ledger(
+            db: Session,
+            start_date: date | None = None,
+            end_date: date | None = None,
+            batch_size: int = 1000
+    ) -> Iterator[list]:
+        """
+        Percorre o histórico de transações junto com os dados do item, em lotes de
+        `batch_size` linhas, usando cursor no servidor (stream_results) para que a
+        memória usada não dependa do tamanho do histórico
+        """
+        query = select(
+            Transaction.id,
+            Transaction.create_at,
+            Transaction.order_type,
+            Transaction.description,
+            Transaction.item_id,
+            Item.name.label('item_name'),
+            Item.measure_unity,
+            Transaction.amount,
+            Transaction.price,
+            Item.price_unit,
+            transaction_value_expression().label('total_value')
+        ).join(
+            Item, Transaction.item_id == Item.id
+        ).order_by(
+            Transaction.create_at, Transaction.id
+        )
+
+        if start_date is not None:
+            query = query.where(Transaction.create_at >= start_date)
+        if end_date is not None:
+            query = query.where(Transaction.create_at <= end_date)
+
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            yield batch
+
     @staticmethod
     def find_by_id(db: Session, id: int) -> Transaction | None:
         """Recupera uma transação pelo seu ID."""
@@ -43,8 +180,13 @@ class TransactionRepository:
         """Remove uma transação pelo seu ID."""
         transaction = db.query(Transaction).filter(Transaction.id == id).first()
         if transaction is not None:
+            key = rollup_key(transaction)
             db.delete(transaction)
+            db.flush()
+            ItemTransactionStatsRepository.refresh(db, [transaction.item_id])
+            TransactionRollupRepository.refresh(db, keys=[key])
             db.commit()
+            invalidate_tables(Transaction.__tablename__)
 
     @staticmethod
     def find_transaction_summary_by_period(
@@ -52,19 +194,29 @@ class TransactionRepository:
             start_date: datetime = None,
             end_date: datetime = None
     ) -> dict:
-        """Resumo de entradas e saídas por período com conversão de unidades"""
+        """Resumo de entradas e saídas por período com conversão de unidades, lido dos agregados diários"""
         if not start_date:
             start_date = datetime.now() - timedelta(days=30)
         if not end_date:
             end_date = datetime.now()
 
-        transactions = db.query(Transaction).join(
-            Item, Transaction.item_id == Item.id
+        TransactionRollupRepository.ensure_built(db)
+
+        order_type = func.lower(TransactionDailyRollup.order_type)
+
+        results = db.query(
+            order_type.label('order_type'),
+            func.sum(TransactionDailyRollup.transaction_count).label('count'),
+            func.sum(TransactionDailyRollup.total_amount).label('total_amount'),
+            func.sum(TransactionDailyRollup.total_value).label('total_value')
         ).filter(
             and_(
-                Transaction.create_at >= start_date.date(),
-                Transaction.create_at <= end_date.date()
+                TransactionDailyRollup.day >= start_date.date(),
+                TransactionDailyRollup.day <= end_date.date(),
+                order_type.in_(['entrada', 'saida', 'saída'])
             )
+        ).group_by(
+            order_type
         ).all()
 
         total_entries = Decimal('0')
@@ -74,26 +226,15 @@ class TransactionRepository:
         count_entries = 0
         count_exits = 0
 
-        for trans in transactions:
-            item = trans.item
-
-            price_to_use = trans.price if trans.price is not None else item.price
-
-            trans_value = calculate_item_total_value(
-                trans.amount,
-                price_to_use,
-                item.measure_unity,
-                item.price_unit
-            )
-
-            if trans.order_type.lower() == 'entrada':
-                total_entries += trans.amount
-                value_entries += trans_value
-                count_entries += 1
-            elif trans.order_type.lower() == 'saida' or trans.order_type.lower() == 'saída':
-                total_exits += trans.amount
-                value_exits += trans_value
-                count_exits += 1
+        for r in results:
+            if r.order_type == 'entrada':
+                total_entries += r.total_amount or 0
+                value_entries += r.total_value or 0
+                count_entries += int(r.count)
+            else:
+                total_exits += r.total_amount or 0
+                value_exits += r.total_value or 0
+                count_exits += int(r.count)
 
         return {
             "period": {
@@ -123,54 +264,36 @@ class TransactionRepository:
             limit: int = 10
     ) -> list[dict]:
         """Retorna os itens com mais transações com conversão de unidades"""
-        query = db.query(Transaction).join(Item, Transaction.item_id == Item.id)
+        trans_value = transaction_value_expression()
+        transaction_count = func.count(Transaction.id)
+
+        query = db.query(
+            Item.id,
+            Item.name,
+            transaction_count.label('transaction_count'),
+            func.sum(Transaction.amount).label('total_amount'),
+            func.sum(trans_value).label('total_value')
+        ).join(
+            Item, Transaction.item_id == Item.id
+        )
 
         # Tratar 'null' como None e filtrar apenas se order_type for válido
         if order_type and order_type.lower() not in ['null', 'none', 'all']:
             query = query.filter(Transaction.order_type == order_type)
 
-        transactions = query.all()
-
-        item_stats = {}
-
-        for trans in transactions:
-            item = trans.item
-
-            if item.id not in item_stats:
-                item_stats[item.id] = {
-                    "item_id": item.id,
-                    "item_name": item.name,
-                    "transaction_count": 0,
-                    "total_amount": Decimal('0'),
-                    "total_value": Decimal('0')
-                }
-
-            item_stats[item.id]["transaction_count"] += 1
-            item_stats[item.id]["total_amount"] += trans.amount
-
-            price_to_use = trans.price if trans.price is not None else item.price
-
-            trans_value = calculate_item_total_value(
-                trans.amount,
-                price_to_use,
-                item.measure_unity,
-                item.price_unit
-            )
-            item_stats[item.id]["total_value"] += trans_value
-
-        results = sorted(
-            item_stats.values(),
-            key=lambda x: x["transaction_count"],
-            reverse=True
-        )[:limit]
+        results = query.group_by(
+            Item.id, Item.name
+        ).order_by(
+            transaction_count.desc(), Item.id
+        ).limit(limit).all()
 
         return [
             {
-                "item_id": r["item_id"],
-                "item_name": r["item_name"],
-                "transaction_count": r["transaction_count"],
-                "total_amount": float(r["total_amount"]),
-                "total_value": float(r["total_value"])
+                "item_id": r.id,
+                "item_name": r.name,
+                "transaction_count": r.transaction_count,
+                "total_amount": float(r.total_amount),
+                "total_value": float(r.total_value or 0)
             }
             for r in results
         ]
@@ -180,28 +303,29 @@ class TransactionRepository:
             db: Session,
             days: int = 30
     ) -> list[dict]:
-        """Retorna contagem de transações por dia"""
+        """Retorna contagem de transações por dia, lida dos agregados diários"""
         start_date = datetime.now() - timedelta(days=days)
+        TransactionRollupRepository.ensure_built(db)
 
         results = db.query(
-            func.date(Transaction.create_at).label('date'),
-            Transaction.order_type,
-            func.count(Transaction.id).label('count'),
-            func.sum(Transaction.amount).label('total_amount')
+            TransactionDailyRollup.day,
+            TransactionDailyRollup.order_type,
+            func.sum(TransactionDailyRollup.transaction_count).label('count'),
+            func.sum(TransactionDailyRollup.total_amount).label('total_amount')
         ).filter(
-            Transaction.create_at >= start_date.date()
+            TransactionDailyRollup.day >= start_date.date()
         ).group_by(
-            func.date(Transaction.create_at),
-            Transaction.order_type
+            TransactionDailyRollup.day,
+            TransactionDailyRollup.order_type
         ).order_by(
-            func.date(Transaction.create_at)
+            TransactionDailyRollup.day
         ).all()
 
         return [
             {
-                "date": r.date.strftime("%Y-%m-%d"),
+                "date": r.day.strftime("%Y-%m-%d"),
                 "order_type": r.order_type,
-                "count": r.count,
+                "count": int(r.count),
                 "total_amount": float(r.total_amount)
             }
             for r in results
@@ -209,61 +333,44 @@ class TransactionRepository:
 
     @staticmethod
     def find_average_transaction_value_by_item(db: Session) -> list[dict]:
-        """Retorna valor médio de transação por item considerando conversão de unidades"""
-        items_with_transactions = db.query(Item).join(
-            Transaction, Item.id == Transaction.item_id
-        ).distinct().all()
-
-        results = []
-
-        for item in items_with_transactions:
-            transactions = db.query(Transaction).filter(
-                Transaction.item_id == item.id
-            ).all()
-
-            prices = []
-            for trans in transactions:
-                price_to_use = trans.price if trans.price is not None else item.price
-
-                trans_value = calculate_item_total_value(
-                    trans.amount,
-                    price_to_use,
-                    item.measure_unity,
-                    item.price_unit
-                )
-                prices.append(trans_value)
-
-            if prices:
-                results.append({
-                    "item_id": item.id,
-                    "item_name": item.name,
-                    "avg_price": float(sum(prices) / len(prices)),
-                    "min_price": float(min(prices)),
-                    "max_price": float(max(prices)),
-                    "transaction_count": len(transactions)
-                })
+        """
+        Retorna valor médio, mínimo e máximo de transação por item considerando conversão de unidades.
+        Lê da tabela de estatísticas por item, mantida incrementalmente a cada escrita.
+        """
+        ItemTransactionStatsRepository.ensure_built(db)
 
-        return results
+        return [
+            {
+                "item_id": r.id,
+                "item_name": r.name,
+                "avg_price": float(Decimal(str(r.total_value)) / r.transaction_count),
+                "min_price": float(r.min_value or 0),
+                "max_price": float(r.max_value or 0),
+                "transaction_count": r.transaction_count
+            }
+            for r in ItemTransactionStatsRepository.find_all_with_item(db)
+        ]
 
     @staticmethod
     def find_consumption_rate_by_item(
             db: Session,
             days: int = 30
     ) -> list[dict]:
-        """Calcula taxa de consumo (saídas) por item nos últimos N dias"""
+        """Calcula taxa de consumo (saídas) por item nos últimos N dias, a partir dos agregados diários"""
         start_date = datetime.now() - timedelta(days=days)
+        TransactionRollupRepository.ensure_built(db)
 
         results = db.query(
             Item.id,
             Item.name,
             Item.amount.label('current_stock'),
-            func.sum(Transaction.amount).label('total_consumed')
+            func.sum(TransactionDailyRollup.total_amount).label('total_consumed')
         ).join(
-            Transaction, Item.id == Transaction.item_id
+            TransactionDailyRollup, Item.id == TransactionDailyRollup.item_id
         ).filter(
             and_(
-                Transaction.order_type.in_(['saida', 'saída']),
-                Transaction.create_at >= start_date.date()
+                TransactionDailyRollup.order_type.in_(['saida', 'saída']),
+                TransactionDailyRollup.day >= start_date.date()
             )
         ).group_by(
             Item.id, Item.name, Item.amount
@@ -299,48 +406,38 @@ class TransactionRepository:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=months * 30)
 
-        # Buscar transações de entrada no período
-        transactions = db.query(Transaction).join(
-            Item, Transaction.item_id == Item.id
+        TransactionRollupRepository.ensure_built(db)
+
+        year = extract('year', TransactionDailyRollup.day)
+        month = extract('month', TransactionDailyRollup.day)
+
+        # Agrupar por mês os agregados diários de entrada no período
+        results = db.query(
+            year.label('year'),
+            month.label('month'),
+            func.sum(TransactionDailyRollup.transaction_count).label('transaction_count'),
+            func.sum(TransactionDailyRollup.priced_value).label('total_spent')
         ).filter(
             and_(
-                Transaction.order_type.in_(['entrada', 'compra']),
-                Transaction.create_at >= start_date.date(),
-                Transaction.create_at <= end_date.date()
+                TransactionDailyRollup.order_type.in_(['entrada', 'compra']),
+                TransactionDailyRollup.day >= start_date.date(),
+                TransactionDailyRollup.day <= end_date.date()
             )
+        ).group_by(
+            year, month
         ).all()
 
-        # Agrupar por mês e calcular valores com conversão de unidades
         monthly_totals = {}
 
-        for trans in transactions:
-            item = trans.item
-            year = trans.create_at.year
-            month = trans.create_at.month
-            key = f"{year}-{month:02d}"
-
-            if key not in monthly_totals:
-                monthly_totals[key] = {
-                    "year": year,
-                    "month": month,
-                    "month_label": key,
-                    "transaction_count": 0,
-                    "total_spent": 0.0
-                }
-
-            # Calcular valor usando conversão de unidades
-            price_to_use = trans.price if trans.price is not None else 0.0
-
-            if price_to_use > 0:
-                trans_value = calculate_item_total_value(
-                    trans.amount,
-                    price_to_use,
-                    item.measure_unity,
-                    item.price_unit
-                )
-                monthly_totals[key]["total_spent"] += float(trans_value)
-
-            monthly_totals[key]["transaction_count"] += 1
+        for r in results:
+            key = f"{int(r.year)}-{int(r.month):02d}"
+            monthly_totals[key] = {
+                "year": int(r.year),
+                "month": int(r.month),
+                "month_label": key,
+                "transaction_count": int(r.transaction_count),
+                "total_spent": float(r.total_spent or 0)
+            }
 
         # Converter para lista ordenada
         monthly_data = sorted(monthly_totals.values(), key=lambda x: (x["year"], x["month"]))
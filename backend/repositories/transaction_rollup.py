@@ -0,0 +1,149 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, tuple_
+from datetime import date, datetime
+from decimal import Decimal
+
+from models import TransactionDailyRollup, Transaction, Item
+from .item_transaction_stats import transaction_value_expression, calculate_transaction_value, upsert_statement, count_transactions
+
+
+# Chave primária da tabela de agregados
+ROLLUP_KEY_COLUMNS = ["day", "item_id", "order_type"]
+# Chaves por consulta no refresh restrito (3 parâmetros por chave)
+REFRESH_KEYS_CHUNK = 1000
+
+
+def transaction_day(transaction: Transaction) -> date:
+    """Dia de referência da transação no rollup"""
+    if isinstance(transaction.create_at, datetime):
+        return transaction.create_at.date()
+    return transaction.create_at
+
+
+def rollup_key(transaction: Transaction) -> tuple:
+    """Chave (dia, item, tipo) do rollup ao qual a transação pertence"""
+    return transaction_day(transaction), transaction.item_id, transaction.order_type
+
+
+class TransactionRollupRepository:
+    @staticmethod
+    def refresh(db: Session, item_ids: list[int] = None, keys: list[tuple] = None) -> None:
+        """
+        Recalcula os agregados diários (dia x item x tipo) a partir das transações.
+        Pode ser restrito a alguns itens ou a algumas chaves (dia, item_id, order_type);
+        sem filtros, reconstrói a tabela inteira. Muitas chaves são processadas em lotes
+        de REFRESH_KEYS_CHUNK. As linhas são gravadas com upsert,
+        então dois recálculos simultâneos da mesma chave não conflitam. Não faz commit.
+        """
+        if keys is not None and len(keys) > REFRESH_KEYS_CHUNK:
+            for start in range(0, len(keys), REFRESH_KEYS_CHUNK):
+                TransactionRollupRepository.refresh(db, item_ids, keys[start:start + REFRESH_KEYS_CHUNK])
+            return
+
+        priced_value = case(
+            (
+                Transaction.price > 0,
+                transaction_value_expression(fallback_to_item_price=False)
+            ),
+            else_=Decimal('0')
+        )
+
+        query = db.query(
+            Transaction.create_at.label('day'),
+            Transaction.item_id,
+            Transaction.order_type,
+            func.count(Transaction.id).label('transaction_count'),
+            func.sum(Transaction.amount).label('total_amount'),
+            func.sum(transaction_value_expression()).label('total_value'),
+            func.sum(priced_value).label('priced_value')
+        ).join(
+            Item, Transaction.item_id == Item.id
+        ).group_by(
+            Transaction.create_at, Transaction.item_id, Transaction.order_type
+        )
+
+        stale = db.query(TransactionDailyRollup)
+        if item_ids is not None:
+            query = query.filter(Transaction.item_id.in_(item_ids))
+            stale = stale.filter(TransactionDailyRollup.item_id.in_(item_ids))
+        if keys is not None:
+            query = query.filter(tuple_(Transaction.create_at, Transaction.item_id, Transaction.order_type).in_(keys))
+            stale = stale.filter(
+                tuple_(TransactionDailyRollup.day, TransactionDailyRollup.item_id, TransactionDailyRollup.order_type).in_(keys)
+            )
+
+        rows = [
+            {
+                "day": r.day,
+                "item_id": r.item_id,
+                "order_type": r.order_type,
+                "transaction_count": r.transaction_count,
+                "total_amount": r.total_amount or Decimal('0'),
+                "total_value": r.total_value or Decimal('0'),
+                "priced_value": r.priced_value or Decimal('0')
+            }
+            for r in query.all()
+        ]
+        stale.delete()
+        if rows:
+            statement = upsert_statement(db, TransactionDailyRollup).values(rows)
+            db.execute(statement.on_conflict_do_update(
+                index_elements=ROLLUP_KEY_COLUMNS,
+                set_={name: statement.excluded[name] for name in rows[0] if name not in ROLLUP_KEY_COLUMNS}
+            ))
+
+    @staticmethod
+    def ensure_built(db: Session) -> None:
+        """
+        Reconstrói os rollups quando eles não cobrem todas as transações: tabela vazia ou
+        soma das contagens diferente do total de transações (escritas feitas fora do
+        TransactionRepository, como o SQL dos agentes ou cargas manuais). Alterações de
+        valores feitas assim não mudam a contagem; depois delas rode scripts/rebuild_analytics.py.
+        """
+        counted = db.query(func.coalesce(func.sum(TransactionDailyRollup.transaction_count), 0)).scalar()
+        if counted == count_transactions(db):
+            return
+        TransactionRollupRepository.refresh(db)
+        db.commit()
+
+    @staticmethod
+    def apply_transaction(db: Session, transaction: Transaction) -> None:
+        """
+        Soma uma transação recém inserida ao agregado do seu dia.
+        A transação já deve ter sido enviada ao banco (flush). Não faz commit.
+
+        A soma é feita no próprio banco (INSERT ... ON CONFLICT DO UPDATE SET coluna = coluna + valor),
+        então transações simultâneas na mesma chave não perdem atualizações nem conflitam
+        ao criar a linha do dia.
+        """
+        if db.query(TransactionDailyRollup.item_id).first() is None:
+            # Tabela ainda não construída: as transações antigas também precisam entrar
+            TransactionRollupRepository.refresh(db)
+            return
+
+        item = db.get(Item, transaction.item_id)
+        trans_value = calculate_transaction_value(item, transaction)
+        priced_value = None
+        if transaction.price is not None and transaction.price > 0:
+            priced_value = calculate_transaction_value(item, transaction, fallback_to_item_price=False)
+
+        values = {
+            "transaction_count": 1,
+            "total_amount": Decimal(str(transaction.amount)),
+            "total_value": trans_value or Decimal('0'),
+            "priced_value": priced_value or Decimal('0')
+        }
+        day, item_id, order_type = rollup_key(transaction)
+        rollup = TransactionDailyRollup.__table__.c
+        statement = upsert_statement(db, TransactionDailyRollup).values(day=day, item_id=item_id, order_type=order_type, **values)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=ROLLUP_KEY_COLUMNS,
+            set_={name: rollup[name] + value for name, value in values.items()}
+        ))
+
+    @staticmethod
+    def delete_by_item_id(db: Session, item_id: int) -> None:
+        """Remove os agregados de um item. Não faz commit."""
+        db.query(TransactionDailyRollup).filter(
+            TransactionDailyRollup.item_id == item_id
+        ).delete(synchronize_session=False)
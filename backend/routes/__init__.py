@@ -3,5 +3,6 @@ from .item import item_routes
 from .bot import bot_routes
 from .transaction import transaction_routes
 from .dashboard import dashboard_routes
+from .metrics import metrics_routes
 
-__all__ = ['recipe_routes', 'item_routes', 'bot_routes', 'transaction_routes', 'dashboard_routes']
+__all__ = ['recipe_routes', 'item_routes', 'bot_routes', 'transaction_routes', 'dashboard_routes', 'metrics_routes']
@@ -1,23 +1,39 @@
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers import BotController
-from schemas import BotResponse, BotRequest
-from database.database import get_db
+from schemas import BotResponse, BotRequest, JobResponse
+from database.database import get_async_db
 
 bot_routes = APIRouter()
 
 @bot_routes.post("/bot/message", response_model=BotResponse, status_code=status.HTTP_200_OK)
-async def process_bot_message(request: BotRequest, db: Session = Depends(get_db)):
+async def process_bot_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
     return await BotController.process_message(request, db)
 
+@bot_routes.post("/bot/message/stream", status_code=status.HTTP_200_OK)
+async def stream_bot_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
+    return await BotController.stream_message(request, db)
+
 @bot_routes.get("/bot/history", response_model=list[BotResponse], status_code=status.HTTP_200_OK)
-def get_bot_messages(db: Session = Depends(get_db)):
-    return BotController.get_all_messages(db)
+async def get_bot_messages(db: AsyncSession = Depends(get_async_db)):
+    return await BotController.get_all_messages(db)
 
 @bot_routes.post("/bot/image_message", response_model=BotResponse, status_code=status.HTTP_200_OK)
-async def process_image_message(request: BotRequest, db: Session = Depends(get_db)):
+async def process_image_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
     return await BotController.process_image_message(request, db)
 
 @bot_routes.post("/bot/audio_message", response_model=BotResponse, status_code=status.HTTP_200_OK)
-async def process_audio_message(request: BotRequest, db: Session = Depends(get_db)):
-    return await BotController.process_audio_message(request, db)
\ No newline at end of file
+async def process_audio_message(request: BotRequest, db: AsyncSession = Depends(get_async_db)):
+    return await BotController.process_audio_message(request, db)
+
+@bot_routes.post("/bot/jobs/image", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_image_job(request: BotRequest):
+    return await BotController.submit_image_job(request)
+
+@bot_routes.post("/bot/jobs/audio", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_audio_job(request: BotRequest):
+    return await BotController.submit_audio_job(request)
+
+@bot_routes.get("/bot/jobs/{job_id}", response_model=JobResponse, status_code=status.HTTP_200_OK)
+async def get_job(job_id: str, wait: float = 0):
+    return await BotController.get_job(job_id, wait)
@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers import ItemController
-from schemas import ItemResponse, ItemRequest
-from database.database import get_db
+from schemas import ItemResponse, ItemRequest, BulkResponse
+from database.database import get_db, get_async_db
 
 item_routes = APIRouter()
 
@@ -10,15 +11,19 @@ item_routes = APIRouter()
 def create(request: ItemRequest, db: Session = Depends(get_db)):
     return ItemController.create(request, db)
 
+@item_routes.post("/api/items/bulk", response_model=BulkResponse)
+def create_many(requests: list[ItemRequest], db: Session = Depends(get_db)):
+    return ItemController.create_many(requests, db)
+
 @item_routes.get("/api/items", response_model=list[ItemResponse])
-def find_all_or_by_name(name: str | None = None, db: Session = Depends(get_db)):
+async def find_all_or_by_name(name: str | None = None, db: AsyncSession = Depends(get_async_db)):
     if name:
-        return ItemController.find_by_name(name, db)
-    return ItemController.find_all(db)
+        return await ItemController.find_by_name_async(name, db)
+    return await ItemController.find_all_async(db)
 
 @item_routes.get("/api/items/{id}", response_model=ItemResponse)
-def find_by_id(id: int, db: Session = Depends(get_db)):
-    return ItemController.find_by_id(id, db)
+async def find_by_id(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await ItemController.find_by_id_async(id, db)
 
 @item_routes.delete("/api/items/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_by_id(id: int, db: Session = Depends(get_db)):
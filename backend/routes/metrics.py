@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from utils.cache import response_cache, recipe_cost_cache
+from utils.semantic_cache import bot_answer_cache
+from utils.executor import graph_executor
+from utils.jobs import job_queue
+from database.database import get_pool_metrics
+
+metrics_routes = APIRouter()
+
+@metrics_routes.get("/metrics/cache")
+def get_cache_metrics():
+    """Retorna as métricas do cache de respostas (acertos, falhas, descartes e versões das tabelas)"""
+    return response_cache.stats()
+
+@metrics_routes.get("/metrics/recipe-cost-cache")
+def get_recipe_cost_cache_metrics():
+    """Retorna as métricas do cache de custos por receita"""
+    return recipe_cost_cache.stats()
+
+@metrics_routes.get("/metrics/bot-cache")
+def get_bot_cache_metrics():
+    """Retorna as métricas do cache de respostas do chatbot (acertos exatos, por similaridade e falhas)"""
+    return bot_answer_cache.stats()
+
+@metrics_routes.get("/metrics/bot-executor")
+def get_bot_executor_metrics():
+    """Retorna o uso do pool de threads do chatbot (em execução, na fila, concluídas e recusadas)"""
+    return graph_executor.stats()
+
+@metrics_routes.get("/metrics/bot-jobs")
+def get_bot_jobs_metrics():
+    """Retorna a fila de jobs de imagem e áudio (workers, jobs na fila e limites por modelo)"""
+    return job_queue.stats()
+
+@metrics_routes.get("/metrics/db-pool")
+def get_db_pool_metrics():
+    """Retorna o uso dos pools de conexão (conexões em uso, overflow, tempo de checkout e timeouts)"""
+    return get_pool_metrics()
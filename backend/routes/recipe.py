@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from controllers import RecipeController
-from schemas import RecipeResponse, RecipeRequest
+from schemas import RecipeResponse, RecipeRequest, RecipePlanRequest
 from database.database import get_db
 
 recipe_routes = APIRouter()
@@ -40,6 +40,18 @@ def get_recipe_cost(recipe_id: int, db: Session = Depends(get_db)):
 def get_feasible_recipes(db: Session = Depends(get_db)):
     return RecipeController.get_feasible_recipes(db)
 
+@recipe_routes.get("/recipes/availability")
+def get_recipes_availability(db: Session = Depends(get_db)):
+    return RecipeController.get_recipes_availability(db)
+
+@recipe_routes.get("/recipes/max-batches")
+def get_max_batches(db: Session = Depends(get_db)):
+    return RecipeController.get_max_batches(db)
+
+@recipe_routes.post("/recipes/plan")
+def plan(request: RecipePlanRequest, db: Session = Depends(get_db)):
+    return RecipeController.plan(request, db)
+
 @recipe_routes.get("/recipes/popular-ingredients/{limit}")
 def get_most_popular_ingredients(limit: int = 5, db: Session = Depends(get_db)):
     return RecipeController.get_most_used_ingredients(limit, db)
\ No newline at end of file
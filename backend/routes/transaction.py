@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, status, Query, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers import TransactionController
-from schemas import TransactionResponse, TransactionRequest
-from database.database import get_db
-from datetime import datetime, timedelta
+from controllers.transaction import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from schemas import TransactionResponse, TransactionRequest, BulkResponse
+from database.database import get_db, get_async_db
+from datetime import datetime, timedelta, date
 
 transaction_routes = APIRouter()
 
@@ -11,15 +13,52 @@ transaction_routes = APIRouter()
 def create(request: TransactionRequest, db: Session = Depends(get_db)):
     return TransactionController.create(request, db)
 
+@transaction_routes.post("/api/transactions/bulk", response_model=BulkResponse)
+def create_many(requests: list[TransactionRequest], db: Session = Depends(get_db)):
+    return TransactionController.create_many(requests, db)
+
 @transaction_routes.get("/api/transactions", response_model=list[TransactionResponse])
-def find_all_or_by_item_id(item_id: int | None = None, db: Session = Depends(get_db)):
-    if item_id:
-        return TransactionController.find_by_item_id(item_id, db)
-    return TransactionController.find_all(db)
+async def find_all_or_by_item_id(
+        response: Response,
+        item_id: int | None = None,
+        order_type: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        cursor: str | None = None,
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lista transações da mais recente para a mais antiga, em páginas de até `limit` itens.
+    Quando há mais resultados, o cabeçalho X-Next-Cursor traz o cursor da próxima página.
+    """
+    transactions, next_cursor = await TransactionController.find_page_async(
+        limit=limit,
+        cursor=cursor,
+        start_date=start_date,
+        end_date=end_date,
+        order_type=order_type,
+        item_id=item_id,
+        db=db
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return transactions
+
+@transaction_routes.get("/api/transactions/export")
+def export(
+        format: str = Query(default="ndjson", description="ndjson ou csv"),
+        gzip: bool = False,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        db: Session = Depends(get_db)
+):
+    """Exporta o histórico completo de transações em streaming (NDJSON ou CSV, opcionalmente gzip)"""
+    return TransactionController.export(format=format, compress=gzip, start_date=start_date, end_date=end_date, db=db)
 
 @transaction_routes.get("/api/transactions/{id}", response_model=TransactionResponse)
-def find_by_id(id: int, db: Session = Depends(get_db)):
-    return TransactionController.find_by_id(id, db)
+async def find_by_id(id: int, db: AsyncSession = Depends(get_async_db)):
+    return await TransactionController.find_by_id_async(id, db)
 
 @transaction_routes.delete("/api/transactions/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_by_id(id: int, db: Session = Depends(get_db)):
@@ -2,6 +2,9 @@ from .recipe import RecipeBase, RecipeRequest, RecipeResponse
 from .item import ItemBase, ItemRequest, ItemResponse
 from .bot import BotBase, BotRequest, BotResponse
 from .transaction import TransactionBase, TransactionRequest, TransactionResponse
+from .bulk import BulkRowError, BulkResponse
+from .recipe_plan import RecipePlanEntry, RecipePlanRequest
+from .job import JobResponse
 
 __all__ = [
   "RecipeBase", 
@@ -15,5 +18,10 @@ __all__ = [
   "BotResponse",
   "TransactionBase",
   "TransactionRequest",
-  "TransactionResponse"
+  "TransactionResponse",
+  "BulkRowError",
+  "BulkResponse",
+  "RecipePlanEntry",
+  "RecipePlanRequest",
+  "JobResponse"
 ]
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class BulkRowError(BaseModel):
+    index: int
+    detail: str
+
+class BulkResponse(BaseModel):
+    created: int
+    ids: list[int]
+    errors: list[BulkRowError] = []
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from .bot import BotResponse
+
+
+class JobResponse(BaseModel):
+    """Estado de um job do chatbot; result traz a mensagem salva quando o status é done."""
+    id: str
+    kind: str
+    status: str
+    result: Optional[BotResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
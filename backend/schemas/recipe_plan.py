@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class RecipePlanEntry(BaseModel):
+    """Receita do plano e quantas vezes ela será feita."""
+    recipe_id: int
+    batches: int
+
+class RecipePlanRequest(BaseModel):
+    recipes: list[RecipePlanEntry]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -17,12 +17,7 @@ class TransactionRequest(TransactionBase):
 
 class TransactionResponse(TransactionBase):
     id: int
-
-    @computed_field
-    @property
-    def item_name(self) -> Optional[str]:
-        """Nome do item associado à transação"""
-        # Será preenchido pelo controller se o item estiver carregado
-        return getattr(self, '_item_name', None)
+    # Preenchido pelo controller quando a consulta junta o item
+    item_name: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import update
+
+from database.database import SessionLocal, engine, Base
+from database.migrations import run_migrations
+from models import Item
+from utils.unit_converter import apply_unit_codes
+
+
+def backfill_item_units():
+    """
+    Preenche measure_code, price_code e unit_factor dos itens já cadastrados.
+    Executa um UPDATE por par distinto de unidades, então pode ser repetido com segurança.
+    """
+
+    Base.metadata.create_all(bind=engine)
+    print("Verificando colunas de unidade do Item...")
+    for version in run_migrations(engine):
+        print(f"   Migração aplicada: {version}")
+
+    db = SessionLocal()
+
+    try:
+        pairs = db.query(Item.measure_unity, Item.price_unit).distinct().all()
+        print(f"Atualizando {len(pairs)} combinações de unidades...")
+
+        updated = 0
+        for measure_unity, price_unit in pairs:
+            codes = Item(measure_unity=measure_unity, price_unit=price_unit)
+            apply_unit_codes(codes)
+
+            result = db.execute(
+                update(Item).where(
+                    Item.measure_unity == measure_unity,
+                    Item.price_unit.is_(None) if price_unit is None else Item.price_unit == price_unit
+                ).values(
+                    measure_code=codes.measure_code,
+                    price_code=codes.price_code,
+                    unit_factor=codes.unit_factor
+                )
+            )
+            updated += result.rowcount
+            print(f"   {measure_unity} / {price_unit}: fator {codes.unit_factor}")
+
+        db.commit()
+        print(f"{updated} itens atualizados")
+
+    except Exception as e:
+        print(f"\nErro ao preencher unidades dos itens: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_item_units()
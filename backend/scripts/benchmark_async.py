@@ -0,0 +1,95 @@
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.database import get_db, get_async_db
+from controllers import ItemController, TransactionController
+
+
+def build_app(mode: str) -> FastAPI:
+    """Aplicação mínima com as rotas de leitura de itens e transações na versão síncrona ou assíncrona"""
+    app = FastAPI()
+
+    if mode == "sync":
+        @app.get("/api/items")
+        def find_items(db: Session = Depends(get_db)):
+            return ItemController.find_all(db)
+
+        @app.get("/api/transactions")
+        def find_transactions(db: Session = Depends(get_db)):
+            return TransactionController.find_page(db=db)[0]
+    else:
+        @app.get("/api/items")
+        async def find_items(db: AsyncSession = Depends(get_async_db)):
+            return await ItemController.find_all_async(db)
+
+        @app.get("/api/transactions")
+        async def find_transactions(db: AsyncSession = Depends(get_async_db)):
+            return (await TransactionController.find_page_async(db=db))[0]
+
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    """Sobe o uvicorn em uma thread e espera ele aceitar conexões"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def load(url: str, requests: int, concurrency: int) -> tuple[float, int]:
+    """Dispara `requests` chamadas com até `concurrency` simultâneas; retorna (req/s, erros)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async with httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def call():
+            nonlocal errors
+            async with semaphore:
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return requests / elapsed, errors
+
+
+def run_benchmark():
+    """Compara requisições por segundo das rotas de leitura com sessões síncronas e assíncronas"""
+    parser = argparse.ArgumentParser(description="Benchmark da camada de banco síncrona x assíncrona")
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    for index, mode in enumerate(["sync", "async"]):
+        port = args.port + index
+        server = start_server(build_app(mode), port)
+        try:
+            print(f"\n{mode} ({args.concurrency} requisições simultâneas)")
+            for path in ["/api/items", "/api/transactions"]:
+                rps, errors = asyncio.run(load(f"http://127.0.0.1:{port}{path}", args.requests, args.concurrency))
+                print(f"   {path:<20} {rps:8.1f} req/s   erros: {errors}")
+        finally:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    run_benchmark()
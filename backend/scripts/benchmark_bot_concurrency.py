@@ -0,0 +1,117 @@
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import threading
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from database.database import get_db
+from controllers import ItemController
+from utils.executor import BoundedExecutor, ExecutorBusy, GRAPH_MAX_WORKERS, GRAPH_MAX_PENDING
+
+
+def build_app(mode: str, chat_seconds: float, workers: int, pending: int) -> FastAPI:
+    """
+    Aplicação com uma rota de CRUD e uma de chat que simula o grafo com uma chamada
+    bloqueante de `chat_seconds`, executada direto no loop (blocking), no threadpool
+    compartilhado do Starlette (threadpool) ou no pool dedicado do chatbot (executor).
+    """
+    app = FastAPI()
+    executor = BoundedExecutor(workers, pending, name="benchmark")
+
+    @app.get("/api/items")
+    def find_items(db: Session = Depends(get_db)):
+        return ItemController.find_all(db)
+
+    @app.post("/bot/message")
+    async def process_message():
+        if mode == "blocking":
+            time.sleep(chat_seconds)
+        elif mode == "threadpool":
+            await run_in_threadpool(time.sleep, chat_seconds)
+        else:
+            try:
+                await executor.run(time.sleep, chat_seconds)
+            except ExecutorBusy:
+                raise HTTPException(503)
+        return {"ai_message": "ok"}
+
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    """Sobe o uvicorn em uma thread e espera ele aceitar conexões"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def crud_latencies(client: httpx.AsyncClient, url: str, requests: int, concurrency: int) -> list[float]:
+    """Latência (ms) de `requests` leituras de itens com até `concurrency` simultâneas"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            await client.get(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(call() for _ in range(requests)))
+    return latencies
+
+
+async def measure(port: int, chats: int, requests: int, concurrency: int, chat_seconds: float) -> tuple[list[float], int]:
+    """Latências do CRUD com `chats` conversas em andamento durante a medição e quantas conversas foram recusadas"""
+    base = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=chats + concurrency)
+    # No modo blocking as conversas rodam uma de cada vez
+    async with httpx.AsyncClient(timeout=chats * chat_seconds + 60, limits=limits) as client:
+        chat_tasks = [asyncio.create_task(client.post(f"{base}/bot/message")) for _ in range(chats)]
+        if chats:
+            # Dá tempo das conversas chegarem ao servidor antes de medir
+            await asyncio.sleep(min(0.2, chat_seconds / 4))
+        latencies = await crud_latencies(client, f"{base}/api/items", requests, concurrency)
+        chat_responses = await asyncio.gather(*chat_tasks)
+    return latencies, sum(response.status_code == 503 for response in chat_responses)
+
+
+def run_benchmark():
+    """Compara a latência do CRUD com e sem conversas do chatbot em andamento"""
+    parser = argparse.ArgumentParser(description="Benchmark de latência do CRUD com chats em andamento")
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--chat-seconds", type=float, default=3.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=GRAPH_MAX_WORKERS)
+    parser.add_argument("--pending", type=int, default=GRAPH_MAX_PENDING)
+    parser.add_argument("--port", type=int, default=8775)
+    args = parser.parse_args()
+
+    for index, mode in enumerate(["blocking", "threadpool", "executor"]):
+        port = args.port + index
+        server = start_server(build_app(mode, args.chat_seconds, args.workers, args.pending), port)
+        try:
+            print(f"\n{mode}")
+            for chats in [0, args.chats]:
+                latencies, rejected = asyncio.run(measure(port, chats, args.requests, args.concurrency, args.chat_seconds))
+                p95 = statistics.quantiles(latencies, n=20)[-1]
+                print(f"   {chats:>3} chats   p50: {statistics.median(latencies):8.1f} ms   p95: {p95:8.1f} ms   chats recusados: {rejected}")
+        finally:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    run_benchmark()
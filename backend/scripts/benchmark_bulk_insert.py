@@ -0,0 +1,82 @@
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, Session
+
+from database.database import Base
+from models import Item
+from controllers import TransactionController
+from schemas import TransactionRequest
+
+ORDER_TYPES = ["entrada", "saida", "compra", "uso"]
+
+
+def generate_requests(db: Session, rows: int, items: int) -> list[TransactionRequest]:
+    """Recria o banco com alguns itens e gera as transações que serão importadas"""
+    Base.metadata.drop_all(bind=db.get_bind())
+    Base.metadata.create_all(bind=db.get_bind())
+
+    db.execute(insert(Item), [
+        {"name": f"item {i}", "measure_unity": "grama", "amount": 1000, "price": 10,
+         "price_unit": "kg", "create_at": datetime.now().date()}
+        for i in range(items)
+    ])
+    db.commit()
+
+    item_ids = [row[0] for row in db.query(Item.id).all()]
+    rng = random.Random(42)
+    today = datetime.now()
+    return [
+        TransactionRequest(
+            item_id=rng.choice(item_ids),
+            order_type=rng.choice(ORDER_TYPES),
+            description="benchmark",
+            create_at=today - timedelta(days=rng.randint(0, 90)),
+            amount=rng.randint(1, 1000),
+            price=round(rng.uniform(0.5, 80), 2)
+        )
+        for _ in range(rows)
+    ]
+
+
+def run_benchmark():
+    """Compara a importação linha a linha (POST /api/transactions) com a importação em lote"""
+    parser = argparse.ArgumentParser(description="Benchmark da importação de transações em lote")
+    parser.add_argument("--url", default="sqlite:///benchmark.db", help="Banco usado no benchmark (será recriado)")
+    parser.add_argument("--rows", type=int, default=2_000, help="Quantidade de transações importadas")
+    parser.add_argument("--items", type=int, default=200, help="Quantidade de itens distintos")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    db = sessionmaker(bind=engine)()
+
+    try:
+        requests = generate_requests(db, args.rows, args.items)
+        start = time.perf_counter()
+        for request in requests:
+            TransactionController.create(request, db)
+        per_row = time.perf_counter() - start
+
+        requests = generate_requests(db, args.rows, args.items)
+        start = time.perf_counter()
+        result = TransactionController.create_many(requests, db)
+        bulk = time.perf_counter() - start
+
+        print(f"\n{args.rows} transações")
+        print(f"   Linha a linha: {per_row:.3f}s ({args.rows / per_row:.0f} linhas/s)")
+        print(f"   Em lote:       {bulk:.3f}s ({result.created / bulk:.0f} linhas/s)")
+        print(f"   Ganho:         {per_row / bulk:.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_benchmark()
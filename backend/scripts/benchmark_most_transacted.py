@@ -0,0 +1,171 @@
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker, Session
+
+from database.database import Base
+from models import Item, Transaction
+from repositories import TransactionRepository
+from utils.unit_converter import calculate_item_total_value
+
+UNITS = [
+    ("grama", "kg"),
+    ("mililitro", "litro"),
+    ("unidade", "unidade"),
+    ("unidade", "duzia"),
+]
+ORDER_TYPES = ["entrada", "saida", "compra", "uso", "ajuste"]
+
+
+def legacy_find_most_transacted_items(db: Session, order_type: str = None, limit: int = 10) -> list[dict]:
+    """Implementação anterior: carrega todas as transações e agrega em Python"""
+    query = db.query(Transaction).join(Item, Transaction.item_id == Item.id)
+
+    if order_type and order_type.lower() not in ['null', 'none', 'all']:
+        query = query.filter(Transaction.order_type == order_type)
+
+    item_stats = {}
+
+    for trans in query.all():
+        item = trans.item
+
+        if item.id not in item_stats:
+            item_stats[item.id] = {
+                "item_id": item.id,
+                "item_name": item.name,
+                "transaction_count": 0,
+                "total_amount": Decimal('0'),
+                "total_value": Decimal('0')
+            }
+
+        item_stats[item.id]["transaction_count"] += 1
+        item_stats[item.id]["total_amount"] += trans.amount
+
+        price_to_use = trans.price if trans.price is not None else item.price
+        item_stats[item.id]["total_value"] += calculate_item_total_value(
+            trans.amount,
+            price_to_use,
+            item.measure_unity,
+            item.price_unit
+        )
+
+    results = sorted(
+        item_stats.values(),
+        key=lambda x: x["transaction_count"],
+        reverse=True
+    )[:limit]
+
+    return [
+        {
+            "item_id": r["item_id"],
+            "item_name": r["item_name"],
+            "transaction_count": r["transaction_count"],
+            "total_amount": float(r["total_amount"]),
+            "total_value": float(r["total_value"])
+        }
+        for r in results
+    ]
+
+
+def generate_ledger(db: Session, rows: int, items: int, chunk_size: int = 50000) -> None:
+    """Gera itens e um histórico de transações sintético com o tamanho pedido"""
+    Base.metadata.drop_all(bind=db.get_bind())
+    Base.metadata.create_all(bind=db.get_bind())
+
+    rng = random.Random(42)
+    item_rows = []
+    for i in range(items):
+        measure_unity, price_unit = rng.choice(UNITS)
+        item_rows.append({
+            "name": f"item {i}",
+            "measure_unity": measure_unity,
+            "amount": rng.randint(0, 5000),
+            "price": round(rng.uniform(0.5, 80), 2),
+            "price_unit": price_unit,
+            "create_at": datetime.now().date()
+        })
+    db.execute(insert(Item), item_rows)
+    db.commit()
+
+    item_ids = [row[0] for row in db.query(Item.id).all()]
+    today = datetime.now().date()
+
+    for offset in range(0, rows, chunk_size):
+        batch = []
+        for _ in range(min(chunk_size, rows - offset)):
+            batch.append({
+                "item_id": rng.choice(item_ids),
+                "order_type": rng.choice(ORDER_TYPES),
+                "description": "benchmark",
+                "create_at": today - timedelta(days=rng.randint(0, 365)),
+                "amount": rng.randint(1, 1000),
+                "price": round(rng.uniform(0.5, 80), 2) if rng.random() < 0.7 else None
+            })
+        db.execute(insert(Transaction), batch)
+        db.commit()
+        print(f"   {offset + len(batch)}/{rows} transações geradas")
+
+
+def timed(fn, *args, repeat: int = 3):
+    """Executa fn algumas vezes e retorna (melhor tempo, último resultado)"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark():
+    """
+    Compara a implementação em Python com a agregação em SQL de
+    find_most_transacted_items sobre um histórico gerado
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de find_most_transacted_items")
+    parser.add_argument("--url", default="sqlite:///benchmark.db", help="Banco usado no benchmark (será recriado)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Quantidade de transações geradas")
+    parser.add_argument("--items", type=int, default=5_000, help="Quantidade de itens distintos")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-generate", action="store_true", help="Reaproveita o banco já gerado")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    db = sessionmaker(bind=engine)()
+
+    try:
+        if not args.skip_generate:
+            print(f"Gerando {args.rows} transações para {args.items} itens...")
+            generate_ledger(db, args.rows, args.items)
+
+        for order_type in [None, "entrada"]:
+            legacy_time, legacy = timed(legacy_find_most_transacted_items, db, order_type, args.limit, repeat=args.repeat)
+            db.expunge_all()
+            sql_time, current = timed(TransactionRepository.find_most_transacted_items, db, order_type, args.limit, repeat=args.repeat)
+
+            same_counts = (
+                [r["transaction_count"] for r in legacy] == [r["transaction_count"] for r in current]
+            )
+
+            print(f"\norder_type={order_type or 'todos'}")
+            print(f"   Python (legado): {legacy_time:.3f}s")
+            print(f"   SQL (GROUP BY):  {sql_time:.3f}s")
+            print(f"   Ganho:           {legacy_time / sql_time:.1f}x")
+            print(f"   Contagens iguais: {'sim' if same_counts else 'NÃO'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,75 @@
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+import numpy as np
+
+from utils.recipe_planner import RecipeMatrix, max_batches, shopping_list
+
+
+def generate_matrix(recipes: int, items: int, ingredients: int) -> RecipeMatrix:
+    """Matriz aleatória com `ingredients` itens por receita"""
+    rng = random.Random(42)
+    return RecipeMatrix(
+        [(id, f"receita {id}") for id in range(1, recipes + 1)],
+        [(id, f"item {id}", "grama", rng.randint(0, 5000), rng.uniform(0.001, 0.1)) for id in range(1, items + 1)],
+        [
+            (recipe_id, item_id, rng.randint(1, 500))
+            for recipe_id in range(1, recipes + 1)
+            for item_id in rng.sample(range(1, items + 1), ingredients)
+        ]
+    )
+
+
+def python_max_batches(matrix: RecipeMatrix) -> list[int]:
+    """Mesmo cálculo de max_batches, receita por receita e ingrediente por ingrediente"""
+    result = []
+    for row in matrix.requirements.tolist():
+        limits = [int(max(stock, 0) // amount) for amount, stock in zip(row, matrix.stock.tolist()) if amount > 0]
+        result.append(min(limits) if limits else -1)
+    return result
+
+
+def run_benchmark():
+    """Compara o cálculo vetorizado do planejador com laços em Python"""
+    parser = argparse.ArgumentParser(description="Benchmark do planejador de receitas")
+    parser.add_argument("--recipes", type=int, default=500, help="Quantidade de receitas")
+    parser.add_argument("--items", type=int, default=5_000, help="Quantidade de itens")
+    parser.add_argument("--ingredients", type=int, default=12, help="Ingredientes por receita")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetições de cada cálculo")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    matrix = generate_matrix(args.recipes, args.items, args.ingredients)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        vectorized = max_batches(matrix.requirements, matrix.stock)
+    numpy_time = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    looped = python_max_batches(matrix)
+    python_time = time.perf_counter() - start
+    assert vectorized.tolist() == looped
+
+    plan = np.ones(args.recipes)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        _, to_buy, cost = shopping_list(matrix.requirements, matrix.stock, matrix.unit_prices, plan)
+    plan_time = (time.perf_counter() - start) / args.repeat
+
+    print(f"\n{args.recipes} receitas x {args.items} itens ({args.ingredients} ingredientes por receita)")
+    print(f"   Montagem da matriz:     {build * 1000:.1f}ms")
+    print(f"   max_batches (numpy):    {numpy_time * 1000:.2f}ms")
+    print(f"   max_batches (Python):   {python_time * 1000:.2f}ms ({python_time / numpy_time:.1f}x)")
+    print(f"   Lista de compras:       {plan_time * 1000:.2f}ms ({int((to_buy > 0).sum())} itens, R$ {cost.sum():.2f})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,54 @@
+import sys
+import argparse
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from services.graph.router import Router, ROUTER_MIN_CONFIDENCE, ROUTING_LOG_PATH, load_routing_log, evaluate
+from utils.text_classifier import TfidfLogisticClassifier
+
+
+def print_summary(name: str, summary: dict) -> None:
+    print(
+        f"   {name:<20} {summary['messages']:>6}   acerto {summary['accuracy']:6.1%}   "
+        f"caminho rápido {summary['coverage']:6.1%} (acerto {summary['fast_accuracy']:6.1%})"
+    )
+
+
+def run_evaluation():
+    """
+    Avalia o roteador local contra as rotas decididas pelos LLMs. Treina com as
+    mensagens mais antigas do log e testa com as mais recentes, ou avalia um
+    modelo já salvo (--model) em todo o log.
+    """
+    parser = argparse.ArgumentParser(description="Avaliação offline do roteador local")
+    parser.add_argument("--log", default=ROUTING_LOG_PATH, help="Log JSONL de roteamento")
+    parser.add_argument("--model", help="Modelo salvo a avaliar (por padrão treina um com a parte antiga do log)")
+    parser.add_argument("--test-fraction", type=float, default=0.2, help="Fração mais recente do log usada no teste")
+    parser.add_argument("--min-confidence", type=float, default=ROUTER_MIN_CONFIDENCE, help="Confiança mínima do caminho rápido")
+    args = parser.parse_args()
+
+    records = load_routing_log(args.log)
+    if args.model:
+        router = Router.from_path(args.model, args.min_confidence)
+        test = records
+    else:
+        split = int(len(records) * (1 - args.test_fraction))
+        train, test = records[:split], records[split:]
+        if not train or not test:
+            print(f"Mensagens insuficientes em {args.log} ({len(records)})")
+            return
+        model = TfidfLogisticClassifier.train([r["user_input"] for r in train], [r["route"] for r in train])
+        router = Router(model, args.min_confidence)
+        print(f"\nTreino: {len(train)} mensagens   Teste: {len(test)} mensagens")
+
+    report = evaluate(router, test)
+    print(f"\nConfiança mínima: {args.min_confidence}")
+    print_summary("Total", report)
+    for route, summary in report["routes"].items():
+        print_summary(route, summary)
+
+
+if __name__ == "__main__":
+    run_evaluation()
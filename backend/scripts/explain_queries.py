@@ -0,0 +1,113 @@
+import sys
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal, engine, Base
+from database.migrations import run_migrations
+from models import Item, Recipe
+from repositories import ItemRepository, TransactionRepository, RecipeRepository, RecipeAvailabilityRepository, DashboardRepository
+
+# Consultas das rotas, do painel e das tools do agente, com argumentos representativos
+QUERIES = [
+    ("ItemRepository.find_by_name", lambda db: ItemRepository.find_by_name(db, "acu")),
+    ("ItemRepository.exists_by_name", lambda db: ItemRepository.exists_by_name(db, "açúcar")),
+    ("ItemRepository.find_low_stock_items", lambda db: ItemRepository.find_low_stock_items(db, 10)),
+    ("ItemRepository.find_items_near_expiration", lambda db: ItemRepository.find_items_near_expiration(db, 7)),
+    ("ItemRepository.find_expired_items", lambda db: ItemRepository.find_expired_items(db)),
+    ("ItemRepository.find_inventory_summary", lambda db: ItemRepository.find_inventory_summary(db)),
+    ("ItemRepository.find_items_by_value_ranking", lambda db: ItemRepository.find_items_by_value_ranking(db, 10)),
+    ("TransactionRepository.find_page", lambda db: TransactionRepository.find_page(db, limit=50)),
+    ("TransactionRepository.find_page (item)", lambda db: TransactionRepository.find_page(db, limit=50, item_id=1)),
+    ("TransactionRepository.find_page (período e tipo)", lambda db: TransactionRepository.find_page(
+        db, limit=50, start_date=date.today() - timedelta(days=30), order_type="entrada")),
+    ("TransactionRepository.find_most_transacted_items", lambda db: TransactionRepository.find_most_transacted_items(db, "entrada", 10)),
+    ("TransactionRepository.find_transaction_summary_by_period", lambda db: TransactionRepository.find_transaction_summary_by_period(db)),
+    ("TransactionRepository.find_daily_transactions", lambda db: TransactionRepository.find_daily_transactions(db)),
+    ("RecipeRepository.find_by_name", lambda db: RecipeRepository.find_by_name(db, "torta")),
+    ("RecipeRepository.find_feasible_recipes", lambda db: RecipeRepository.find_feasible_recipes(db)),
+    ("RecipeAvailabilityRepository.find_availability", lambda db: RecipeAvailabilityRepository.find_availability(db)),
+    ("DashboardRepository.find_overview", lambda db: DashboardRepository.find_overview(db)),
+    ("tools/sql.py: lower(Item.name) LIKE", lambda db: db.query(Item).filter(func.lower(Item.name).like("%acu%")).all()),
+    ("tools/sql.py: lower(Recipe.title) LIKE", lambda db: db.query(Recipe).filter(func.lower(Recipe.title).like("%torta%")).all()),
+]
+
+
+def capture_statements(db: Session, query) -> list[tuple]:
+    """Executa a consulta e devolve os SELECTs enviados ao banco, com seus parâmetros"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        query(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        db.rollback()
+
+    return statements
+
+
+def explain(db: Session, statement: str, parameters) -> list[str]:
+    """Plano de execução de um comando no dialeto do banco"""
+    prefix = "EXPLAIN " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    rows = db.connection().exec_driver_sql(prefix + statement, parameters).all()
+    return [" | ".join(str(value) for value in row) for row in rows]
+
+
+def report(db: Session) -> dict[str, list[str]]:
+    """Planos de todas as consultas de QUERIES"""
+    plans = {}
+    for name, query in QUERIES:
+        plans[name] = [
+            line
+            for statement, parameters in capture_statements(db, query)
+            for line in explain(db, statement, parameters)
+        ]
+    return plans
+
+
+def print_report(title: str, plans: dict[str, list[str]]) -> None:
+    print(f"\n===== {title} =====")
+    for name, lines in plans.items():
+        print(f"\n{name}")
+        for line in lines:
+            print(f"   {line}")
+
+
+def run_report():
+    """Mostra o plano de execução das consultas dos repositórios, antes e depois das migrações pendentes"""
+    parser = argparse.ArgumentParser(description="EXPLAIN das consultas dos repositórios")
+    parser.add_argument("--migrate", action="store_true", help="Aplica as migrações pendentes e mostra os planos de novo")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+
+    try:
+        before = report(db)
+        print_report("Planos atuais", before)
+
+        if args.migrate:
+            db.close()
+            applied = run_migrations(engine)
+            print(f"\nMigrações aplicadas: {', '.join(applied) if applied else 'nenhuma'}")
+
+            after = report(db)
+            changed = {name: lines for name, lines in after.items() if lines != before[name]}
+            print_report("Planos que mudaram após as migrações", changed)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    run_report()
@@ -0,0 +1,38 @@
+import sys
+import argparse
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database.database import engine, Base
+from database.migrations import MIGRATIONS, applied_versions, run_migrations, rollback_migration
+import models
+
+
+def migrate():
+    """Aplica as migrações pendentes, desfaz a última (--downgrade) ou mostra a situação (--status)"""
+    parser = argparse.ArgumentParser(description="Migrações do banco de dados")
+    parser.add_argument("--downgrade", action="store_true", help="Desfaz a última migração aplicada")
+    parser.add_argument("--status", action="store_true", help="Lista as migrações aplicadas e pendentes")
+    args = parser.parse_args()
+
+    if args.status:
+        with engine.begin() as connection:
+            done = set(applied_versions(connection))
+        for version, _, _ in MIGRATIONS:
+            print(f"   [{'x' if version in done else ' '}] {version}")
+        return
+
+    if args.downgrade:
+        version = rollback_migration(engine)
+        print(f"Migração desfeita: {version}" if version else "Nenhuma migração aplicada")
+        return
+
+    Base.metadata.create_all(bind=engine)
+    applied = run_migrations(engine)
+    print(f"Migrações aplicadas: {', '.join(applied)}" if applied else "Banco já está atualizado")
+
+
+if __name__ == "__main__":
+    migrate()
@@ -6,11 +6,13 @@ backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
 
 from database.database import SessionLocal, engine, Base
+from database.migrations import run_migrations
 from models.item import Item
 from models.recipe import Recipe
 from models.recipe_item import RecipeItem
 from models.bot import Bot
 from models.transaction import Transaction
+from utils.unit_converter import apply_unit_codes
 
 
 def populate_database():
@@ -20,6 +22,8 @@ def populate_database():
     """
 
     Base.metadata.create_all(bind=engine)
+    # Bancos já existentes precisam das colunas de unidade do Item antes de qualquer consulta
+    run_migrations(engine)
     db = SessionLocal()
 
     try:
@@ -179,6 +183,8 @@ def populate_database():
                 expiration_date=datetime.now().date() + timedelta(days=7)
             ),
         ]
+        for item in items:
+            apply_unit_codes(item)
         db.add_all(items)
         db.commit()
         for item in items:
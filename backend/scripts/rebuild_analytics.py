@@ -0,0 +1,45 @@
+import sys
+import time
+from pathlib import Path
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from database.database import SessionLocal, engine, Base
+from database.migrations import run_migrations
+from repositories import ItemTransactionStatsRepository, TransactionRollupRepository
+
+
+def rebuild_analytics():
+    """
+    Reconstrói as tabelas derivadas do histórico de transações (agregados diários
+    e estatísticas por item). Use após cargas ou alterações feitas direto no banco:
+    inserções e remoções são detectadas pelas consultas, mas UPDATEs de transações não.
+    """
+
+    Base.metadata.create_all(bind=engine)
+    # Bancos já existentes precisam das colunas de unidade do Item antes de qualquer consulta
+    run_migrations(engine)
+    db = SessionLocal()
+
+    try:
+        start = time.perf_counter()
+        print("Reconstruindo agregados diários de transações...")
+        TransactionRollupRepository.refresh(db)
+
+        print("Reconstruindo estatísticas de valor por item...")
+        ItemTransactionStatsRepository.refresh(db)
+
+        db.commit()
+        print(f"Tabelas de análise reconstruídas em {time.perf_counter() - start:.2f}s")
+
+    except Exception as e:
+        print(f"\nErro ao reconstruir tabelas de análise: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_analytics()
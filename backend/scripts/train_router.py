@@ -0,0 +1,40 @@
+import sys
+import argparse
+from pathlib import Path
+from collections import Counter
+
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from services.graph.router import ROUTER_MODEL_PATH, ROUTING_LOG_PATH, load_routing_log
+from utils.text_classifier import TfidfLogisticClassifier
+
+
+def run_training():
+    """Treina o roteador local com as rotas decididas pelos LLMs e salva o modelo"""
+    parser = argparse.ArgumentParser(description="Treina o roteador local (TF-IDF + regressão logística)")
+    parser.add_argument("--log", default=ROUTING_LOG_PATH, help="Log JSONL de roteamento")
+    parser.add_argument("--output", default=ROUTER_MODEL_PATH, help="Arquivo do modelo (.npz)")
+    parser.add_argument("--epochs", type=int, default=300, help="Iterações do gradiente descendente")
+    parser.add_argument("--min-count", type=int, default=1, help="Frequência mínima de um termo no vocabulário")
+    args = parser.parse_args()
+
+    records = load_routing_log(args.log)
+    if not records:
+        print(f"Nenhuma mensagem roteada pelos LLMs em {args.log}")
+        return
+
+    texts = [record["user_input"] for record in records]
+    labels = [record["route"] for record in records]
+    model = TfidfLogisticClassifier.train(texts, labels, epochs=args.epochs, min_count=args.min_count)
+    model.save(args.output)
+
+    print(f"\nModelo salvo em {args.output}")
+    print(f"   Mensagens: {len(records)}")
+    print(f"   Vocabulário: {len(model.vocabulary)} termos")
+    for route, count in sorted(Counter(labels).items()):
+        print(f"   {route}: {count}")
+
+
+if __name__ == "__main__":
+    run_training()
@@ -17,20 +17,10 @@ from ..tools.sql import (
 )
 
 from dotenv import load_dotenv
-from langchain_community.utilities import SQLDatabase
-import os
 
 load_dotenv()
 
-DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-DB_HOST = os.getenv("POSTGRES_HOST")
-DB_PORT = os.getenv("POSTGRES_PORT")
-
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-db = get_sql_db(DATABASE_URL, ["Item"])
+db = get_sql_db(["Item"])
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0)
 
@@ -2,7 +2,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents.structured_output import ToolStrategy
 from langchain.agents import create_agent
 from langchain_community.agent_toolkits import create_sql_agent
-from ..utils import load_prompt
+from ..utils import load_prompt, get_sql_db
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from ..tools.sql import (
@@ -14,19 +14,10 @@ from ..tools.sql import (
     update_recipe_tool
 )
 from dotenv import load_dotenv
-from langchain_community.utilities import SQLDatabase
-import os
 
 load_dotenv()
 
-DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-DB_HOST = os.getenv("POSTGRES_HOST")
-DB_PORT = os.getenv("POSTGRES_PORT")
-
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-db = SQLDatabase.from_uri(DATABASE_URL)
+db = get_sql_db()
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", temperature=0)
 
@@ -19,7 +19,8 @@ from .nodes import (
     sql_transaction_writer_node,
     sql_orchestrator_node,
     structurer_recipe_node,
-    structurer_item_node
+    structurer_item_node,
+    fast_router_node
 )
 
 conn = sqlite3.connect("database/checkpoints.db", check_same_thread=False)
@@ -27,6 +28,7 @@ memory = SqliteSaver(conn)
 
 builder = StateGraph(AgentState)
 
+builder.add_node("fast_router", fast_router_node)
 builder.add_node("orchestrator", orchestrator_node)
 builder.add_node("sql_orchestrator", sql_orchestrator_node)
 builder.add_node("sql_recipe", sql_recipe_node)
@@ -43,7 +45,20 @@ builder.add_node("sql_transaction_writer", sql_transaction_writer_node)
 builder.add_node("trivial", trivial_node)
 builder.add_node("revisor", revisor_node)
 builder.add_node("web", web_node)
-builder.set_entry_point("orchestrator")
+builder.set_entry_point("fast_router")
+
+# Mensagens com rota prevista localmente com confiança alta pulam os roteadores LLM
+builder.add_conditional_edges(
+    "fast_router",
+    lambda state: state['fast_route'] or "ORCHESTRATOR",
+    {
+        "ORCHESTRATOR": "orchestrator",
+        "TRIVIAL": "trivial",
+        "ITEM_READER": "sql_item_reader",
+        "RECIPE_READER": "sql_recipe_reader",
+        "TRANSACTION_READER": "sql_transaction_reader"
+    }
+)
 
 builder.add_conditional_edges(
     "orchestrator",
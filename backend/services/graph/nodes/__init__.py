@@ -14,6 +14,7 @@ from .sql_recipe import sql_recipe_node
 from .sql_orchestrator import sql_orchestrator_node
 from .structurer_item import structurer_item_node
 from .structurer_recipe import structurer_recipe_node
+from .fast_router import fast_router_node
 
 __all__ = [
     "orchestrator_node",
@@ -32,5 +33,6 @@ __all__ = [
     "sql_recipe_node",
     "sql_orchestrator_node",
     "structurer_item_node",
-    "structurer_recipe_node"
+    "structurer_recipe_node",
+    "fast_router_node"
 ]
\ No newline at end of file
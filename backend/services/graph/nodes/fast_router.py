@@ -0,0 +1,24 @@
+from langchain_core.messages import HumanMessage
+from ..router import router
+from ..state import AgentState
+
+def fast_router_node(state : AgentState):
+    route, confidence = router.fast_route(state['user_input'])
+
+    # A rota é zerada a cada mensagem; os roteadores LLM a preenchem quando o caminho rápido não é usado
+    if route is None:
+        return {'fast_route': None, 'route': None, 'route_confidence': confidence}
+
+    return {
+        'fast_route': route,
+        'route': route,
+        'route_confidence': confidence,
+        'next_agent': route,
+        'explanation': f"Rota {route} definida pelo roteador local (confiança {confidence:.2f})",
+        'query_sql': state['user_input'],
+        'sql_response': "RESET",
+        'sql_item_instruction': None,
+        'sql_recipe_instruction': None,
+        'sql_transaction_instruction': None,
+        'messages': [HumanMessage(content=state['user_input'])]
+    }
@@ -10,6 +10,7 @@ def sql_recipe_node(state : AgentState):
     })
     return {
         'next_agent': response['structured_response'].next_agent,
+        'route': response['structured_response'].next_agent,
         'explanation': response['structured_response'].explanation,
         'messages': [HumanMessage(content=state['query_sql'])]
     }
\ No newline at end of file
@@ -22,6 +22,7 @@ def sql_transaction_node(state : AgentState):
     })
     return {
         'next_agent': response['structured_response'].next_agent,
+        'route': response['structured_response'].next_agent,
         'explanation': response['structured_response'].explanation,
         'messages': [HumanMessage(content=state['user_input'])]
     }
\ No newline at end of file
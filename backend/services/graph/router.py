@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from datetime import datetime
+from pathlib import Path
+
+from utils.semantic_cache import normalize_question, is_cacheable_question
+from utils.text_classifier import TfidfLogisticClassifier
+
+ROUTER_MODEL_PATH = os.getenv("ROUTER_MODEL_PATH", str(Path(__file__).parent / "router_model.npz"))
+ROUTING_LOG_PATH = os.getenv("ROUTING_LOG_PATH", "database/routing_log.jsonl")
+# Ao passar deste tamanho o log é rotacionado (routing_log.jsonl.1, .2, ...)
+ROUTING_LOG_MAX_BYTES = int(os.getenv("ROUTING_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+ROUTING_LOG_BACKUPS = int(os.getenv("ROUTING_LOG_BACKUPS", "5"))
+# Confiança mínima para pular os roteadores LLM
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.85"))
+RULE_CONFIDENCE = 0.99
+
+# Rotas completas: o nó que efetivamente atende a mensagem
+ROUTES = (
+    "TRIVIAL", "WEB",
+    "ITEM_READER", "STRUCTURER_ITEM", "ITEM_WRITER",
+    "RECIPE_READER", "STRUCTURER_RECIPE", "RECIPE_WRITER",
+    "TRANSACTION_READER", "TRANSACTION_WRITER",
+)
+# Rotas que podem pular os roteadores LLM; escritas continuam passando por eles
+FAST_ROUTES = ("TRIVIAL", "ITEM_READER", "RECIPE_READER", "TRANSACTION_READER")
+
+GREETING = re.compile(r"^((oi|ola|bom dia|boa tarde|boa noite|obrigad[oa]|valeu|tudo bem|td bem|como vai)\s*)+$")
+# Regras de leitura (só valem para perguntas somente leitura e independentes da conversa)
+READ_RULES = {
+    "RECIPE_READER": re.compile(r"\b((consigo|posso|da pra|da para|tem como) (fazer|preparar)|receitas?)\b"),
+    "ITEM_READER": re.compile(r"\b(vencid\w*|vence\w*|validade|estoque baixo|acabando|em estoque|quanto tenho)\b"),
+    "TRANSACTION_READER": re.compile(r"\b(historico|transac\w*|movimentac\w*)\b"),
+}
+
+
+class Router:
+    """
+    Roteador local das mensagens do chatbot: regras para os casos óbvios e,
+    se houver um modelo treinado com o log de roteamento, um classificador
+    TF-IDF + regressão logística que prevê a rota completa com uma confiança.
+    """
+
+    def __init__(self, model: TfidfLogisticClassifier = None, min_confidence: float = ROUTER_MIN_CONFIDENCE):
+        self.model = model
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def from_path(cls, path: str = ROUTER_MODEL_PATH, min_confidence: float = ROUTER_MIN_CONFIDENCE) -> "Router":
+        """Roteador com o modelo salvo em `path` (só regras se o arquivo não existir)"""
+        model = TfidfLogisticClassifier.load(path) if Path(path).exists() else None
+        return cls(model, min_confidence)
+
+    def predict(self, text: str) -> tuple[str | None, float, str | None]:
+        """Rota prevista, confiança e origem da previsão ('rule' ou 'model')"""
+        question = normalize_question(text)
+        if GREETING.match(question):
+            return "TRIVIAL", RULE_CONFIDENCE, "rule"
+
+        if is_cacheable_question(text):
+            matches = [route for route, rule in READ_RULES.items() if rule.search(question)]
+            if len(matches) == 1:
+                return matches[0], RULE_CONFIDENCE, "rule"
+
+        if self.model is None:
+            return None, 0.0, None
+        route, confidence = self.model.predict(text)
+        return route, confidence, "model"
+
+    def fast_route(self, text: str) -> tuple[str | None, float]:
+        """
+        Rota a seguir sem os roteadores LLM, ou None quando a mensagem deve passar
+        por eles: confiança baixa, rota de escrita ou pergunta que depende da conversa.
+        """
+        route, confidence, _ = self.predict(text)
+        if route not in FAST_ROUTES or confidence < self.min_confidence:
+            return None, confidence
+        if route != "TRIVIAL" and not is_cacheable_question(text):
+            return None, confidence
+        return route, confidence
+
+
+router = Router.from_path()
+
+_log_lock = threading.Lock()
+_log_listeners = {}
+
+
+def _routing_logger(path: str) -> logging.Logger:
+    """
+    Logger que grava no arquivo `path` com rotação por tamanho. O registro só entra
+    em uma fila; a escrita em disco fica com a thread do QueueListener, então quem
+    chama do loop assíncrono não espera o arquivo.
+    """
+    logger = logging.getLogger(f"routing_log:{path}")
+    with _log_lock:
+        if path not in _log_listeners:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            file_handler = RotatingFileHandler(
+                path, maxBytes=ROUTING_LOG_MAX_BYTES, backupCount=ROUTING_LOG_BACKUPS, encoding="utf-8", delay=True
+            )
+            records = queue.SimpleQueue()
+            listener = QueueListener(records, file_handler)
+            listener.start()
+            logger.handlers = [QueueHandler(records)]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            _log_listeners[path] = listener
+    return logger
+
+
+def flush_routing_log() -> None:
+    """Espera as linhas pendentes serem gravadas e fecha os arquivos do log de roteamento"""
+    with _log_lock:
+        listeners = list(_log_listeners.values())
+        _log_listeners.clear()
+    for listener in listeners:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(flush_routing_log)
+
+
+def log_route(user_input: str, route: str | None, source: str, confidence: float | None = None,
+              path: str = ROUTING_LOG_PATH) -> None:
+    """
+    Registra a rota seguida por uma mensagem no log JSONL usado para treinar e avaliar
+    o roteador. source é 'llm' quando a rota veio dos roteadores LLM ou 'fast' quando veio do local.
+    """
+    if route is None:
+        return
+    record = {
+        "timestamp": datetime.now().isoformat(),
+        "user_input": user_input,
+        "route": route,
+        "source": source,
+        "confidence": confidence
+    }
+    _routing_logger(path).info(json.dumps(record, ensure_ascii=False))
+
+
+def routing_log_files(path: str = ROUTING_LOG_PATH) -> list[Path]:
+    """Arquivos do log do mais antigo (maior sufixo da rotação) ao atual"""
+    backups = sorted(
+        (file for file in Path(path).parent.glob(Path(path).name + ".*") if file.suffix[1:].isdigit()),
+        key=lambda file: int(file.suffix[1:]),
+        reverse=True
+    )
+    return backups + [Path(path)] if Path(path).exists() else backups
+
+
+def load_routing_log(path: str = ROUTING_LOG_PATH) -> list[dict]:
+    """Mensagens roteadas pelos LLMs, na ordem do log (as do caminho rápido não servem de rótulo)"""
+    flush_routing_log()
+    records = []
+    for log_file in routing_log_files(path):
+        with open(log_file, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("source") == "llm" and record.get("route") in ROUTES:
+                        records.append(record)
+    return records
+
+
+def evaluate(router: Router, records: list[dict]) -> dict:
+    """
+    Compara as rotas do roteador local com as decididas pelos LLMs.
+
+    Returns:
+        accuracy: acerto da rota prevista em todas as mensagens
+        coverage: fração das mensagens que seguiriam pelo caminho rápido
+        fast_accuracy: acerto entre as que seguiriam pelo caminho rápido
+        routes: as mesmas métricas por rota do LLM
+    """
+    def summary(rows: list[tuple]) -> dict:
+        fast = [row for row in rows if row[2] is not None]
+        return {
+            "messages": len(rows),
+            "accuracy": sum(row[1] == row[0] for row in rows) / len(rows) if rows else 0.0,
+            "coverage": len(fast) / len(rows) if rows else 0.0,
+            "fast_accuracy": sum(row[2] == row[0] for row in fast) / len(fast) if fast else 0.0
+        }
+
+    rows = []
+    for record in records:
+        predicted, _, _ = router.predict(record["user_input"])
+        fast, _ = router.fast_route(record["user_input"])
+        rows.append((record["route"], predicted, fast))
+
+    return {
+        **summary(rows),
+        "routes": {route: summary([row for row in rows if row[0] == route]) for route in sorted({row[0] for row in rows})}
+    }
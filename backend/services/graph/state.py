@@ -25,4 +25,7 @@ class AgentState(TypedDict):
     sql_item_instruction: Optional[Any]
     sql_recipe_instruction: Optional[Any]
     sql_transaction_instruction: Optional[Any]
-    messages: Annotated[list[AnyMessage], operator.add]
\ No newline at end of file
+    messages: Annotated[list[AnyMessage], operator.add]
+    fast_route: Optional[str]
+    route: Optional[str]
+    route_confidence: Optional[float]
\ No newline at end of file
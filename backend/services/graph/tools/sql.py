@@ -6,8 +6,34 @@ from models.recipe_item import RecipeItem
 from models.item import Item
 from models.transaction import Transaction
 from schemas import RecipeRequest, ItemRequest, TransactionRequest
+from utils.unit_converter import apply_unit_codes
+from utils.cache import invalidate_tables
+from utils.name_index import fold_text, item_name_index, recipe_title_index
+from repositories import ItemRepository, RecipeRepository, RecipeAvailabilityRepository, RecipePlanRepository
 from datetime import datetime
 
+
+def resolve_by_name(candidates: list, term: str, attribute: str = "name", allow_similar: bool = True):
+    """
+    Escolhe um registro entre candidatos já ranqueados quando não há ambiguidade:
+    o único com o nome idêntico ao termo (ignorando acentos e maiúsculas) ou o
+    único candidato. Retorna None quando o usuário precisa especificar melhor.
+
+    Com allow_similar=False (ferramentas que alteram ou apagam) o único candidato
+    só é aceito se o nome contém o termo; um nome parecido apenas por trigramas
+    (ex: "pão de queijo" -> "Pão de mel") nunca é escolhido sozinho.
+    """
+    folded_term = fold_text(term)
+    exact = [c for c in candidates if fold_text(getattr(c, attribute)) == folded_term]
+    if len(exact) == 1:
+        return exact[0]
+    if not allow_similar:
+        candidates = [c for c in candidates if folded_term in fold_text(getattr(c, attribute))]
+    if len(candidates) == 1:
+        return candidates[0]
+    return None
+
+
 @tool
 def check_recipe_availability(recipe_name: str) -> str:
     """
@@ -29,83 +55,37 @@ def check_recipe_availability(recipe_name: str) -> str:
     db = SessionLocal()
 
     try:
-        recipe = db.query(Recipe).filter(
-            func.lower(Recipe.title).like(f'%{recipe_name.lower()}%')
-        ).first()
+        recipes = RecipeRepository.search_by_title(db, recipe_name, limit=1)
 
-        if not recipe:
+        if not recipes:
             return f"Receita '{recipe_name}' não encontrada no banco de dados."
+        recipe = recipes[0]
 
-        recipe_items = db.query(
-            Item.name,
-            RecipeItem.amount.label('necessario'),
-            Item.amount.label('estoque'),
-            Item.measure_unity
-        ).join(
-            RecipeItem, RecipeItem.item_id == Item.id
-        ).filter(
-            RecipeItem.recipe_id == recipe.id
-        ).all()
+        availability = RecipeAvailabilityRepository.find_availability(db)
+        status = next(r for r in availability if r["recipe_id"] == recipe.id)
 
-        if not recipe_items:
+        if not status["ingredients"]:
             return f"Receita '{recipe.title}' não tem ingredientes cadastrados."
 
-        faltando = []
-        disponiveis = []
-
-        for item in recipe_items:
-            if item.estoque < item.necessario:
-                faltando.append({
-                    'nome': item.name,
-                    'necessario': item.necessario,
-                    'disponivel': item.estoque,
-                    'unidade': item.measure_unity
-                })
-            else:
-                disponiveis.append({
-                    'nome': item.name,
-                    'quantidade': item.necessario,
-                    'unidade': item.measure_unity
-                })
-
-        if not faltando:
+        if status["feasible"]:
             ingredientes_texto = ", ".join([
-                f"{d['quantidade']}{d['unidade']} de {d['nome']}"
-                for d in disponiveis
+                f"{i['required_amount']}{i['measure_unity']} de {i['item_name']}"
+                for i in status["ingredients"]
             ])
             return (
-                f"SIM! Você pode fazer '{recipe.title}'!\n\n"
+                f"SIM! Você pode fazer '{recipe.title}'! Dá para fazer {status['max_batches']} vez(es) com o estoque atual.\n\n"
                 f"Ingredientes disponíveis:\n{ingredientes_texto}"
             )
 
-        receitas_alternativas = db.query(Recipe).filter(
-            Recipe.id != recipe.id
-        ).all()
-
-        alternativas_disponiveis = []
-
-        for alt_recipe in receitas_alternativas:
-            alt_items = db.query(
-                Item.amount,
-                RecipeItem.amount
-            ).join(
-                RecipeItem, RecipeItem.item_id == Item.id
-            ).filter(
-                RecipeItem.recipe_id == alt_recipe.id
-            ).all()
-
-            if all(item[0] >= item[1] for item in alt_items):
-                alternativas_disponiveis.append({
-                    'titulo': alt_recipe.title,
-                    'descricao': alt_recipe.description or ''
-                })
-
-                if len(alternativas_disponiveis) >= 3:
-                    break
+        alternativas_disponiveis = [
+            {'titulo': r["recipe_title"], 'descricao': r["description"] or ''}
+            for r in availability
+            if r["recipe_id"] != recipe.id and r["feasible"]
+        ][:3]
 
         faltando_texto = "\n".join([
-            f"  - {f['nome']}: necessário {f['necessario']}{f['unidade']}, disponível {f['disponivel']}{f['unidade']}"
-            for f in faltando
+            f"  - {f['item_name']}: necessário {f['required_amount']}{f['measure_unity']}, disponível {f['available_amount']}{f['measure_unity']}"
+            for f in status["missing"]
         ])
 
         resposta = (
@@ -133,6 +113,101 @@ def check_recipe_availability(recipe_name: str) -> str:
         db.close()
 
 
+@tool
+def get_max_batches_tool() -> str:
+    """
+    Informa quantas vezes cada receita pode ser feita com o estoque atual.
+
+    Use quando o usuário perguntar:
+    - "Quantos bolos consigo fazer?"
+    - "Quantas vezes dá pra fazer cada receita?"
+
+    Returns:
+        String com cada receita e a quantidade máxima de vezes
+    """
+    db = SessionLocal()
+    try:
+        batches = RecipePlanRepository.find_max_batches(db)
+        if not batches:
+            return "Nenhuma receita cadastrada."
+
+        linhas = []
+        for recipe in sorted(batches, key=lambda r: (r["max_batches"] is None, -(r["max_batches"] or 0), r["recipe_title"])):
+            if recipe["max_batches"] is None:
+                linhas.append(f"- {recipe['recipe_title']}: sem ingredientes cadastrados")
+            else:
+                linhas.append(f"- {recipe['recipe_title']}: {recipe['max_batches']} vez(es)")
+        return "Quantas vezes cada receita pode ser feita com o estoque atual:\n" + "\n".join(linhas)
+
+    except Exception as e:
+        return f"Erro ao calcular as quantidades: {str(e)}"
+
+    finally:
+        db.close()
+
+
+@tool
+def plan_shopping_list_tool(plano: str) -> str:
+    """
+    Monta a lista de compras mais barata para produzir um plano de receitas.
+
+    Use quando o usuário perguntar o que precisa comprar para fazer várias receitas,
+    ex: "O que preciso comprar para fazer 3 bolos de cenoura e 2 pães de mel?"
+
+    Args:
+        plano: Receitas e quantidades separadas por vírgula, no formato
+               "Nome da receita: quantidade" (ex: "Bolo de Cenoura: 3, Pão de Mel: 2").
+               Sem quantidade, considera 1 vez.
+
+    Returns:
+        String com o que falta comprar de cada item e o custo total
+    """
+    db = SessionLocal()
+    try:
+        plan = {}
+        for parte in plano.split(','):
+            if not parte.strip():
+                continue
+            nome, _, quantidade = parte.rpartition(':') if ':' in parte else (parte, '', '1')
+            try:
+                vezes = int(float(quantidade.strip()))
+            except ValueError:
+                return f"Quantidade inválida para '{nome.strip()}': {quantidade.strip()}"
+            if vezes <= 0:
+                return f"Quantidade de '{nome.strip()}' deve ser maior que zero."
+
+            recipes = RecipeRepository.search_by_title(db, nome.strip(), limit=1)
+            if not recipes:
+                return f"Receita '{nome.strip()}' não encontrada no banco de dados."
+            plan[recipes[0].id] = plan.get(recipes[0].id, 0) + vezes
+
+        if not plan:
+            return "Informe ao menos uma receita no plano."
+
+        result = RecipePlanRepository.find_shopping_list(db, plan)
+        receitas = ", ".join(f"{r['batches']}x {r['recipe_title']}" for r in result["recipes"])
+        compras = [i for i in result["items"] if i["to_buy"] > 0]
+
+        if not compras:
+            return f"O estoque atual já é suficiente para fazer {receitas}. Não é preciso comprar nada."
+
+        linhas = "\n".join(
+            f"- {i['item_name']}: comprar {i['to_buy']:g}{i['measure_unity']} "
+            f"(precisa de {i['required_amount']:g}, tem {i['available_amount']:g}) - R$ {i['cost']:.2f}"
+            for i in compras
+        )
+        return (
+            f"Lista de compras para fazer {receitas}:\n{linhas}\n\n"
+            f"Custo total estimado: R$ {result['total_cost']:.2f}"
+        )
+
+    except Exception as e:
+        return f"Erro ao montar a lista de compras: {str(e)}"
+
+    finally:
+        db.close()
+
+
 @tool
 def list_all_recipes_tool() -> str:
     """
@@ -229,6 +304,7 @@ def add_recipe_tool(nome: str, ingredientes: str, preparo: str, descricao: str =
         db.flush()
 
         ingredients_list = [ing.strip() for ing in ingredientes.split(',')]
+        created_items = []
 
         for ingredient_str in ingredients_list:
             try:
@@ -258,8 +334,10 @@ def add_recipe_tool(nome: str, ingredientes: str, preparo: str, descricao: str =
                         description=f"Ingrediente da receita {nome}",
                         create_at=datetime.now()
                     )
+                    apply_unit_codes(item)
                     db.add(item)
                     db.flush()
+                    created_items.append(item)
 
                 recipe_item = RecipeItem(
                     recipe_id=new_recipe.id,
@@ -272,6 +350,10 @@ def add_recipe_tool(nome: str, ingredientes: str, preparo: str, descricao: str =
                 continue
 
         db.commit()
+        invalidate_tables(Recipe.__tablename__, RecipeItem.__tablename__, Item.__tablename__)
+        recipe_title_index.upsert(new_recipe.id, new_recipe.title)
+        for created in created_items:
+            item_name_index.upsert(created.id, created.name, created.measure_unity)
         return f"Sucesso! A receita '{nome}' foi salva no banco de dados com seus ingredientes."
 
     except Exception as e:
@@ -282,6 +364,12 @@ def add_recipe_tool(nome: str, ingredientes: str, preparo: str, descricao: str =
         db.close()
 
 
+def ambiguous_recipe_message(recipe_name: str, recipes: list) -> str:
+    """Pede ao usuário para escolher entre as receitas encontradas em vez de alterar uma delas por aproximação"""
+    titles = ", ".join(f"'{recipe.title}'" for recipe in recipes)
+    return f"Não encontrei uma única receita chamada '{recipe_name}'. Receitas parecidas: {titles}. Informe o título completo."
+
+
 @tool
 def delete_recipe_tool(recipe_name: str) -> str:
     """
@@ -297,13 +385,14 @@ def delete_recipe_tool(recipe_name: str) -> str:
 
     db = SessionLocal()
     try:
-        recipe = db.query(Recipe).filter(
-            func.lower(Recipe.title).like(f'%{recipe_name.lower()}%')
-        ).first()
+        recipes = RecipeRepository.search_by_title(db, recipe_name)
         
-        if not recipe:
+        if not recipes:
             return f"Receita '{recipe_name}' não encontrada no banco de dados."
         
+        recipe = resolve_by_name(recipes, recipe_name, "title", allow_similar=False)
+        if recipe is None:
+            return ambiguous_recipe_message(recipe_name, recipes)
         recipe_id = recipe.id
         recipe_title = recipe.title
 
@@ -340,13 +429,14 @@ def update_recipe_tool(
 
     db = SessionLocal()
     try:
-        recipe = db.query(Recipe).filter(
-            func.lower(Recipe.title).like(f'%{recipe_name.lower()}%')
-        ).first()
+        recipes = RecipeRepository.search_by_title(db, recipe_name)
 
-        if not recipe:
+        if not recipes:
             return f"Receita '{recipe_name}' não encontrada no banco de dados."
 
+        recipe = resolve_by_name(recipes, recipe_name, "title", allow_similar=False)
+        if recipe is None:
+            return ambiguous_recipe_message(recipe_name, recipes)
         old_title = recipe.title
         recipe_id = recipe.id
 
@@ -413,7 +503,7 @@ def list_all_items_tool() -> str:
 def find_item_by_name_tool(item_name: str) -> str:
     """
     Busca item(ns) por nome e retorna detalhes.
-    Usa LIKE com wildcard para busca parcial e case-insensitive.
+    A busca é parcial e ignora acentos e maiúsculas; os mais relevantes vêm primeiro.
 
     Args:
         item_name: Nome ou parte do nome do item
@@ -421,15 +511,9 @@ def find_item_by_name_tool(item_name: str) -> str:
     Returns:
         String com detalhes do(s) item(ns)
     """
-    from controllers import ItemController
-    from sqlalchemy import func
-
     db = SessionLocal()
     try:
-        # Busca usando LIKE com % nos dois lados e LOWER para case-insensitive
-        items = db.query(Item).filter(
-            func.lower(Item.name).like(f"%{item_name.lower()}%")
-        ).all()
+        items = ItemRepository.search_by_name(db, item_name)
         
         if not items:
             return f"Item '{item_name}' não encontrado no estoque."
@@ -603,7 +687,7 @@ def update_item_tool(
     Atualiza um item existente.
     Retorna dict com dados para o TRANSACTION_WRITER.
 
-    SEMPRE usa busca ILIKE com % para encontrar o item automaticamente.
+    Encontra o item automaticamente por busca aproximada do nome (ignora acentos e maiúsculas).
 
     Args:
         item_name: Nome do item (busca aproximada automática)
@@ -626,9 +710,7 @@ def update_item_tool(
         # Remove espaços extras
         search_term = item_name.strip()
 
-        items = db.query(Item).filter(
-            func.lower(Item.name).like(f'%{search_term.lower()}%')
-        ).all()
+        items = ItemRepository.search_by_name(db, search_term)
 
         if not items:
             return {
@@ -645,11 +727,12 @@ def update_item_tool(
             if items_filtered:
                 items = items_filtered
 
-        if len(items) > 1:
+        item = resolve_by_name(items, search_term, allow_similar=False)
+        if item is None:
             units_list = [f"{i.name} ({i.measure_unity})" for i in items]
             return {
                 "success": False,
-                "message": f"⚠️ Múltiplos itens encontrados: {', '.join(units_list)}. Especifique a unidade de medida ou use o nome completo.",
+                "message": f"⚠️ Nenhum item único encontrado para '{item_name}'. Itens parecidos: {', '.join(units_list)}. Especifique a unidade de medida ou use o nome completo.",
                 "multiple_items": [
                     {
                         "id": i.id,
@@ -660,7 +743,6 @@ def update_item_tool(
                 ]
             }
 
-        item = items[0]
         item_id = item.id
         old_amount = float(item.amount)
         measure_unity = item.measure_unity
@@ -768,16 +850,22 @@ def delete_item_tool(item_name: str, reason: str = "perda") -> dict:
 
     db = SessionLocal()
     try:
-        item = db.query(Item).filter(
-            func.lower(Item.name).like(f'%{item_name.lower()}%')
-        ).first()
+        items = ItemRepository.search_by_name(db, item_name)
         
-        if not item:
+        if not items:
             return {
                 "success": False,
                 "message": f"Item '{item_name}' não encontrado."
             }
 
+        item = resolve_by_name(items, item_name, allow_similar=False)
+        if item is None:
+            units_list = [f"{i.name} ({i.measure_unity})" for i in items]
+            return {
+                "success": False,
+                "message": f"Nenhum item único encontrado para '{item_name}'. Itens parecidos: {', '.join(units_list)}. Use o nome completo do item."
+            }
+
         item_id = item.id
         item_name = item.name
         amount = float(item.amount)
@@ -942,36 +1030,29 @@ def get_transaction_history_tool(item_name: str = None, limit: int = 10) -> str:
     db = SessionLocal()
     try:
         if item_name:
-            item = db.query(Item).filter(
-                func.lower(Item.name).like(f'%{item_name.lower()}%')
-            ).first()
+            items = ItemRepository.search_by_name(db, item_name)
             
-            if not item:
+            if not items:
                 return f"Item '{item_name}' não encontrado."
+            item = resolve_by_name(items, item_name) or items[0]
             
-            transactions = TransactionController.find_by_item_id(item.id, db=db)
+            transactions, _ = TransactionController.find_page(limit=limit, item_id=item.id, db=db)
             titulo = f"Histórico de {item.name}"
         else:
-            transactions = TransactionController.find_all(db=db)
+            transactions, _ = TransactionController.find_page(limit=limit, db=db)
             titulo = "Histórico de Transações"
         
         if not transactions:
             return "Nenhuma transação registrada."
         
-        # Limitar número de transações
-        transactions = transactions[:limit]
-        
         resultado = f"{titulo} (últimas {len(transactions)}):\n\n"
         for trans in transactions:
-            item = db.query(Item).filter(Item.id == trans.item_id).first()
-            item_name = item.name if item else "Item deletado"
-            
-            resultado += f"{trans.create_at.strftime('%d/%m/%Y')}\n"
-            resultado += f"{trans.order_type.upper()}: {trans.description}\n"
-            resultado += f"Item: {item_name}\n"
-            resultado += f"Quantidade: {trans.amount}\n"
-            if trans.price and trans.price > 0:
-                resultado += f"   Valor: R${trans.price:.2f}\n"
+            resultado += f"{trans['create_at'].strftime('%d/%m/%Y')}\n"
+            resultado += f"{trans['order_type'].upper()}: {trans['description']}\n"
+            resultado += f"Item: {trans['item_name']}\n"
+            resultado += f"Quantidade: {trans['amount']}\n"
+            if trans['price'] and trans['price'] > 0:
+                resultado += f"   Valor: R${trans['price']:.2f}\n"
             resultado += "\n"
         
         return resultado.strip()
@@ -1,7 +1,9 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.agents.structured_output import ToolStrategy
 from langchain_community.utilities import SQLDatabase
+from sqlalchemy import inspect
 from sqlalchemy.exc import OperationalError
+from database.database import engine
 from langchain.agents import create_agent
 from pydantic import BaseModel
 from pathlib import Path
@@ -17,10 +19,21 @@ def load_prompt(prompt_name: str) -> dict:
     with open(prompt_path, 'r', encoding='utf-8') as file:
         return yaml.safe_load(file).get(f'{prompt_name}_prompt', '')
 
-def get_sql_db(url, tables, retries=5, delay=2):
+# Tabelas internas (agregados derivados das transações e controle de migrações) que os
+# agentes não devem consultar nem alterar
+AGENT_HIDDEN_TABLES = ["Transaction_Daily_Rollup", "Item_Transaction_Stats", "Schema_Migrations"]
+
+def get_sql_db(tables=None, retries=5, delay=2):
+    """
+    SQLDatabase dos agentes sobre o engine da aplicação, reaproveitando o mesmo pool de conexões.
+    Sem `tables` o agente vê o esquema inteiro, menos as tabelas internas.
+    """
     for i in range(retries):
         try:
-            return SQLDatabase.from_uri(url, include_tables=tables)
+            if tables is None:
+                hidden = set(AGENT_HIDDEN_TABLES) & set(inspect(engine).get_table_names())
+                return SQLDatabase(engine, ignore_tables=list(hidden))
+            return SQLDatabase(engine, include_tables=tables)
         except (ValueError, OperationalError) as e:
             print(f"Aguardando tabelas serem criadas... Tentativa {i+1}")
             time.sleep(delay)
@@ -1,6 +1,8 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 import os
 import sys
 from datetime import datetime, timedelta
@@ -11,6 +13,8 @@ sys.path.insert(0, backend_dir)
 from models import Item, Recipe, RecipeItem, Transaction
 
 from database.database import Base
+from utils.cache import response_cache
+from utils.name_index import item_name_index, recipe_title_index
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -25,6 +29,9 @@ def db_session():
 
 
     db = TestingSessionLocal()
+    response_cache.clear()
+    item_name_index.clear()
+    recipe_title_index.clear()
     try:
         Base.metadata.drop_all(bind=engine)
         Base.metadata.create_all(bind=engine)
@@ -33,6 +40,19 @@ def db_session():
         db.close()
 
 
+@pytest.fixture(scope="function")
+def async_db(db_session):
+    """Substituto de get_async_db apontando para o mesmo banco de teste do db_session"""
+    engine = create_async_engine("sqlite+aiosqlite:///tests/test.db", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    return override_get_async_db
+
+
 @pytest.fixture(scope="function")
 def populated_db_session(db_session):
     items = [
@@ -0,0 +1,73 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from index import app
+from conftest import db_session
+from database.database import get_db, get_async_db
+from utils.cache import ResponseCache, response_cache
+
+
+@pytest.fixture
+def client(db_session, async_db):
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_cache_lru_eviction():
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set(("a",), 1, ("Item",))
+    cache.set(("b",), 2, ("Item",))
+    assert cache.get("x", ("a",)) == (True, 1)
+
+    cache.set(("c",), 3, ("Item",))
+
+    assert cache.get("x", ("b",)) == (False, None)
+    assert cache.get("x", ("a",)) == (True, 1)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_ttl_expiration():
+    cache = ResponseCache(max_entries=10, ttl_seconds=0.01)
+    cache.set(("a",), 1, ("Item",))
+    time.sleep(0.02)
+
+    assert cache.get("x", ("a",)) == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_invalidation_by_table():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set(("items",), 1, ("Item",))
+    cache.set(("recipes",), 2, ("Recipe", "Item"))
+    cache.set(("transactions",), 3, ("Transaction",))
+
+    cache.invalidate("Item")
+
+    assert cache.get("x", ("items",)) == (False, None)
+    assert cache.get("x", ("recipes",)) == (False, None)
+    assert cache.get("x", ("transactions",)) == (True, 3)
+    assert cache.versions.snapshot(("Item", "Transaction")) == (1, 0)
+
+
+def test_cached_endpoint_hits_and_invalidates(client):
+    item = {"name": "Sal", "price": 2.00, "price_unit": "kg", "measure_unity": "grama", "amount": 500}
+    assert client.post("/api/items", json=item).status_code == 201
+
+    first = client.get("/items/summary").json()
+    second = client.get("/items/summary").json()
+    assert first == second
+
+    metrics = client.get("/metrics/cache").json()
+    assert metrics["endpoints"]["items/summary"] == {"hits": 1, "misses": 1}
+
+    assert client.post("/api/items", json={**item, "name": "Açúcar"}).status_code == 201
+
+    summary = client.get("/items/summary").json()
+    assert summary["total_items"] == 2
+
+    metrics = client.get("/metrics/cache").json()
+    assert metrics["endpoints"]["items/summary"] == {"hits": 1, "misses": 2}
+    assert metrics["table_versions"]["Item"] >= 2
@@ -0,0 +1,70 @@
+import sys
+import types
+import asyncio
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from index import app
+from database.database import get_db, get_async_db
+from utils.executor import BoundedExecutor, ExecutorBusy
+from utils.semantic_cache import bot_answer_cache
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    executor = BoundedExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        first = executor.submit(release.wait)
+        second = executor.submit(release.wait)
+        with pytest.raises(ExecutorBusy):
+            executor.submit(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+        return await executor.run(sum, [1, 2, 3])
+
+    assert asyncio.run(scenario()) == 6
+    stats = executor.stats()
+    assert (stats["running"], stats["pending"], stats["completed"], stats["rejected"]) == (0, 0, 3, 1)
+
+
+@pytest.fixture
+def client(db_session, async_db):
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+def test_busy_bot_returns_503(client, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    class Graph:
+        def invoke(self, state, config):
+            started.set()
+            release.wait(5)
+            return {"final_answer": "resposta"}
+
+    module = types.ModuleType("services.graph.graph")
+    module.graph = Graph()
+    monkeypatch.setitem(sys.modules, "services.graph.graph", module)
+    monkeypatch.setattr("controllers.bot.log_route", lambda *args, **kwargs: None)
+    monkeypatch.setattr("controllers.bot.graph_executor", BoundedExecutor(max_workers=1, max_pending=0))
+    bot_answer_cache.clear()
+
+    responses = []
+    first = threading.Thread(target=lambda: responses.append(client.post("/bot/message", json={"user_message": "Oi"})))
+    first.start()
+    assert started.wait(5)
+
+    busy = client.post("/bot/message", json={"user_message": "Olá"})
+    assert busy.status_code == 503
+    assert busy.headers["retry-after"] == "5"
+    # As rotas de CRUD continuam respondendo com o chat em andamento
+    assert client.get("/api/items").status_code == 200
+
+    release.set()
+    first.join(5)
+    assert responses[0].status_code == 200
+    assert responses[0].json()["ai_message"] == "resposta"
@@ -0,0 +1,161 @@
+import sys
+import types
+import asyncio
+import base64
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from index import app
+from database.database import get_db, get_async_db
+from utils.jobs import JobQueue, JobError, JobQueueFull, job_queue, run_with_backoff
+from utils.executor import BoundedExecutor, ExecutorBusy
+from utils.semantic_cache import bot_answer_cache
+
+
+def test_model_limit_and_failures():
+    queue = JobQueue(workers=4, model_limits={"model": 2})
+    running = []
+    peak = 0
+
+    async def handler(payload):
+        nonlocal peak
+        async with queue.limit("model"):
+            running.append(payload["n"])
+            peak = max(peak, len(running))
+            await asyncio.sleep(0.01)
+            running.remove(payload["n"])
+        if payload["n"] == 0:
+            raise JobError("sem conteúdo")
+        return payload["n"] * 10
+
+    queue.register("test", handler)
+
+    async def scenario():
+        jobs = [queue.submit("test", {"n": n}) for n in range(6)]
+        assert all(job.status == "pending" for job in jobs)
+        return [await queue.wait(job.id, timeout=5) for job in jobs]
+
+    jobs = asyncio.run(scenario())
+    assert peak == 2
+    assert [(job.status, job.result, job.error) for job in jobs[:2]] == [("failed", None, "sem conteúdo"), ("done", 10, None)]
+    assert all(job.payload is None for job in jobs)
+
+    with pytest.raises(ValueError):
+        queue.submit("desconhecido", {})
+
+
+def test_submit_refuses_when_queue_is_full():
+    queue = JobQueue(workers=1, max_queued=2)
+
+    async def handler(payload):
+        return payload["n"]
+
+    queue.register("test", handler)
+
+    async def scenario():
+        jobs = [queue.submit("test", {"n": n}) for n in range(2)]
+        with pytest.raises(JobQueueFull):
+            queue.submit("test", {"n": 2})
+        return [await queue.wait(job.id, timeout=5) for job in jobs]
+
+    assert [job.result for job in asyncio.run(scenario())] == [0, 1]
+
+
+def test_run_with_backoff_waits_for_a_free_thread():
+    executor = BoundedExecutor(max_workers=1, max_pending=0, name="test-backoff")
+    release = threading.Event()
+
+    async def scenario():
+        blocked = executor.submit(release.wait)
+        asyncio.get_running_loop().call_later(0.05, release.set)
+        result = await run_with_backoff(executor, lambda: "ok", retries=5, backoff_seconds=0.02)
+        await blocked
+        return result
+
+    assert asyncio.run(scenario()) == "ok"
+    assert executor.stats()["rejected"] >= 1
+
+    release.clear()
+
+    async def exhausted():
+        blocked = executor.submit(release.wait)
+        try:
+            with pytest.raises(ExecutorBusy):
+                await run_with_backoff(executor, lambda: "ok", retries=1, backoff_seconds=0.01)
+        finally:
+            release.set()
+            await blocked
+
+    asyncio.run(exhausted())
+
+
+@pytest.fixture
+def client(db_session, async_db, monkeypatch):
+    engine = create_async_engine("sqlite+aiosqlite:///tests/test.db", poolclass=NullPool)
+    monkeypatch.setattr(
+        "controllers.bot.get_async_sessionmaker",
+        lambda: async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    )
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    class Graph:
+        def invoke(self, state, config):
+            return {"final_answer": f"Registrado: {state['user_input']}"}
+
+    module = types.ModuleType("services.graph.graph")
+    module.graph = Graph()
+    monkeypatch.setitem(sys.modules, "services.graph.graph", module)
+    monkeypatch.setattr("controllers.bot.log_route", lambda *args, **kwargs: None)
+    monkeypatch.setattr("controllers.bot.optical_extractor", lambda image_b64: {"final_answer": "Adicionar 5 bananas"})
+    monkeypatch.setattr("controllers.bot.audio_extractor", lambda audio_b64: {"final_answer": ""})
+    bot_answer_cache.clear()
+
+
+def test_image_job(client, fake_models):
+    image_b64 = base64.b64encode(b"imagem").decode()
+    response = client.post("/bot/jobs/image", json={"user_message": "", "image_b64": image_b64, "thread_id": "t1"})
+    assert response.status_code == 202
+    assert response.json()["status"] in ("pending", "running", "done")
+
+    job = client.get(f"/bot/jobs/{response.json()['id']}", params={"wait": 5}).json()
+    assert job["status"] == "done"
+    assert job["result"]["thread_id"] == "t1"
+    assert job["result"]["ai_message"] == "Registrado: Adicionar 5 bananas"
+
+    history = client.get("/bot/history").json()
+    assert [(m["user_message"], m["ai_message"]) for m in history] == [("Adicionar 5 bananas", "Registrado: Adicionar 5 bananas")]
+
+
+def test_audio_job_without_content_fails(client, fake_models):
+    audio_b64 = "data:audio/webm;base64," + base64.b64encode(b"audio").decode()
+    job_id = client.post("/bot/jobs/audio", json={"user_message": "", "audio_b64": audio_b64}).json()["id"]
+
+    job = client.get(f"/bot/jobs/{job_id}", params={"wait": 5}).json()
+    assert (job["status"], job["error"], job["result"]) == ("failed", "Áudio inválido", None)
+
+
+@pytest.mark.parametrize("image_b64", ["", "invalid-base64-string!!!", "YWJj=", "YW=j"])
+def test_invalid_image_is_rejected_on_submit(client, image_b64):
+    response = client.post("/bot/jobs/image", json={"user_message": "", "image_b64": image_b64})
+    assert response.status_code == 400
+
+
+def test_unknown_job(client):
+    assert client.get("/bot/jobs/nao-existe").status_code == 404
+
+
+def test_full_queue_returns_503(client, monkeypatch):
+    monkeypatch.setattr(job_queue, "max_queued", 0)
+    image_b64 = base64.b64encode(b"imagem").decode()
+    response = client.post("/bot/jobs/image", json={"user_message": "", "image_b64": image_b64})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
@@ -0,0 +1,85 @@
+from decimal import Decimal
+from conftest import db_session
+from models import Item, Recipe
+from repositories import ItemRepository, RecipeRepository
+from utils.name_index import NameIndex, fold_text
+
+
+def build_index(*names):
+    index = NameIndex()
+    index.build((id, name, "kg") for id, name in enumerate(names, start=1))
+    return index
+
+
+def test_fold_text_removes_accents_and_case():
+    assert fold_text("  Açúcar   MASCAVO ") == "acucar mascavo"
+
+
+def test_search_ignores_accents():
+    index = build_index("Açúcar", "Farinha de Trigo")
+
+    results = index.search("acucar")
+
+    assert [r["name"] for r in results] == ["Açúcar"]
+    assert results[0]["exact"] is True
+
+
+def test_search_ranks_exact_then_prefix_then_substring():
+    index = build_index("Leite Condensado", "Doce de Leite", "Leite")
+
+    names = [r["name"] for r in index.search("leite")]
+
+    assert names == ["Leite", "Leite Condensado", "Doce de Leite"]
+
+
+def test_search_is_deterministic_on_ties():
+    index = NameIndex()
+    index.build([(2, "Ovo", "un"), (1, "Ovo", "dz")])
+
+    assert [r["id"] for r in index.search("ovo")] == [1, 2]
+    assert [r["id"] for r in index.search("ovo", extra="un")] == [2]
+
+
+def test_search_tolerates_typos_when_nothing_contains_term():
+    index = build_index("Chocolate em Pó", "Manteiga")
+
+    assert [r["name"] for r in index.search("chocolatte")] == ["Chocolate em Pó"]
+
+
+def test_upsert_and_remove_update_built_index():
+    index = build_index("Manteiga")
+
+    index.upsert(2, "Margarina", "kg")
+    index.upsert(1, "Manteiga sem Sal", "kg")
+    index.remove(2)
+
+    assert index.search("margarina") == []
+    assert [r["name"] for r in index.search("manteiga")] == ["Manteiga sem Sal"]
+
+
+def test_upsert_is_ignored_before_build():
+    index = NameIndex()
+    index.upsert(1, "Manteiga", "kg")
+
+    assert index.is_stale()
+    assert index.search("manteiga") == []
+
+
+def test_item_repository_search_by_name(db_session):
+    for name in ["Açúcar Refinado", "Açúcar", "Farinha"]:
+        db_session.add(Item(name=name, measure_unity="kg", amount=Decimal("1"), price=Decimal("5"), price_unit="kg"))
+    db_session.commit()
+
+    assert [i.name for i in ItemRepository.search_by_name(db_session, "acucar")] == ["Açúcar", "Açúcar Refinado"]
+
+    ItemRepository.save(db_session, Item(name="Açúcar Mascavo", measure_unity="g", amount=Decimal("1"), price=Decimal("5"), price_unit="kg"))
+
+    assert [i.name for i in ItemRepository.search_by_name(db_session, "acucar", measure_unity="g")] == ["Açúcar Mascavo"]
+
+
+def test_recipe_repository_search_by_title(db_session):
+    db_session.add_all([Recipe(title="Bolo de Cenoura", steps="Misturar"), Recipe(title="Pão de Mel", steps="Assar")])
+    db_session.commit()
+
+    assert [r.title for r in RecipeRepository.search_by_title(db_session, "pao de mel")] == ["Pão de Mel"]
+    assert [r.title for r in RecipeRepository.search_by_title(db_session, "bolo cenora")] == ["Bolo de Cenoura"]
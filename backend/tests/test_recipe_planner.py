@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from utils.recipe_planner import RecipeMatrix, max_batches, shopping_list
+
+
+@pytest.fixture
+def matrix():
+    return RecipeMatrix(
+        [(1, "Bolo"), (2, "Omelete"), (3, "Receita Vazia")],
+        [(10, "Farinha", "grama", 1000, 0.005), (20, "Ovo", "unidade", 5, 0.5), (30, "Leite", "mililitro", -10, 0.004)],
+        [(1, 10, 300), (1, 20, 2), (2, 20, 3), (2, 30, 100)]
+    )
+
+
+def test_matrix_places_requirements_by_id(matrix):
+    assert matrix.requirements.tolist() == [
+        [300, 2, 0],
+        [0, 3, 100],
+        [0, 0, 0]
+    ]
+
+
+def test_max_batches(matrix):
+    assert max_batches(matrix.requirements, matrix.stock).tolist() == [2, 0, -1]
+
+
+def test_max_batches_tolerates_decimal_rounding():
+    assert max_batches(np.array([[0.1]]), np.array([0.3])).tolist() == [3]
+
+
+def test_shopping_list_buys_only_the_deficit(matrix):
+    demand, to_buy, cost = shopping_list(matrix.requirements, matrix.stock, matrix.unit_prices, np.array([3, 1, 0]))
+
+    assert demand.tolist() == [900, 9, 100]
+    assert to_buy.tolist() == [0, 4, 100]
+    assert cost.tolist() == pytest.approx([0, 2.0, 0.4])
@@ -0,0 +1,62 @@
+import sys
+import json
+import types
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk
+from index import app
+from database.database import get_db, get_async_db
+from utils.semantic_cache import bot_answer_cache
+
+
+@pytest.fixture
+def client(db_session, async_db):
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def fake_graph(monkeypatch):
+    """Grafo que devolve as partes de stream de uma saudação respondida pelo nó trivial"""
+    class Graph:
+        def stream(self, state, config, stream_mode):
+            yield "updates", {"fast_router": {"fast_route": "TRIVIAL", "route_confidence": 0.99}}
+            for text in ("Olá", "!", ""):
+                metadata = {"langgraph_node": "model", "langgraph_checkpoint_ns": "trivial:a|model:b"}
+                yield "messages", (AIMessageChunk(content=text), metadata)
+            yield "messages", (AIMessageChunk(content="ignorado"), {"langgraph_node": "orchestrator"})
+            yield "updates", {"trivial": {"final_answer": "Olá!", "route": "TRIVIAL"}}
+
+    module = types.ModuleType("services.graph.graph")
+    module.graph = Graph()
+    monkeypatch.setitem(sys.modules, "services.graph.graph", module)
+    monkeypatch.setattr("controllers.bot.log_route", lambda *args, **kwargs: None)
+    bot_answer_cache.clear()
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_message(client, fake_graph):
+    response = client.post("/bot/message/stream", json={"user_message": "Oi", "thread_id": "t1"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["start", "node", "token", "token", "node", "answer", "done"]
+    assert events[0][1] == {"thread_id": "t1"}
+    assert [data["text"] for event, data in events if event == "token"] == ["Olá", "!"]
+    assert events[-2][1] == {"text": "Olá!"}
+    assert events[-1][1]["ai_message"] == "Olá!"
+
+    history = client.get("/bot/history").json()
+    assert [(m["thread_id"], m["user_message"], m["ai_message"]) for m in history] == [("t1", "Oi", "Olá!")]
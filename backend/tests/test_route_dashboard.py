@@ -3,7 +3,7 @@ from fastapi.testclient import TestClient
 from index import app
 from schemas import ItemResponse, TransactionResponse, RecipeResponse
 from conftest import db_session
-from database.database import get_db
+from database.database import get_db, get_async_db
 from datetime import datetime, timedelta
 
 
@@ -12,8 +12,9 @@ def override_get_db(db_session):
 
 
 @pytest.fixture
-def client(db_session):
+def client(db_session, async_db):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -229,4 +230,49 @@ def test_dashboard_performance(client, sample_items, sample_transactions):
     end_time = time.time()
 
     assert response.status_code == 200
-    assert (end_time - start_time) < 2.0
\ No newline at end of file
+    assert (end_time - start_time) < 2.0
+
+def test_dashboard_counts_values(client, sample_items, sample_recipe):
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+
+    dashboard = response.json()
+
+    assert dashboard["low_stock_count"] == 2
+    assert dashboard["expiring_soon_count"] == 1
+    assert dashboard["feasible_recipes_count"] == 0
+
+    response = client.put(f"/api/items/{sample_items[1].id}", json={
+        **sample_items[1].model_dump(exclude={"id"}, mode="json"),
+        "amount": 500
+    })
+    assert response.status_code == 200
+
+    dashboard = client.get("/dashboard").json()
+    assert dashboard["low_stock_count"] == 1
+    assert dashboard["feasible_recipes_count"] == 1
+
+
+def test_dashboard_version_stamp(client, sample_items):
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+
+    etag = response.headers["etag"]
+    assert etag == f'"{response.json()["version"]}"'
+
+    response = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.post("/api/items", json={
+        "name": "Fermento",
+        "measure_unity": "grama",
+        "amount": 100,
+        "price": 3.00,
+        "price_unit": "kg"
+    })
+    assert response.status_code == 201
+
+    response = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
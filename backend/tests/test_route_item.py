@@ -3,7 +3,9 @@ from fastapi.testclient import TestClient
 from index import app
 from schemas import ItemResponse
 from conftest import db_session
-from database.database import get_db
+from database.database import get_db, get_async_db
+from models import Item
+from utils.unit_registry import UNIT_REGISTRY
 
 
 def override_get_db(db_session):
@@ -11,8 +13,9 @@ def override_get_db(db_session):
 
 
 @pytest.fixture
-def client(db_session):
+def client(db_session, async_db):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -334,6 +337,31 @@ def test_get_items_by_value_ranking(client):
     assert top_items[0]["total_value"] >= top_items[1]["total_value"]
 
 
+def test_summary_and_ranking_values(client):
+    items_data = [
+        {"name": "Sal", "price": 2.00, "price_unit": "kg", "measure_unity": "grama", "amount": 500},
+        {"name": "Chocolate", "price": 40.00, "price_unit": "kg", "measure_unity": "grama", "amount": 1000},
+        {"name": "Ovos", "price": 12.00, "price_unit": "duzia", "measure_unity": "unidade", "amount": 6},
+        {"name": "Leite", "price": 5.00, "price_unit": "litro", "measure_unity": "mililitro", "amount": 0},
+    ]
+
+    for item_data in items_data:
+        response = client.post("/api/items", json=item_data)
+        assert response.status_code == 201
+
+    summary = client.get("/items/summary").json()
+    assert summary == {
+        "total_items": 4,
+        "items_with_stock": 3,
+        "items_out_of_stock": 1,
+        "total_inventory_value": 47.0
+    }
+
+    top_items = client.get("/items/top-value/2").json()
+    assert [item["name"] for item in top_items] == ["Chocolate", "Ovos"]
+    assert [item["total_value"] for item in top_items] == [40.0, 6.0]
+
+
 @pytest.mark.parametrize(
     "payload,expected_total",
     [
@@ -373,4 +401,48 @@ def test_get_total_item_value_with_zero_amount(client):
 
     result = response.json()
     assert "total_value" in result
-    assert result["total_value"] == 0.0
\ No newline at end of file
+    assert result["total_value"] == 0.0
+
+
+def test_item_unit_factor_maintained(client, db_session):
+    payload = {"name": "Farinha", "price": 6.00, "price_unit": "quilograma", "measure_unity": "g", "amount": 2500}
+    response = client.post("/api/items", json=payload)
+    assert response.status_code == 201
+    item_id = response.json()["id"]
+
+    item = db_session.get(Item, item_id)
+    assert item.measure_code == UNIT_REGISTRY.code("grama")
+    assert item.price_code == UNIT_REGISTRY.code("kg")
+    assert float(item.unit_factor) == 1000.0
+
+    response = client.get("/items/summary")
+    assert response.json()["total_inventory_value"] == 15.0
+
+    payload["price_unit"] = "grama"
+    response = client.put(f"/api/items/{item_id}", json=payload)
+    assert response.status_code == 200
+
+    db_session.expire_all()
+    item = db_session.get(Item, item_id)
+    assert item.price_code == UNIT_REGISTRY.code("grama")
+    assert float(item.unit_factor) == 1.0
+
+def test_create_items_bulk(client, db_session):
+    payload = [
+        {"name": "Farinha", "price": 6.00, "price_unit": "kg", "measure_unity": "grama", "amount": 2000},
+        {"name": "", "price": 1.00, "measure_unity": "unidade", "amount": 1},
+        {"name": "Leite", "price": 5.00, "price_unit": "litro", "measure_unity": "mililitro", "amount": 500},
+    ]
+    response = client.post("/api/items/bulk", json=payload)
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["created"] == 2
+    assert result["errors"] == [{"index": 1, "detail": "Campo obrigatório vazio"}]
+
+    items = [db_session.get(Item, id) for id in result["ids"]]
+    assert [item.name for item in items] == ["Farinha", "Leite"]
+    assert float(items[0].unit_factor) == 1000.0
+
+    response = client.get("/items/summary")
+    assert response.json()["total_inventory_value"] == 14.5
@@ -3,15 +3,16 @@ from fastapi.testclient import TestClient
 from index import app
 from schemas import RecipeResponse
 from conftest import db_session
-from database.database import get_db
+from database.database import get_db, get_async_db
 
 
 def override_get_db(db_session):
     yield db_session
 
 @pytest.fixture
-def client(db_session):
+def client(db_session, async_db):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -356,4 +357,150 @@ def test_recipe_cost_with_items(client):
     assert data["total_cost"] == 5.0
     assert len(data["ingredients"]) == 1
     assert data["ingredients"][0]["item_id"] == item1_id
-    assert data["ingredients"][0]["required_amount"] == 500.0
\ No newline at end of file
+    assert data["ingredients"][0]["required_amount"] == 500.0
+
+def test_recipes_availability_max_batches_and_missing(client):
+    """Testa o cálculo de viabilidade: quantas vezes cada receita pode ser feita e o que falta."""
+    farinha = client.post("/api/items", json={
+        "name": "Farinha", "price": 5.00, "price_unit": "quilograma", "measure_unity": "grama", "amount": 1000
+    }).json()["id"]
+    ovo = client.post("/api/items", json={
+        "name": "Ovo", "price": 0.50, "price_unit": "unidade", "measure_unity": "unidade", "amount": 5
+    }).json()["id"]
+
+    bolo = client.post("/api/recipes", json={
+        "title": "Bolo", "steps": "Asse",
+        "recipe_itens": [{"item_id": farinha, "amount": 300}, {"item_id": ovo, "amount": 2}]
+    }).json()["id"]
+    omelete = client.post("/api/recipes", json={
+        "title": "Omelete", "steps": "Frite",
+        "recipe_itens": [{"item_id": ovo, "amount": 8}]
+    }).json()["id"]
+
+    availability = {r["recipe_id"]: r for r in client.get("/recipes/availability").json()}
+
+    assert availability[bolo]["feasible"] is True
+    assert availability[bolo]["max_batches"] == 2
+    assert availability[bolo]["total_cost"] == pytest.approx(2.5)
+    assert availability[omelete]["feasible"] is False
+    assert availability[omelete]["max_batches"] == 0
+    assert availability[omelete]["missing"] == [{
+        "item_id": ovo, "item_name": "Ovo", "measure_unity": "unidade",
+        "required_amount": 8.0, "available_amount": 5.0, "missing_amount": 3.0
+    }]
+
+    feasible = client.get("/recipes/feasible").json()
+    assert feasible == [{"recipe_id": bolo, "recipe_title": "Bolo", "total_cost": pytest.approx(2.5), "max_batches": 2}]
+
+
+def test_availability_follows_recipe_item_writes(client, db_session):
+    """Uma escrita só em Recipe_Item (ex: SQL do agente de receitas) invalida a viabilidade em cache."""
+    from sqlalchemy import text
+    from utils.cache import invalidate_tables
+
+    ovo = client.post("/api/items", json={
+        "name": "Ovo", "price": 0.50, "price_unit": "unidade", "measure_unity": "unidade", "amount": 5
+    }).json()["id"]
+    omelete = client.post("/api/recipes", json={
+        "title": "Omelete", "steps": "Frite", "recipe_itens": [{"item_id": ovo, "amount": 2}]
+    }).json()["id"]
+    assert client.get("/recipes/availability").json()[0]["max_batches"] == 2
+
+    db_session.execute(text('UPDATE "Recipe_Item" SET amount = 5 WHERE recipe_id = :id'), {"id": omelete})
+    db_session.commit()
+    invalidate_tables("Recipe_Item")
+
+    assert client.get("/recipes/availability").json()[0]["max_batches"] == 1
+
+
+def test_recipe_costs_batch_single_query_and_price_change(client, db_session):
+    """Testa o custo em lote: uma consulta para todas as receitas e recálculo quando o preço muda."""
+    from sqlalchemy import event
+    from repositories import RecipeRepository
+
+    farinha = {"name": "Farinha", "price": 5.00, "price_unit": "quilograma", "measure_unity": "grama", "amount": 1000}
+    farinha_id = client.post("/api/items", json=farinha).json()["id"]
+    for title, amount in [("Pão", 500), ("Bolo", 200)]:
+        client.post("/api/recipes", json={
+            "title": title, "steps": "Asse", "recipe_itens": [{"item_id": farinha_id, "amount": amount}]
+        })
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        costs = RecipeRepository.find_all_recipes_with_cost(db_session)
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert [c["total_cost"] for c in costs] == [pytest.approx(2.5), pytest.approx(1.0)]
+
+    client.put(f"/api/items/{farinha_id}", json={**farinha, "price": 10.00})
+
+    costs = client.get("/recipes/costs").json()
+    assert [c["total_cost"] for c in costs] == [pytest.approx(5.0), pytest.approx(2.0)]
+    assert client.get("/recipes/cost/999").status_code == 404
+
+
+def test_max_batches_and_plan(client):
+    """Testa a quantidade máxima de vezes por receita e a lista de compras de um plano."""
+    farinha = client.post("/api/items", json={
+        "name": "Farinha", "price": 5.00, "price_unit": "quilograma", "measure_unity": "grama", "amount": 1000
+    }).json()["id"]
+    ovo = client.post("/api/items", json={
+        "name": "Ovo", "price": 0.50, "price_unit": "unidade", "measure_unity": "unidade", "amount": 5
+    }).json()["id"]
+    bolo = client.post("/api/recipes", json={
+        "title": "Bolo", "steps": "Asse",
+        "recipe_itens": [{"item_id": farinha, "amount": 300}, {"item_id": ovo, "amount": 2}]
+    }).json()["id"]
+    vazia = client.post("/api/recipes", json={"title": "Vazia", "steps": "..."}).json()["id"]
+
+    response = client.get("/recipes/max-batches")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"recipe_id": bolo, "recipe_title": "Bolo", "max_batches": 2},
+        {"recipe_id": vazia, "recipe_title": "Vazia", "max_batches": None}
+    ]
+
+    response = client.post("/recipes/plan", json={"recipes": [{"recipe_id": bolo, "batches": 4}]})
+    assert response.status_code == 200
+    plan = response.json()
+    assert plan["recipes"] == [{"recipe_id": bolo, "recipe_title": "Bolo", "batches": 4}]
+    assert {i["item_name"]: i["to_buy"] for i in plan["items"]} == {"Farinha": 200.0, "Ovo": 3.0}
+    assert plan["total_cost"] == pytest.approx(200 * 0.005 + 3 * 0.5)
+
+    assert client.post("/recipes/plan", json={"recipes": [{"recipe_id": 999, "batches": 1}]}).status_code == 404
+    assert client.post("/recipes/plan", json={"recipes": [{"recipe_id": bolo, "batches": 0}]}).status_code == 400
+
+
+def test_availability_and_max_batches_agree(client):
+    """Testa se /recipes/availability e /recipes/max-batches dão a mesma contagem para cada receita."""
+    fermento = client.post("/api/items", json={
+        "name": "Fermento", "price": 20.00, "price_unit": "kg", "measure_unity": "kg", "amount": 0.3
+    }).json()["id"]
+    ovo = client.post("/api/items", json={
+        "name": "Ovo", "price": 0.50, "price_unit": "unidade", "measure_unity": "unidade", "amount": 1
+    }).json()["id"]
+    for title, itens in [("Pão", [{"item_id": fermento, "amount": 0.1}]), ("Omelete", [{"item_id": ovo, "amount": 2}]), ("Vazia", [])]:
+        client.post("/api/recipes", json={"title": title, "steps": "...", "recipe_itens": itens})
+
+    availability = {r["recipe_id"]: r["max_batches"] for r in client.get("/recipes/availability").json()}
+    max_batches = {r["recipe_id"]: r["max_batches"] for r in client.get("/recipes/max-batches").json()}
+    assert availability == max_batches
+    assert sorted(availability.values(), key=str) == [0, 3, None]
+
+
+def test_feasible_follows_max_batches_on_edge_quantities(client):
+    """Testa se a viabilidade sai de max_batches >= 1 mesmo quando falta uma fração mínima do estoque."""
+    leite = client.post("/api/items", json={
+        "name": "Leite", "price": 5.00, "price_unit": "litro", "measure_unity": "litro", "amount": 0.9999999999
+    }).json()["id"]
+    client.post("/api/recipes", json={"title": "Mingau", "steps": "...", "recipe_itens": [{"item_id": leite, "amount": 1}]})
+
+    availability = client.get("/recipes/availability").json()
+    assert [(r["max_batches"], r["feasible"], r["missing"]) for r in availability] == [(1, True, [])]
+    assert [r["recipe_title"] for r in client.get("/recipes/feasible").json()] == ["Mingau"]
+    assert client.get("/dashboard").json()["feasible_recipes_count"] == 1
+
@@ -1,9 +1,13 @@
+import io
+import csv
+import json
+import gzip
 import pytest
 from fastapi.testclient import TestClient
 from index import app
 from schemas import TransactionResponse, ItemResponse
 from conftest import db_session
-from database.database import get_db
+from database.database import get_db, get_async_db
 
 
 def override_get_db(db_session):
@@ -11,8 +15,9 @@ def override_get_db(db_session):
 
 
 @pytest.fixture
-def client(db_session):
+def client(db_session, async_db):
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_async_db] = async_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -209,6 +214,53 @@ def test_get_all_transactions(client, sample_item):
     assert len(transactions) >= 2
 
 
+def test_get_transactions_keyset_pagination(client, sample_item):
+    created_ids = []
+    for day, order_type in [(1, "entrada"), (2, "saida"), (2, "entrada"), (3, "entrada"), (4, "saida")]:
+        response = client.post("/api/transactions", json={
+            "item_id": sample_item.id,
+            "order_type": order_type,
+            "description": f"Dia {day}",
+            "amount": 10.0,
+            "price": 1.0,
+            "create_at": f"2025-01-0{day}T00:00:00"
+        })
+        assert response.status_code == 201
+        created_ids.append(response.json()["id"])
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/transactions", params=params)
+        assert response.status_code == 200
+        pages.append([t["id"] for t in response.json()])
+        assert all(t["item_name"] == "Açúcar" for t in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    expected = [created_ids[4], created_ids[3], created_ids[2], created_ids[1], created_ids[0]]
+    assert pages == [expected[0:2], expected[2:4], expected[4:]]
+
+    response = client.get("/api/transactions", params={
+        "order_type": "entrada",
+        "start_date": "2025-01-02",
+        "end_date": "2025-01-03",
+        "item_id": sample_item.id
+    })
+    assert [t["id"] for t in response.json()] == [created_ids[3], created_ids[2]]
+    assert "x-next-cursor" not in response.headers
+
+    response = client.get("/api/transactions", params={"cursor": "inválido"})
+    assert response.status_code == 400
+
+    response = client.get("/api/transactions", params={"limit": 100000})
+    assert response.status_code == 422
+
+
 def test_get_transaction_by_id(client, sample_item):
     transaction_data = {
         "item_id": sample_item.id,
@@ -372,6 +424,51 @@ def test_get_transaction_summary(client, sample_item):
     assert summary["exits"]["count"] >= 1
 
 
+def test_get_transaction_summary_values(client, sample_item):
+    transactions_data = [
+        {
+            "item_id": sample_item.id,
+            "order_type": "entrada",
+            "description": "Compra de açúcar",
+            "amount": 1000.0,
+            "price": 5.00
+        },
+        {
+            "item_id": sample_item.id,
+            "order_type": "Entrada",
+            "description": "Compra de açúcar",
+            "amount": 500.0,
+            "price": 6.00
+        },
+        {
+            "item_id": sample_item.id,
+            "order_type": "saída",
+            "description": "Uso em receita",
+            "amount": 200.0,
+            "price": None
+        },
+        {
+            "item_id": sample_item.id,
+            "order_type": "ajuste",
+            "description": "Ajuste de estoque",
+            "amount": 50.0,
+            "price": 0.0
+        }
+    ]
+
+    for transaction_data in transactions_data:
+        response = client.post("/api/transactions", json=transaction_data)
+        assert response.status_code == 201
+
+    response = client.get("/transactions/summary/30")
+    assert response.status_code == 200
+
+    summary = response.json()
+    assert summary["entries"] == {"count": 2, "total_amount": 1500.0, "total_value": 8.0}
+    assert summary["exits"] == {"count": 1, "total_amount": 200.0, "total_value": 1.0}
+    assert summary["balance"] == {"amount": 1300.0, "value": 7.0}
+
+
 def test_get_most_transacted_items(client, sample_item):
     transactions_data = [
         {
@@ -411,6 +508,38 @@ def test_get_most_transacted_items(client, sample_item):
     assert "total_value" in items[0]
 
 
+def test_get_most_transacted_items_ranking(client, sample_item):
+    other_item = client.post("/api/items", json={
+        "name": "Leite",
+        "measure_unity": "mililitro",
+        "amount": 1000,
+        "price": 5.00,
+        "price_unit": "litro"
+    }).json()
+
+    for item_id, amount in [(sample_item.id, 100.0), (other_item["id"], 500.0), (other_item["id"], 250.0)]:
+        response = client.post("/api/transactions", json={
+            "item_id": item_id,
+            "order_type": "entrada",
+            "description": "Compra",
+            "amount": amount,
+            "price": None
+        })
+        assert response.status_code == 201
+
+    response = client.get("/transactions/most-transacted/1/none")
+    assert response.status_code == 200
+
+    items = response.json()
+    assert items == [{
+        "item_id": other_item["id"],
+        "item_name": "Leite",
+        "transaction_count": 2,
+        "total_amount": 750.0,
+        "total_value": 3.75
+    }]
+
+
 def test_get_daily_transactions(client, sample_item):
     transactions_data = [
         {
@@ -444,6 +573,42 @@ def test_get_daily_transactions(client, sample_item):
     assert "total_amount" in daily_data[0]
 
 
+def test_daily_transactions_track_writes(client, sample_item):
+    created = []
+    for amount in [300.0, 200.0]:
+        response = client.post("/api/transactions", json={
+            "item_id": sample_item.id,
+            "order_type": "entrada",
+            "description": "Compra",
+            "amount": amount,
+            "price": 5.00
+        })
+        assert response.status_code == 201
+        created.append(response.json())
+
+    daily_data = client.get("/transactions/daily/30").json()
+    assert len(daily_data) == 1
+    assert daily_data[0]["count"] == 2
+    assert daily_data[0]["total_amount"] == 500.0
+
+    response = client.delete(f"/api/transactions/{created[0]['id']}")
+    assert response.status_code == 204
+
+    update_data = {**created[1], "order_type": "saida"}
+    update_data.pop("id")
+    response = client.put(f"/api/transactions/{created[1]['id']}", json=update_data)
+    assert response.status_code == 200
+
+    daily_data = client.get("/transactions/daily/30").json()
+    assert len(daily_data) == 1
+    assert daily_data[0]["order_type"] == "saida"
+    assert daily_data[0]["count"] == 1
+    assert daily_data[0]["total_amount"] == 200.0
+
+    consumption = client.get("/transactions/consumption-rate/30").json()
+    assert consumption[0]["total_consumed"] == 200.0
+
+
 def test_get_consumption_rate(client, sample_item):
     transactions_data = [
         {
@@ -513,4 +678,228 @@ def test_get_price_analysis(client, sample_item):
     assert "avg_price" in price_data[0]
     assert "min_price" in price_data[0]
     assert "max_price" in price_data[0]
-    assert "transaction_count" in price_data[0]
\ No newline at end of file
+    assert "transaction_count" in price_data[0]
+
+
+def test_price_analysis_tracks_writes(client, sample_item):
+    created = []
+    for amount, price in [(1000.0, 5.00), (500.0, 8.00), (200.0, None)]:
+        response = client.post("/api/transactions", json={
+            "item_id": sample_item.id,
+            "order_type": "entrada",
+            "description": "Compra",
+            "amount": amount,
+            "price": price
+        })
+        assert response.status_code == 201
+        created.append(response.json())
+
+    response = client.get("/transactions/price-analysis")
+    assert response.status_code == 200
+    analysis = response.json()[0]
+    assert analysis["transaction_count"] == 3
+    assert analysis["min_price"] == 1.0
+    assert analysis["max_price"] == 5.0
+    assert analysis["avg_price"] == 10.0 / 3
+
+    response = client.delete(f"/api/transactions/{created[0]['id']}")
+    assert response.status_code == 204
+
+    analysis = client.get("/transactions/price-analysis").json()[0]
+    assert analysis["transaction_count"] == 2
+    assert analysis["max_price"] == 4.0
+
+    item_payload = sample_item.model_dump(exclude={"id"}, mode="json")
+    item_payload["price"] = 10.00
+    response = client.put(f"/api/items/{sample_item.id}", json=item_payload)
+    assert response.status_code == 200
+
+    analysis = client.get("/transactions/price-analysis").json()[0]
+    assert analysis["min_price"] == 2.0
+    assert analysis["avg_price"] == 3.0
+
+
+
+def test_export_transactions_streaming(client, sample_item):
+    for day, amount in [(1, 1000.0), (2, 500.0), (3, 200.0)]:
+        response = client.post("/api/transactions", json={
+            "item_id": sample_item.id,
+            "order_type": "entrada",
+            "description": "Compra, lote \"A\"",
+            "amount": amount,
+            "price": 5.00,
+            "create_at": f"2025-01-0{day}T00:00:00"
+        })
+        assert response.status_code == 201
+
+    response = client.get("/api/transactions/export", params={"start_date": "2025-01-02"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["amount"] for row in rows] == [500.0, 200.0]
+    assert rows[0]["item_name"] == "Açúcar"
+    assert rows[0]["total_value"] == 2.5
+    assert rows[0]["create_at"] == "2025-01-02"
+
+    response = client.get("/api/transactions/export", params={"format": "csv", "gzip": True})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+
+    content = response.content
+    if content[:2] == b"\x1f\x8b":
+        content = gzip.decompress(content)
+    lines = list(csv.reader(io.StringIO(content.decode())))
+    assert lines[0][:3] == ["id", "create_at", "order_type"]
+    assert len(lines) == 4
+    assert lines[1][3] == 'Compra, lote "A"'
+
+    response = client.get("/api/transactions/export", params={"format": "xml"})
+    assert response.status_code == 400
+
+
+def test_create_transactions_bulk(client, sample_item):
+    payload = [
+        {"item_id": sample_item.id, "order_type": "entrada", "description": "Lote 1", "amount": 1000.0, "price": 5.00, "create_at": "2025-01-01T00:00:00"},
+        {"item_id": 999999, "order_type": "entrada", "description": "Lote 2", "amount": 10.0, "create_at": "2025-01-01T00:00:00"},
+        {"item_id": sample_item.id, "order_type": "saida", "description": "Lote 3", "amount": 0, "create_at": "2025-01-01T00:00:00"},
+        {"item_id": sample_item.id, "order_type": "saida", "description": "Lote 4", "amount": 200.0, "price": 5.00, "create_at": "2025-01-01T00:00:00"},
+    ]
+    response = client.post("/api/transactions/bulk", json=payload)
+    assert response.status_code == 200
+
+    result = response.json()
+    assert result["created"] == 2
+    assert result["errors"] == [
+        {"index": 1, "detail": "Item não encontrado"},
+        {"index": 2, "detail": "A quantidade deve ser maior que zero"},
+    ]
+
+    response = client.get(f"/api/transactions/{result['ids'][1]}")
+    assert response.json()["description"] == "Lote 4"
+
+    response = client.get("/transactions/most-transacted/1/null")
+    assert response.json()[0]["transaction_count"] == 2
+
+
+def test_item_stats_increments_match_rebuild(client, db_session, sample_item):
+    from models import ItemTransactionStats
+    from repositories import ItemTransactionStatsRepository
+
+    other_item = client.post("/api/items", json={
+        "name": "Leite",
+        "measure_unity": "mililitro",
+        "amount": 1000,
+        "price": 5.00,
+        "price_unit": "litro"
+    }).json()
+
+    transactions = [(sample_item.id, 1000.0, 5.00), (sample_item.id, 500.0, 8.00), (other_item["id"], 250.0, None),
+                    (sample_item.id, 200.0, None), (other_item["id"], 500.0, 4.00), (sample_item.id, 300.0, 2.00)]
+    for item_id, amount, price in transactions:
+        response = client.post("/api/transactions", json={
+            "item_id": item_id,
+            "order_type": "entrada",
+            "description": "Compra",
+            "amount": amount,
+            "price": price
+        })
+        assert response.status_code == 201
+
+    def snapshot():
+        db_session.expire_all()
+        return [
+            (row.item_id, row.transaction_count, float(row.total_value), float(row.min_value), float(row.max_value))
+            for row in db_session.query(ItemTransactionStats).order_by(ItemTransactionStats.item_id)
+        ]
+
+    incremental = snapshot()
+    ItemTransactionStatsRepository.refresh(db_session)
+    db_session.commit()
+    assert incremental == snapshot()
+    assert [row[1] for row in incremental] == [4, 2]
+
+
+def test_daily_rollup_increments_match_rebuild(client, db_session, sample_item):
+    from models import TransactionDailyRollup
+    from repositories import TransactionRollupRepository
+
+    transactions = [("entrada", 1000.0, 5.00), ("entrada", 500.0, None), ("saída", 200.0, 0.0), ("saída", 300.0, 2.00)]
+    for order_type, amount, price in transactions:
+        response = client.post("/api/transactions", json={
+            "item_id": sample_item.id,
+            "order_type": order_type,
+            "description": "Movimentação",
+            "amount": amount,
+            "price": price
+        })
+        assert response.status_code == 201
+
+    def snapshot():
+        db_session.expire_all()
+        rows = db_session.query(TransactionDailyRollup).order_by(TransactionDailyRollup.order_type)
+        return [
+            (row.order_type, row.transaction_count, float(row.total_amount), float(row.total_value), float(row.priced_value))
+            for row in rows
+        ]
+
+    incremental = snapshot()
+    TransactionRollupRepository.refresh(db_session)
+    db_session.commit()
+    assert incremental == snapshot()
+    assert [row[1] for row in incremental] == [2, 2]
+
+
+def test_analytics_rebuild_after_out_of_band_writes(client, db_session, sample_item):
+    from sqlalchemy import func, text
+    from models import ItemTransactionStats, TransactionDailyRollup
+    from repositories import TransactionRepository
+
+    response = client.post("/api/transactions", json={
+        "item_id": sample_item.id, "order_type": "entrada", "description": "Compra", "amount": 100.0, "price": 5.00
+    })
+    assert response.status_code == 201
+
+    # Mesmo caminho do SQL dos agentes: escreve direto na tabela, sem o TransactionRepository
+    db_session.execute(text(
+        'INSERT INTO "Transaction" (item_id, order_type, description, amount, price, create_at) '
+        "VALUES (:item_id, 'saída', 'SQL do agente', 40, 5, :day)"
+    ), {"item_id": sample_item.id, "day": response.json()["create_at"][:10]})
+    db_session.commit()
+
+    TransactionRepository.find_average_transaction_value_by_item(db_session)
+    TransactionRepository.find_daily_transactions(db_session, days=30)
+
+    db_session.expire_all()
+    assert db_session.query(func.sum(ItemTransactionStats.transaction_count)).scalar() == 2
+    assert db_session.query(func.sum(TransactionDailyRollup.transaction_count)).scalar() == 2
+
+
+def test_bulk_insert_only_rebuilds_touched_days(client, db_session, sample_item, monkeypatch):
+    from datetime import date
+    from models import TransactionDailyRollup
+
+    response = client.post("/api/transactions", json={
+        "item_id": sample_item.id, "order_type": "entrada", "description": "Antiga",
+        "amount": 100.0, "price": 5.00, "create_at": "2024-06-01T00:00:00"
+    })
+    assert response.status_code == 201
+    # Marca o dia antigo: se a carga recalculasse o histórico inteiro do item, o valor voltaria a 1
+    db_session.query(TransactionDailyRollup).filter(TransactionDailyRollup.day == date(2024, 6, 1)).update({"transaction_count": 99})
+    db_session.commit()
+
+    monkeypatch.setattr("repositories.transaction_rollup.REFRESH_KEYS_CHUNK", 1)
+    payload = [
+        {"item_id": sample_item.id, "order_type": "entrada", "description": "Lote", "amount": 1000.0, "price": 5.00, "create_at": "2025-01-01T10:00:00"},
+        {"item_id": sample_item.id, "order_type": "entrada", "description": "Lote", "amount": 500.0, "price": 5.00, "create_at": "2025-01-01T18:00:00"},
+        {"item_id": sample_item.id, "order_type": "saida", "description": "Lote", "amount": 200.0, "create_at": "2025-01-02T00:00:00"},
+    ]
+    assert client.post("/api/transactions/bulk", json=payload).json()["created"] == 3
+
+    db_session.expire_all()
+    rows = db_session.query(TransactionDailyRollup).order_by(TransactionDailyRollup.day).all()
+    assert [(row.day, row.order_type, row.transaction_count, float(row.total_amount)) for row in rows] == [
+        (date(2024, 6, 1), "entrada", 99, 100.0),
+        (date(2025, 1, 1), "entrada", 2, 1500.0),
+        (date(2025, 1, 2), "saida", 1, 200.0),
+    ]
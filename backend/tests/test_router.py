@@ -0,0 +1,98 @@
+import json
+import pytest
+from services.graph import router as router_module
+from services.graph.router import Router, log_route, load_routing_log, flush_routing_log, evaluate
+from utils.text_classifier import TfidfLogisticClassifier
+
+TRAINING = [
+    ("Quanto tenho de farinha?", "ITEM_READER"),
+    ("Qual o preço do açúcar?", "ITEM_READER"),
+    ("Qual o preço do leite?", "ITEM_READER"),
+    ("Quantos ovos tem no estoque?", "ITEM_READER"),
+    ("Adicione 2kg de farinha", "STRUCTURER_ITEM"),
+    ("Cadastre 12 ovos", "STRUCTURER_ITEM"),
+    ("Adicione 1 litro de leite", "STRUCTURER_ITEM"),
+    ("Qual o histórico do leite?", "TRANSACTION_READER"),
+    ("Quais foram as últimas compras?", "TRANSACTION_READER"),
+    ("Quais foram as últimas saídas?", "TRANSACTION_READER"),
+    ("Como fazer bolo de cenoura?", "RECIPE_READER"),
+    ("Quais ingredientes do bolo de fubá?", "RECIPE_READER"),
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return TfidfLogisticClassifier.train([t for t, _ in TRAINING], [r for _, r in TRAINING])
+
+
+def test_classifier_learns_routes(model):
+    assert model.predict("Qual o preço da manteiga?")[0] == "ITEM_READER"
+    assert model.predict("Adicione 3kg de açúcar")[0] == "STRUCTURER_ITEM"
+    assert model.predict("Quais foram as últimas entradas?")[0] == "TRANSACTION_READER"
+
+
+def test_classifier_save_and_load(model, tmp_path):
+    path = tmp_path / "router.npz"
+    model.save(path)
+    loaded = TfidfLogisticClassifier.load(path)
+
+    assert loaded.labels == model.labels
+    assert loaded.predict("Qual o preço da manteiga?") == pytest.approx(model.predict("Qual o preço da manteiga?"))
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("Oi, tudo bem?", "TRIVIAL"),
+        ("O que está vencido?", "ITEM_READER"),
+        ("Consigo fazer bolo de cenoura?", "RECIPE_READER"),
+        ("Qual o histórico de movimentações?", "TRANSACTION_READER"),
+        ("Oi, adicione 2kg de farinha", None),
+        ("E o que mais está vencido nisso?", None),
+    ]
+)
+def test_rules_without_model(message, expected):
+    assert Router().fast_route(message)[0] == expected
+
+
+def test_fast_route_skips_writes_and_low_confidence(model):
+    router = Router(model, min_confidence=0.3)
+    assert router.fast_route("Qual o preço da manteiga?")[0] == "ITEM_READER"
+    assert router.fast_route("Adicione 3kg de açúcar")[0] is None
+
+    assert Router(model, min_confidence=0.999).fast_route("Qual o preço da manteiga?")[0] is None
+
+
+def test_routing_log_and_evaluation(model, tmp_path):
+    path = str(tmp_path / "routing_log.jsonl")
+    log_route("Qual o preço do café?", "ITEM_READER", "llm", path=path)
+    log_route("Adicione 3kg de açúcar", "STRUCTURER_ITEM", "llm", path=path)
+    log_route("O que está vencido?", "ITEM_READER", "fast", 0.99, path=path)
+    log_route("Sem rota", None, "llm", path=path)
+    flush_routing_log()
+
+    with open(path, encoding="utf-8") as file:
+        assert len(file.readlines()) == 3
+
+    records = load_routing_log(path)
+    assert [r["route"] for r in records] == ["ITEM_READER", "STRUCTURER_ITEM"]
+    assert json.loads(json.dumps(records[0]))["user_input"] == "Qual o preço do café?"
+
+    report = evaluate(Router(model, min_confidence=0.3), records)
+    assert report["messages"] == 2
+    assert report["accuracy"] == 1.0
+    assert report["coverage"] == 0.5
+    assert report["routes"]["STRUCTURER_ITEM"]["coverage"] == 0.0
+
+
+def test_routing_log_rotates_and_reads_backups(tmp_path, monkeypatch):
+    monkeypatch.setattr(router_module, "ROUTING_LOG_MAX_BYTES", 300)
+    monkeypatch.setattr(router_module, "ROUTING_LOG_BACKUPS", 2)
+    path = str(tmp_path / "routing_log.jsonl")
+    for index in range(4):
+        log_route(f"Qual o preço do item {index}?", "ITEM_READER", "llm", path=path)
+    flush_routing_log()
+
+    assert (tmp_path / "routing_log.jsonl.1").exists()
+    records = load_routing_log(path)
+    assert [r["user_input"] for r in records] == [f"Qual o preço do item {index}?" for index in range(4)]
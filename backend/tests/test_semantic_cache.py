@@ -0,0 +1,112 @@
+import sys
+import types
+import asyncio
+import pytest
+from sqlalchemy import create_engine, text
+from utils.cache import response_cache, invalidate_tables, track_writes
+from utils.semantic_cache import SemanticCache, bot_answer_cache, is_cacheable_question
+
+
+@pytest.fixture
+def fake_graph(monkeypatch):
+    """Substitui o grafo (que chama o LLM) por um que conta as execuções"""
+    calls = []
+
+    class Graph:
+        def invoke(self, state, config):
+            calls.append(state["user_input"])
+            return {"final_answer": f"resposta {len(calls)}"}
+
+    module = types.ModuleType("services.graph.graph")
+    module.graph = Graph()
+    monkeypatch.setitem(sys.modules, "services.graph.graph", module)
+    bot_answer_cache.clear()
+    response_cache.clear()
+    yield calls
+    bot_answer_cache.clear()
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("O que está vencido?", True),
+        ("Quais itens estão com estoque baixo", True),
+        ("Adicione 2kg de farinha", False),
+        ("Usei 3 ovos hoje, pode registrar?", False),
+        ("E quanto custa isso?", False),
+        ("Oi", False),
+    ]
+)
+def test_is_cacheable_question(message, expected):
+    assert is_cacheable_question(message) is expected
+
+
+def test_exact_and_similar_lookup():
+    cache = SemanticCache(min_similarity=0.8)
+    stamp = ((1, 0, 0), "2026-01-01")
+    cache.set("O que está vencido?", stamp, "Nada vencido")
+
+    assert cache.get("o que esta vencido", stamp) == "Nada vencido"
+    assert cache.get("O que é que está vencido?", stamp) == "Nada vencido"
+    assert cache.get("O que não está vencido?", stamp) is None
+    assert cache.get("O que está vencido?", ((2, 0, 0), "2026-01-01")) is None
+
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["similar_hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_numbers_must_match():
+    cache = SemanticCache(min_similarity=0.5)
+    stamp = ((0,), "2026-01-01")
+    cache.set("Quais itens vencem em 7 dias?", stamp, "Leite")
+
+    assert cache.get("Quais itens vencem em 30 dias?", stamp) is None
+
+
+@pytest.mark.parametrize(
+    "cached, asked",
+    [
+        ("quanto tenho de farinha?", "quanto tenho de farinha de trigo?"),
+        ("quais itens vencem esta semana?", "quais itens venceram esta semana?"),
+    ]
+)
+def test_different_content_words_do_not_match(cached, asked):
+    cache = SemanticCache()
+    stamp = ((0,), "2026-01-01")
+    cache.set(cached, stamp, "resposta")
+
+    assert cache.get(asked, stamp) is None
+    assert cache.get(cached.upper(), stamp) == "resposta"
+
+
+def test_run_graph_uses_cache_until_a_write(fake_graph):
+    from controllers.bot import run_graph
+
+    first, _ = asyncio.run(run_graph("O que está vencido?", "t1"))
+    second, _ = asyncio.run(run_graph("o que esta vencido", "t2"))
+    assert first == second == "resposta 1"
+
+    invalidate_tables("Item")
+    third, _ = asyncio.run(run_graph("O que está vencido?", "t1"))
+    assert third == "resposta 2"
+
+    asyncio.run(run_graph("Adicione 2kg de farinha", "t1"))
+    asyncio.run(run_graph("Adicione 2kg de farinha", "t1"))
+    assert len(fake_graph) == 4
+
+
+def test_track_writes_invalidates_on_commit_only():
+    engine = create_engine("sqlite://")
+    track_writes(engine)
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE "Item" (id INTEGER)'))
+
+    before = response_cache.versions.snapshot(("Item",))
+    with engine.connect() as conn:
+        conn.execute(text('INSERT INTO "Item" (id) VALUES (1)'))
+        conn.rollback()
+    assert response_cache.versions.snapshot(("Item",)) == before
+
+    with engine.begin() as conn:
+        conn.execute(text('UPDATE "Item" SET id = 2'))
+    assert response_cache.versions.snapshot(("Item",)) != before
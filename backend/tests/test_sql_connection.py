@@ -4,3 +4,86 @@ from sqlalchemy import text
 def test_connection():
     db = next(get_db())
     assert db.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_instrumented_pool_metrics(tmp_path):
+    from sqlalchemy import create_engine, exc
+    from database.pool import InstrumentedQueuePool, pool_usage
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.1
+    )
+
+    first = engine.connect()
+    second = engine.connect()
+    try:
+        engine.connect()
+        assert False, "o pool deveria estar esgotado"
+    except exc.TimeoutError:
+        pass
+
+    usage = pool_usage(engine)
+    assert usage["checked_out"] == 2
+    assert usage["checkouts"] == 2
+    assert usage["overflow_checkouts"] == 1
+    assert usage["timeouts"] == 1
+
+    # Cada engine tem as próprias métricas
+    other = create_engine(f"sqlite:///{tmp_path / 'other.db'}", poolclass=InstrumentedQueuePool)
+    assert pool_usage(other)["checkouts"] == 0
+    assert usage["max_overflow"] == 1
+
+    first.close()
+    second.close()
+    engine.dispose()
+    other.dispose()
+
+
+def test_migrations_create_hot_path_indexes(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from database.database import Base
+    from database.migrations import run_migrations, rollback_migration, MIGRATIONS
+    import models
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+    assert rollback_migration(engine) == "0002_hot_path_indexes"
+    assert "ix_transaction_item_id_create_at" not in {i["name"] for i in inspect(engine).get_indexes("Transaction")}
+
+    assert run_migrations(engine) == ["0002_hot_path_indexes"]
+    indexes = {i["name"] for i in inspect(engine).get_indexes("Transaction")}
+    assert {"ix_transaction_item_id_create_at", "ix_transaction_create_at_id", "ix_transaction_order_type_create_at"} <= indexes
+    assert "ix_item_expiration_date" in {i["name"] for i in inspect(engine).get_indexes("Item")}
+    engine.dispose()
+
+
+def test_hot_path_indexes_are_built_concurrently_on_postgres():
+    from sqlalchemy.dialects import postgresql
+    from database.migrations import NON_TRANSACTIONAL_MIGRATIONS, _create_hot_path_indexes, _drop_hot_path_indexes
+    import models
+
+    class RecordingConnection:
+        dialect = postgresql.dialect()
+
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, statement, params=None):
+            self.statements.append(str(statement))
+            return type("Result", (), {"first": lambda self: None})()
+
+    connection = RecordingConnection()
+    _create_hot_path_indexes(connection)
+    _drop_hot_path_indexes(connection)
+
+    assert "0002_hot_path_indexes" in NON_TRANSACTIONAL_MIGRATIONS
+    creates = [s for s in connection.statements if s.startswith("CREATE INDEX")]
+    drops = [s for s in connection.statements if s.startswith("DROP INDEX")]
+    assert creates and all(s.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS") for s in creates)
+    assert drops and all(s.startswith("DROP INDEX CONCURRENTLY IF EXISTS") for s in drops)
+    assert 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_transaction_item_id_create_at ON "Transaction" (item_id, create_at, id)' in creates
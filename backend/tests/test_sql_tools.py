@@ -0,0 +1,47 @@
+from decimal import Decimal
+import pytest
+from conftest import db_session
+from models import Item, Recipe
+from services.graph.tools import sql as sql_tools
+
+
+@pytest.fixture
+def tools_db(db_session, monkeypatch):
+    monkeypatch.setattr(sql_tools, "SessionLocal", lambda: db_session)
+    db_session.add_all([
+        Item(name="Farinha de Trigo", measure_unity="kg", amount=Decimal("2"), price=Decimal("5"), price_unit="kg"),
+        Recipe(title="Pão de Mel", steps="Assar"),
+        Recipe(title="Bolo de Cenoura", steps="Misturar")
+    ])
+    db_session.commit()
+    return db_session
+
+
+def test_resolve_by_name_only_accepts_similar_names_when_allowed():
+    candidates = [Item(name="Farinha de Trigo")]
+
+    assert sql_tools.resolve_by_name(candidates, "farinha de rosca") is candidates[0]
+    assert sql_tools.resolve_by_name(candidates, "farinha de rosca", allow_similar=False) is None
+    assert sql_tools.resolve_by_name(candidates, "farinha", allow_similar=False) is candidates[0]
+
+
+def test_delete_and_update_item_refuse_similar_only_match(tools_db):
+    deleted = sql_tools.delete_item_tool.func("farinha de rosca")
+    updated = sql_tools.update_item_tool.func("farinha de rosca", new_amount=1)
+
+    assert deleted["success"] is False and updated["success"] is False
+    assert "Farinha de Trigo" in deleted["message"]
+    assert tools_db.query(Item).one().amount == Decimal("2")
+
+
+def test_delete_and_update_recipe_refuse_similar_only_match(tools_db):
+    assert "Pão de Mel" in sql_tools.delete_recipe_tool.func("pão de queijo")
+    assert "Bolo de Cenoura" in sql_tools.update_recipe_tool.func("bolo de fubá", new_steps="Outro preparo")
+
+    recipes = {recipe.title: recipe.steps for recipe in tools_db.query(Recipe)}
+    assert recipes == {"Pão de Mel": "Assar", "Bolo de Cenoura": "Misturar"}
+
+
+def test_delete_recipe_by_full_title(tools_db):
+    assert sql_tools.delete_recipe_tool.func("pao de mel").startswith("Sucesso!")
+    assert [recipe.title for recipe in tools_db.query(Recipe)] == ["Bolo de Cenoura"]
@@ -1,6 +1,14 @@
 import pytest
 from decimal import Decimal
-from utils.unit_converter import calculate_unit_price, get_conversion_factor
+from utils.unit_converter import (
+    calculate_unit_price,
+    calculate_unit_prices,
+    calculate_item_total_value,
+    calculate_item_total_values_float,
+    conversion_factor_expression,
+    get_conversion_factor
+)
+from utils.unit_registry import UNIT_REGISTRY, UnitRegistry
 
 
 def test_calculate_unit_price_kg_to_grams():
@@ -71,3 +79,86 @@ def test_calculate_unit_price_parametrized(price, price_unit, target_unit, expec
     
     assert result == expected
 
+
+
+def test_calculate_item_total_values_float():
+    """Testa o caminho vetorizado em float."""
+    values = calculate_item_total_values_float(
+        [500, 250.0, Decimal('24')],
+        [10, 8.0, Decimal('6.00')],
+        ['grama', 'mililitro', 'unidade'],
+        ['kg', 'litro', 'duzia']
+    )
+
+    assert values.tolist() == pytest.approx([5.0, 2.0, 12.0])
+
+
+def test_calculate_unit_prices_batch():
+    """Testa a conversão de preços em lote, incluindo unidades ausentes."""
+    result = calculate_unit_prices(
+        [Decimal('10.00'), 5.00, Decimal('12.00'), Decimal('5.00')],
+        ['quilograma', 'litro', 'duzia', None],
+        ['grama', 'mililitro', 'unidade', None]
+    )
+
+    assert result == [Decimal('0.01'), Decimal('0.005'), Decimal('1.00'), Decimal('5.00')]
+
+
+@pytest.mark.parametrize(
+    "measure_unity,price_unit,expected",
+    [
+        ('g', 'quilograma', Decimal('1000')),
+        ('KG', 'grama', Decimal('0.001')),
+        ('grama', 'tonelada', Decimal('1000000')),
+        ('ml', 'l', Decimal('1000')),
+        ('un', 'dúzia', Decimal('12')),
+        ('grama', 'litro', Decimal('1')),
+    ]
+)
+def test_get_conversion_factor_aliases_and_transitive(measure_unity, price_unit, expected):
+    """Testa apelidos de unidades e conversões transitivas dentro da mesma dimensão."""
+    assert get_conversion_factor(measure_unity, price_unit) == expected
+
+
+def test_unit_registry_codes():
+    """Testa se apelidos resolvem para o mesmo código e unidades desconhecidas para UNKNOWN."""
+    assert UNIT_REGISTRY.code('kg') == UNIT_REGISTRY.code(' Quilograma ')
+    assert UNIT_REGISTRY.code('ml') == UNIT_REGISTRY.code('mililitro')
+    assert UNIT_REGISTRY.code('xícara') == UnitRegistry.UNKNOWN
+    assert UNIT_REGISTRY.code(None) == UnitRegistry.UNKNOWN
+    assert UNIT_REGISTRY.factor(UNIT_REGISTRY.code('grama'), UNIT_REGISTRY.code('kg')) == Decimal('1000')
+
+
+def test_unit_registry_only_caches_known_spellings():
+    """Testa se texto livre não reconhecido não cresce o cache de grafias."""
+    registry = UnitRegistry({"grama": ("massa", Decimal('1'))}, {"grama": ["g", "grama"]})
+    for index in range(100):
+        assert registry.code(f"unidade estranha {index}") == UnitRegistry.UNKNOWN
+    assert registry.code(" Grama ") == registry.code("g")
+    assert len(registry._codes) == 3
+
+
+@pytest.mark.parametrize(
+    "measure_unity,price_unit",
+    [(' Kg ', 'grama'), ('g', 'Quilográma'), ('un', 'dúzias'), ('mililitro ', ' litro'), ('xícara', 'kg')]
+)
+def test_conversion_factor_expression_matches_python(measure_unity, price_unit):
+    """Testa se o CASE em SQL normaliza as unidades como o registro em Python."""
+    from sqlalchemy import create_engine, select, literal
+
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        factor = connection.execute(select(conversion_factor_expression(literal(measure_unity), literal(price_unit)))).scalar()
+
+    assert Decimal(str(factor)) == get_conversion_factor(measure_unity, price_unit)
+
+
+def test_conversion_factor_expression_folds_accents_on_postgres():
+    """Testa se no Postgres a normalização usa lower/trim/translate, sem função registrada."""
+    from sqlalchemy import column
+    from sqlalchemy.dialects import postgresql
+
+    sql = str(conversion_factor_expression(column("measure_unity"), column("price_unit")).compile(dialect=postgresql.dialect()))
+
+    assert "translate(lower(trim(measure_unity)), 'áàâãäåéèêëíìîïóòôõöúùûüçñý', 'aaaaaaeeeeiiiiooooouuuucny')" in sql
+    assert "normalize_unit_name" not in sql
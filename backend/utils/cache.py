@@ -0,0 +1,199 @@
+import os
+import re
+import time
+import inspect
+import functools
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+from sqlalchemy import event
+
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+
+
+class TableVersions:
+    """Contadores de versão por tabela, incrementados a cada escrita"""
+
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        """Incrementa a versão das tabelas informadas"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, tables: Iterable[str]) -> tuple:
+        """Versões atuais das tabelas, na ordem informada"""
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def as_dict(self) -> dict:
+        return dict(self._versions)
+
+
+class ResponseCache:
+    """
+    Cache em memória com expiração por tempo (TTL) e descarte do item menos
+    usado recentemente (LRU) quando atinge o limite de entradas.
+
+    Cada entrada guarda as tabelas das quais depende; a chave inclui a versão
+    dessas tabelas no momento da leitura, então um resultado calculado antes de
+    uma escrita nunca é servido depois dela.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.versions = TableVersions()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self._endpoints = {}
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _endpoint_metrics(self, name: str) -> dict:
+        return self._endpoints.setdefault(name, {"hits": 0, "misses": 0})
+
+    def get(self, name: str, key: tuple):
+        """Retorna (True, valor) se a chave estiver no cache e válida, senão (False, None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            metrics = self._endpoint_metrics(name)
+            if entry is None:
+                metrics["misses"] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            metrics["hits"] += 1
+            return True, entry[2]
+
+    def set(self, key: tuple, value, tables: tuple) -> None:
+        """Guarda um valor, descartando as entradas menos usadas se passar do limite"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tables, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tables: str) -> None:
+        """Incrementa a versão das tabelas e remove as entradas que dependem delas"""
+        self.versions.bump(*tables)
+        with self._lock:
+            stale = [
+                key for key, (_, entry_tables, _) in self._entries.items()
+                if any(table in entry_tables for table in tables)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera as métricas"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_metrics()
+
+    def stats(self) -> dict:
+        """Métricas de uso do cache"""
+        with self._lock:
+            hits = sum(m["hits"] for m in self._endpoints.values())
+            misses = sum(m["misses"] for m in self._endpoints.values())
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "table_versions": self.versions.as_dict(),
+                "endpoints": {name: dict(m) for name, m in sorted(self._endpoints.items())}
+            }
+
+
+response_cache = ResponseCache()
+# Custos calculados por receita, com a chave formada pelos dados dos ingredientes (não depende de invalidação)
+recipe_cost_cache = ResponseCache()
+
+
+def invalidate_tables(*tables: str) -> None:
+    """Invalida as respostas em cache que dependem das tabelas informadas"""
+    response_cache.invalidate(*tables)
+
+
+# Tabela alvo de um INSERT/UPDATE/DELETE
+WRITE_STATEMENT = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE)
+
+
+def track_writes(engine) -> None:
+    """
+    Invalida o cache também para escritas feitas fora dos repositórios (ex: SQL
+    executado pelos agentes). As tabelas alteradas são anotadas na conexão e só
+    invalidadas quando a transação é confirmada; um rollback as descarta.
+    """
+    @event.listens_for(engine, "after_cursor_execute")
+    def collect_written_table(conn, cursor, statement, parameters, context, executemany):
+        match = WRITE_STATEMENT.match(statement)
+        if match:
+            conn.info.setdefault("written_tables", set()).add(match.group(1))
+
+    @event.listens_for(engine, "commit")
+    def invalidate_written_tables(conn):
+        tables = conn.info.pop("written_tables", None)
+        if tables:
+            invalidate_tables(*tables)
+
+    @event.listens_for(engine, "rollback")
+    def discard_written_tables(conn):
+        conn.info.pop("written_tables", None)
+
+
+def cached(name: str, tables: tuple, key: Callable = None):
+    """
+    Decorator que guarda o retorno de um método de controller no cache de respostas.
+
+    Args:
+        name: Nome do endpoint (usado na chave e nas métricas)
+        tables: Tabelas cujas escritas invalidam o resultado
+        key: Função opcional que recebe os argumentos (sem a sessão) e
+             devolve a parte da chave referente a eles
+
+    O argumento `db` é ignorado na chave; os demais são combinados com
+    as versões das tabelas.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k != "db"}
+            params = key(arguments) if key is not None else tuple(sorted(arguments.items()))
+
+            cache_key = (name, params, response_cache.versions.snapshot(tables))
+            found, value = response_cache.get(name, cache_key)
+            if found:
+                return value
+
+            value = func(*args, **kwargs)
+            response_cache.set(cache_key, value, tables)
+            return value
+
+        return wrapper
+
+    return decorator
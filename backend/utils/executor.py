@@ -0,0 +1,85 @@
+import os
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+GRAPH_MAX_WORKERS = int(os.getenv("GRAPH_MAX_WORKERS", "8"))
+# Chamadas que podem esperar na fila por uma thread livre antes de recusar novas
+GRAPH_MAX_PENDING = int(os.getenv("GRAPH_MAX_PENDING", "16"))
+
+
+class ExecutorBusy(Exception):
+    """Executor sem vaga: todas as threads ocupadas e a fila de espera cheia"""
+
+
+class BoundedExecutor:
+    """
+    Pool de threads dedicado para chamadas bloqueantes longas (grafo e extratores).
+
+    run_in_threadpool usa o mesmo limite de threads das rotas síncronas e das
+    dependências get_db, então chats em andamento atrasam o CRUD. Este pool tem
+    threads próprias e uma fila limitada: passando de max_workers + max_pending
+    chamadas, run recusa na hora com ExecutorBusy em vez de enfileirar sem fim.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, name: str = "executor"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    async def run(self, func, *args, **kwargs):
+        """Executa func(*args, **kwargs) em uma thread do pool e espera o resultado sem bloquear o loop"""
+        return await self.submit(func, *args, **kwargs)
+
+    def submit(self, func, *args, **kwargs) -> asyncio.Future:
+        """Agenda func(*args, **kwargs) no pool; recusa na hora com ExecutorBusy se não houver vaga"""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy()
+            self.submitted += 1
+
+        future = self._executor.submit(self._call, partial(func, *args, **kwargs))
+        # A vaga só é liberada quando a thread termina, mesmo se quem esperava for cancelado
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    def _call(self, func):
+        with self._lock:
+            self.running += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self.completed += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "running": self.running,
+                "pending": self.in_flight - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+graph_executor = BoundedExecutor(GRAPH_MAX_WORKERS, GRAPH_MAX_PENDING, name="graph")
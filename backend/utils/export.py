@@ -0,0 +1,54 @@
+import io
+import csv
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, Sequence
+
+
+def _plain_value(value):
+    """Converte valores do banco para tipos que JSON e CSV entendem"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunks(batches: Iterable[Sequence], columns: Sequence[str]) -> Iterator[bytes]:
+    """Gera um bloco NDJSON (um objeto JSON por linha) para cada lote de linhas"""
+    for batch in batches:
+        yield "".join(
+            json.dumps(
+                {column: _plain_value(value) for column, value in zip(columns, row)},
+                ensure_ascii=False
+            ) + "\n"
+            for row in batch
+        ).encode()
+
+
+def csv_chunks(batches: Iterable[Sequence], columns: Sequence[str]) -> Iterator[bytes]:
+    """Gera o cabeçalho CSV e depois um bloco de CSV para cada lote de linhas"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([_plain_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Comprime um fluxo de blocos no formato gzip sem acumular o conteúdo em memória"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,215 @@
+import os
+import time
+import uuid
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from utils.executor import ExecutorBusy
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Jobs esperando um worker; passando disso submit recusa com JobQueueFull
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "100"))
+# Tentativas extras quando o pool do chatbot está cheio, com espera dobrando a cada uma
+JOB_BUSY_RETRIES = int(os.getenv("JOB_BUSY_RETRIES", "6"))
+JOB_BUSY_BACKOFF_SECONDS = float(os.getenv("JOB_BUSY_BACKOFF_SECONDS", "0.5"))
+JOB_BUSY_MAX_BACKOFF_SECONDS = 8.0
+# Jobs concluídos ficam disponíveis para consulta por este tempo
+JOB_TTL_SECONDS = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+# Execuções simultâneas por modelo, somando todos os workers
+JOB_MODEL_LIMITS = {
+    "extractor": int(os.getenv("JOB_EXTRACTOR_CONCURRENCY", "2")),
+    "graph": int(os.getenv("JOB_GRAPH_CONCURRENCY", "4")),
+}
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+class JobError(Exception):
+    """Falha esperada de um job (ex: imagem sem conteúdo); a mensagem vai para o cliente"""
+
+
+class JobQueueFull(Exception):
+    """Fila de jobs no limite de JOB_MAX_QUEUED; o cliente deve tentar de novo mais tarde"""
+
+
+async def run_with_backoff(executor, func, *args, retries: int = JOB_BUSY_RETRIES,
+                           backoff_seconds: float = JOB_BUSY_BACKOFF_SECONDS):
+    """
+    Executa func(*args) no `executor` como executor.run, mas quando ele recusa com
+    ExecutorBusy espera (backoff exponencial) e tenta de novo em vez de falhar o job.
+    Depois de `retries` tentativas extras o ExecutorBusy é repassado.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await executor.run(func, *args)
+        except ExecutorBusy:
+            if attempt == retries:
+                raise
+            await asyncio.sleep(min(backoff_seconds * 2 ** attempt, JOB_BUSY_MAX_BACKOFF_SECONDS))
+
+
+class Job:
+    def __init__(self, kind: str, payload: dict):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.payload = payload
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now()
+        self.finished_at = None
+        self.expires_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class InMemoryJobBackend:
+    """
+    Armazenamento dos jobs na memória do processo. Serve para um único worker do
+    uvicorn e para os testes; com vários processos precisa ser trocado por um
+    armazenamento compartilhado com os mesmos métodos (save, get e delete_expired).
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def delete_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.expires_at is not None and job.expires_at < now]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+
+
+class JobQueue:
+    """
+    Fila de jobs do chatbot processada por workers asyncio no loop da aplicação.
+
+    submit registra o job e devolve na hora (ou recusa com JobQueueFull se já houver
+    max_queued jobs esperando); os workers executam o handler do tipo
+    do job, que usa limit(modelo) para respeitar o máximo de chamadas simultâneas
+    de cada modelo. Os workers sobem no primeiro submit dentro do loop em execução
+    (e de novo se o loop mudar, como acontece entre os clientes dos testes).
+    """
+
+    def __init__(self, backend: InMemoryJobBackend = None, workers: int = JOB_WORKERS,
+                 model_limits: dict[str, int] = None, ttl_seconds: float = JOB_TTL_SECONDS,
+                 max_queued: int = JOB_MAX_QUEUED):
+        self.backend = backend or InMemoryJobBackend()
+        self.workers = workers
+        self.max_queued = max_queued
+        self.model_limits = dict(JOB_MODEL_LIMITS if model_limits is None else model_limits)
+        self.ttl_seconds = ttl_seconds
+        self._handlers = {}
+        self._loop = None
+
+    def register(self, kind: str, handler: Callable[[dict], Awaitable[Any]]) -> None:
+        """Define a função assíncrona que executa os jobs do tipo `kind` e retorna o resultado"""
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, payload: dict) -> Job:
+        """Coloca um job na fila e retorna sem esperar a execução"""
+        if kind not in self._handlers:
+            raise ValueError(f"Tipo de job desconhecido: {kind}")
+        self._start()
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull()
+        self.backend.delete_expired()
+        job = Job(kind, payload)
+        self.backend.save(job)
+        self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.backend.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Job | None:
+        """Espera o job terminar por até `timeout` segundos e retorna o job no estado em que estiver"""
+        job = self.backend.get(job_id)
+        if job is None or job.finished or timeout <= 0 or self._loop is not asyncio.get_running_loop():
+            return job
+        async with self._finished:
+            try:
+                await asyncio.wait_for(self._finished.wait_for(lambda: job.finished), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    @asynccontextmanager
+    async def limit(self, model: str):
+        """Reserva uma das execuções simultâneas permitidas para `model`"""
+        async with self._limits[model]:
+            yield
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "queued": self._queue.qsize() if self._loop else 0,
+            "model_limits": self.model_limits
+        }
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._finished = asyncio.Condition()
+        self._limits = {model: asyncio.Semaphore(limit) for model, limit in self.model_limits.items()}
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def _work(self) -> None:
+        while True:
+            job = self.backend.get(await self._queue.get())
+            if job is None:
+                continue
+            job.status = RUNNING
+            self.backend.save(job)
+            try:
+                job.result = await self._handlers[job.kind](job.payload)
+                job.status = DONE
+            except JobError as e:
+                job.error, job.status = str(e), FAILED
+            except Exception as e:
+                job.error, job.status = f"Erro ao processar o job: {e}", FAILED
+            # O conteúdo enviado (base64) não é mais necessário depois da execução
+            job.payload = None
+            job.finished_at = datetime.now()
+            job.expires_at = time.monotonic() + self.ttl_seconds
+            self.backend.save(job)
+            async with self._finished:
+                self._finished.notify_all()
+
+
+job_queue = JobQueue()
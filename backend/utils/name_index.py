@@ -0,0 +1,157 @@
+import os
+import time
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Iterable
+
+NAME_INDEX_MAX_AGE_SECONDS = float(os.getenv("NAME_INDEX_MAX_AGE_SECONDS", "300"))
+# Similaridade mínima entre trigramas para um nome entrar como candidato (mesmo padrão do pg_trgm)
+MIN_SIMILARITY = 0.3
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços simples (ex: ' Açúcar  Mascavo' -> 'acucar mascavo')"""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(folded.split())
+
+
+def trigrams(folded: str) -> set[str]:
+    """Trigramas de cada palavra, com dois espaços antes e um depois (como no pg_trgm)"""
+    grams = set()
+    for word in folded.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """
+    Índice em memória de nomes por trigramas, para buscas aproximadas sem ir ao banco.
+
+    Guarda para cada chave (ID) o nome original, o nome normalizado e um valor
+    extra opcional (ex: a unidade de medida). A busca ranqueia os candidatos
+    por: nome igual > começa com o termo > contém o termo > similaridade de
+    trigramas, desempatando pelo nome mais curto e depois pela chave, então o
+    resultado é sempre o mesmo para o mesmo conteúdo.
+
+    O índice é montado por completo na primeira busca (ou quando passa de
+    `max_age` segundos, para acompanhar escritas feitas por outros processos)
+    e atualizado incrementalmente pelas escritas deste processo.
+    """
+
+    def __init__(self, max_age: float = NAME_INDEX_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Descarta o conteúdo; a próxima busca reconstrói o índice"""
+        with self._lock:
+            self._entries = {}
+            self._postings = defaultdict(set)
+            self._built_at = None
+
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at > self.max_age
+
+    def build(self, rows: Iterable[tuple]) -> None:
+        """Reconstrói o índice a partir de linhas (chave, nome, extra)"""
+        with self._lock:
+            self.clear()
+            for key, name, extra in rows:
+                self._add(key, name, extra)
+            self._built_at = time.monotonic()
+
+    def upsert(self, key, name: str, extra=None) -> None:
+        """Inclui ou atualiza um nome (ignorado enquanto o índice não foi montado)"""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._remove(key)
+            self._add(key, name, extra)
+
+    def remove(self, key) -> None:
+        """Remove uma chave do índice"""
+        with self._lock:
+            self._remove(key)
+
+    def _add(self, key, name: str, extra) -> None:
+        folded = fold_text(name)
+        grams = trigrams(folded)
+        self._entries[key] = (name, folded, extra, grams)
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def _remove(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in entry[3]:
+            self._postings[gram].discard(key)
+
+    def search(self, term: str, limit: int = 10, extra=None) -> list[dict]:
+        """
+        Retorna até `limit` candidatos ranqueados para o termo buscado.
+
+        Args:
+            term: Nome ou parte do nome (acentos e maiúsculas são ignorados)
+            limit: Quantidade máxima de candidatos
+            extra: Se informado, considera só as entradas com esse valor extra
+                   (comparado sem acentos e sem diferenciar maiúsculas)
+        """
+        query = fold_text(term)
+        if not query:
+            return []
+        query_grams = trigrams(query)
+        extra_filter = fold_text(extra) if extra else None
+
+        with self._lock:
+            shared = defaultdict(int)
+            for gram in query_grams:
+                for key in self._postings.get(gram, ()):
+                    shared[key] += 1
+
+            # Termos muito curtos não têm trigramas internos; a busca por trecho percorre os nomes
+            if len(query) < 3:
+                for key, (_, folded, _, _) in self._entries.items():
+                    if query in folded:
+                        shared.setdefault(key, 0)
+
+            matches = []
+            for key, count in shared.items():
+                name, folded, entry_extra, grams = self._entries[key]
+                if extra_filter is not None and fold_text(entry_extra or "") != extra_filter:
+                    continue
+
+                similarity = count / (len(query_grams) + len(grams) - count)
+                if folded == query:
+                    score = 3.0
+                elif folded.startswith(query):
+                    score = 2.0 + similarity
+                elif query in folded:
+                    score = 1.0 + similarity
+                elif similarity >= MIN_SIMILARITY:
+                    score = similarity
+                else:
+                    continue
+
+                matches.append({
+                    "id": key,
+                    "name": name,
+                    "extra": entry_extra,
+                    "score": round(score, 4),
+                    "exact": folded == query
+                })
+
+        # Semelhança por trigramas só entra quando nenhum nome contém o termo (ex: erro de digitação)
+        if any(m["score"] >= 1.0 for m in matches):
+            matches = [m for m in matches if m["score"] >= 1.0]
+
+        matches.sort(key=lambda m: (-m["score"], len(m["name"]), m["id"]))
+        return matches[:limit]
+
+
+item_name_index = NameIndex()
+recipe_title_index = NameIndex()
@@ -0,0 +1,87 @@
+from typing import Sequence
+import numpy as np
+
+
+class RecipeMatrix:
+    """
+    Receitas x itens em forma de matriz, para cálculos vetorizados.
+
+    requirements[r, i] é a quantidade do item i (na unidade de medida do item)
+    usada por uma vez da receita r. stock e unit_prices seguem a mesma ordem
+    de colunas que item_ids.
+    """
+
+    def __init__(self, recipes: Sequence[tuple], items: Sequence[tuple], recipe_items: Sequence[tuple]):
+        """
+        Args:
+            recipes: (id, título) de cada receita, em ordem crescente de ID
+            items: (id, nome, unidade de medida, estoque, preço por unidade de medida) de cada item,
+                   em ordem crescente de ID
+            recipe_items: (id da receita, id do item, quantidade) de cada ingrediente
+        """
+        self.recipe_ids = np.array([row[0] for row in recipes], dtype=np.int64)
+        self.recipe_titles = [row[1] for row in recipes]
+        self.item_ids = np.array([row[0] for row in items], dtype=np.int64)
+        self.item_names = [row[1] for row in items]
+        self.measure_unities = [row[2] for row in items]
+        self.stock = np.array([row[3] for row in items], dtype=np.float64)
+        self.unit_prices = np.array([row[4] for row in items], dtype=np.float64)
+
+        self.requirements = np.zeros((len(self.recipe_ids), len(self.item_ids)), dtype=np.float64)
+        if len(recipe_items):
+            links = np.array([(row[0], row[1]) for row in recipe_items], dtype=np.int64)
+            rows = np.searchsorted(self.recipe_ids, links[:, 0])
+            columns = np.searchsorted(self.item_ids, links[:, 1])
+            self.requirements[rows, columns] = np.array([row[2] for row in recipe_items], dtype=np.float64)
+
+
+def max_batches(requirements: np.ndarray, stock: np.ndarray) -> np.ndarray:
+    """
+    Quantas vezes cada receita pode ser feita sozinha com o estoque.
+
+    É o menor floor(estoque / quantidade) entre os ingredientes da receita,
+    calculado para todas as receitas de uma vez. Receitas sem ingredientes
+    retornam -1 (não há limite).
+    """
+    # A matriz é esparsa (poucos ingredientes por receita): só as entradas usadas entram na conta
+    rows, columns = np.nonzero(requirements > 0)
+    limits = np.full(requirements.shape[0], np.inf)
+    np.minimum.at(limits, rows, np.maximum(stock[columns], 0.0) / requirements[rows, columns])
+    # Tolerância para quantidades decimais que deveriam dividir exato (ex: 0.3 / 0.1)
+    batches = np.floor(limits + 1e-9)
+    return np.where(np.isinf(batches), -1, batches).astype(np.int64)
+
+
+def max_batches_by_recipe(matrix: RecipeMatrix) -> dict[int, int | None]:
+    """
+    max_batches de cada receita da matriz pelo ID, com None para receitas sem
+    ingredientes. É o cálculo usado por /recipes/availability e /recipes/max-batches.
+    """
+    batches = max_batches(matrix.requirements, matrix.stock)
+    return {int(recipe_id): int(count) if count >= 0 else None for recipe_id, count in zip(matrix.recipe_ids, batches)}
+
+
+def is_feasible(batches: int | None) -> bool:
+    """
+    Receita viável: dá para fazer ao menos uma vez (max_batches >= 1). Receitas sem
+    ingredientes (max_batches None) não têm limite e contam como viáveis.
+    """
+    return batches is None or batches >= 1
+
+
+def shopping_list(requirements: np.ndarray, stock: np.ndarray, unit_prices: np.ndarray,
+                  batches: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compra mais barata para produzir um plano (quantidade de vezes de cada receita).
+
+    Com o plano fixo, a demanda de cada item é batches @ requirements e qualquer
+    compra viável precisa cobrir o déficit (demanda - estoque). Comprar só o
+    déficit é então a solução ótima do programa linear e sai direto de uma
+    multiplicação de matrizes, sem solver.
+
+    Returns:
+        (demanda, quantidade a comprar, custo da compra) por item
+    """
+    demand = np.asarray(batches, dtype=np.float64) @ requirements
+    to_buy = np.maximum(demand - np.maximum(stock, 0.0), 0.0)
+    return demand, to_buy, to_buy * unit_prices
@@ -0,0 +1,160 @@
+import os
+import re
+import time
+import zlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from utils.name_index import fold_text, trigrams
+
+SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "600"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "256"))
+# Similaridade de cosseno mínima para reaproveitar a resposta de uma pergunta parecida
+SEMANTIC_CACHE_MIN_SIMILARITY = float(os.getenv("SEMANTIC_CACHE_MIN_SIMILARITY", "0.9"))
+EMBEDDING_DIMENSIONS = 1024
+
+# Pedidos de escrita (cadastrar, registrar uso, remover...) nunca são respondidos pelo cache
+WRITE_WORDS = re.compile(
+    r"\b(adicion|cadastr|registr|inclu|insir|remov|exclu|delet|apag|atualiz|alter|edit|troc|salv|"
+    r"comprei|compramos|usei|usamos|gastei|gastamos|vendi|vendemos|consumi|consumimos|perdi|perdemos|"
+    r"descart|joguei|crie|criar|cria)"
+)
+# Perguntas que dependem da conversa anterior ("e dele?", "quanto custa isso?")
+CONTEXT_WORDS = {"dele", "dela", "deles", "delas", "disso", "desse", "dessa", "deste", "desta", "nisso",
+                 "isso", "esse", "essa", "aquilo", "ele", "ela", "eles", "elas", "mesmo", "mesma"}
+QUESTION_WORDS = ("o que", "oque", "qual", "quais", "quanto", "quantos", "quantas", "quando", "onde",
+                  "como", "tem ", "temos", "existe", "consigo", "posso", "da pra", "lista", "liste", "mostre")
+# Palavras sem conteúdo próprio (artigos, preposições, conectivos); todas as demais precisam coincidir
+STOP_WORDS = {"o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das", "em", "no", "na",
+              "nos", "nas", "por", "pelo", "pela", "pelos", "pelas", "para", "pra", "com", "que", "e", "ou", "eu", "me"}
+
+
+def normalize_question(text: str) -> str:
+    """Pergunta sem acentos, em minúsculas, sem pontuação e com espaços simples"""
+    return " ".join(re.sub(r"[^\w\s]", " ", fold_text(text)).split())
+
+
+def is_cacheable_question(text: str) -> bool:
+    """
+    Se a mensagem é uma pergunta somente leitura e independente da conversa,
+    que pode ser respondida a partir do cache.
+    """
+    question = normalize_question(text)
+    words = question.split()
+    # Começar com "e" ("e o leite?") também indica continuação da conversa
+    if len(words) < 2 or words[0] == "e" or WRITE_WORDS.search(question) or CONTEXT_WORDS.intersection(words):
+        return False
+    return text.strip().endswith("?") or question.startswith(QUESTION_WORDS)
+
+
+def embed(question: str) -> np.ndarray:
+    """
+    Vetor normalizado da pergunta: contagem dos trigramas de caracteres, espalhados
+    em EMBEDDING_DIMENSIONS posições por hash (crc32, estável entre processos).
+    """
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float64)
+    for gram in trigrams(question):
+        vector[zlib.crc32(gram.encode()) % EMBEDDING_DIMENSIONS] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def question_guards(question: str) -> frozenset:
+    """
+    Palavras de conteúdo da pergunta, que precisam ser as mesmas para duas perguntas
+    parecidas terem a mesma resposta. Só artigos, preposições e conectivos podem mudar:
+    item ("farinha" x "farinha de trigo"), tempo verbal ("vencem" x "venceram"), números
+    e negação diferentes fazem a busca por similaridade falhar.
+    """
+    return frozenset(word for word in question.split() if word not in STOP_WORDS)
+
+
+class SemanticCache:
+    """
+    Cache das respostas do chatbot para perguntas somente leitura.
+
+    Cada entrada é guardada com um carimbo (versões das tabelas e data do dia) e
+    só é encontrada com o mesmo carimbo; uma escrita em qualquer tabela muda o
+    carimbo e torna as respostas anteriores inalcançáveis. A busca tenta primeiro
+    a pergunta normalizada exata e depois a mais parecida por similaridade de
+    cosseno entre os vetores de trigramas, desde que as palavras de conteúdo
+    sejam as mesmas (question_guards).
+    """
+
+    def __init__(self, max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES, ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+                 min_similarity: float = SEMANTIC_CACHE_MIN_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def get(self, text: str, stamp: tuple) -> str | None:
+        """Resposta guardada para a pergunta (ou uma equivalente) com o mesmo carimbo"""
+        question = normalize_question(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((question, stamp))
+            if entry is not None and entry[0] >= now:
+                self._entries.move_to_end((question, stamp))
+                self.exact_hits += 1
+                return entry[3]
+
+            guards = question_guards(question)
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if key[1] == stamp and entry[0] >= now and entry[2] == guards
+            ]
+            if candidates:
+                similarities = np.stack([entry[1] for _, entry in candidates]) @ embed(question)
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.min_similarity:
+                    key, entry = candidates[best]
+                    self._entries.move_to_end(key)
+                    self.similar_hits += 1
+                    return entry[3]
+
+            self.misses += 1
+            return None
+
+    def set(self, text: str, stamp: tuple, answer: str) -> None:
+        """Guarda a resposta, descartando as entradas vencidas ou menos usadas se passar do limite"""
+        question = normalize_question(text)
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] < now or key[1] != stamp]:
+                del self._entries[key]
+            self._entries[(question, stamp)] = (now + self.ttl_seconds, embed(question), question_guards(question), answer)
+            self._entries.move_to_end((question, stamp))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera as métricas"""
+        with self._lock:
+            self._entries.clear()
+            self._reset_metrics()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "min_similarity": self.min_similarity,
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / (hits + self.misses) if hits + self.misses else 0.0
+            }
+
+
+bot_answer_cache = SemanticCache()
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Sequence
+
+from utils.semantic_cache import normalize_question
+
+
+def tokenize(text: str) -> list[str]:
+    """Palavras normalizadas (sem acentos e pontuação) e pares de palavras vizinhas"""
+    words = normalize_question(text).split()
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class TfidfLogisticClassifier:
+    """
+    Classificador de textos curtos: vetores TF-IDF (palavras e pares de palavras)
+    e regressão logística multinomial treinada por gradiente descendente, só com numpy.
+
+    predict_proba devolve a probabilidade de cada rótulo, que serve de confiança
+    para decidir se a previsão pode ser usada sem consultar o LLM.
+    """
+
+    def __init__(self, vocabulary: dict[str, int], idf: np.ndarray, weights: np.ndarray,
+                 bias: np.ndarray, labels: list[str]):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.bias = bias
+        self.labels = labels
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Matriz TF-IDF (uma linha normalizada por texto)"""
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    matrix[row, column] += 1.0
+        matrix = np.log1p(matrix) * self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms > 0, norms, 1.0)
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return _softmax(self.transform(texts) @ self.weights + self.bias)
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Rótulo mais provável e sua probabilidade"""
+        probabilities = self.predict_proba([text])[0]
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str], epochs: int = 300,
+              learning_rate: float = 1.0, l2: float = 1e-3, min_count: int = 1) -> "TfidfLogisticClassifier":
+        """
+        Treina o classificador.
+
+        Args:
+            texts: Mensagens de treino
+            labels: Rótulo de cada mensagem
+            epochs: Iterações do gradiente descendente (em lote completo, resultado determinístico)
+            learning_rate: Passo do gradiente
+            l2: Peso da regularização L2
+            min_count: Frequência mínima de documentos para um termo entrar no vocabulário
+        """
+        documents = [set(tokenize(text)) for text in texts]
+        frequency = {}
+        for tokens in documents:
+            for token in tokens:
+                frequency[token] = frequency.get(token, 0) + 1
+        terms = sorted(token for token, count in frequency.items() if count >= min_count)
+        vocabulary = {token: index for index, token in enumerate(terms)}
+        idf = np.log((1 + len(texts)) / (1 + np.array([frequency[t] for t in terms], dtype=np.float64))) + 1.0
+
+        classes = sorted(set(labels))
+        targets = np.zeros((len(texts), len(classes)), dtype=np.float64)
+        targets[np.arange(len(texts)), [classes.index(label) for label in labels]] = 1.0
+
+        model = cls(vocabulary, idf, np.zeros((len(terms), len(classes))), np.zeros(len(classes)), classes)
+        features = model.transform(texts)
+        for _ in range(epochs):
+            error = _softmax(features @ model.weights + model.bias) - targets
+            model.weights -= learning_rate * (features.T @ error / len(texts) + l2 * model.weights)
+            model.bias -= learning_rate * error.mean(axis=0)
+        return model
+
+    def save(self, path) -> None:
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        np.savez(path, terms=np.array(terms, dtype=str), idf=self.idf, weights=self.weights,
+                 bias=self.bias, labels=np.array(self.labels, dtype=str))
+
+    @classmethod
+    def load(cls, path) -> "TfidfLogisticClassifier":
+        with np.load(path) as data:
+            terms = [str(term) for term in data["terms"]]
+            return cls({term: index for index, term in enumerate(terms)}, data["idf"], data["weights"],
+                       data["bias"], [str(label) for label in data["labels"]])
+
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
@@ -1,20 +1,13 @@
 from decimal import Decimal
-from typing import Tuple
-
-CONVERSION_MAP = {
-    # De unidade menor para maior: quantas unidades menores cabem na maior
-    ("grama", "kg"): Decimal('1000'),              # 1000 gramas = 1 kg
-    ("grama", "quilograma"): Decimal('1000'),      # 1000 gramas = 1 quilograma
-    ("grama", "grama"): Decimal('1'),              # 1 grama = 1 grama
-    ("mililitro", "litro"): Decimal('1000'),       # 1000 ml = 1 litro
-    ("mililitro", "mililitro"): Decimal('1'),      # 1 ml = 1 ml
-    ("unidade", "unidade"): Decimal('1'),          # 1 unidade = 1 unidade
-    ("unidade", "pacote"): Decimal('1'),           # 1 unidade = 1 pacote
-    ("unidade", "duzia"): Decimal('12'),           # 12 unidades = 1 dúzia
-    ("kg", "kg"): Decimal('1'),                    # 1 kg = 1 kg
-    ("quilograma", "quilograma"): Decimal('1'),    # 1 kg = 1 kg
-    ("litro", "litro"): Decimal('1'),              # 1 litro = 1 litro
-}
+from typing import Sequence
+import sqlite3
+from sqlalchemy import case, func, event, String
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+import numpy as np
+
+from .unit_registry import UNIT_REGISTRY, normalize_unit_name
 
 
 def get_conversion_factor(measure_unity: str, price_unit: str) -> Decimal:
@@ -27,14 +20,110 @@ def get_conversion_factor(measure_unity: str, price_unit: str) -> Decimal:
         price_unit: Unidade do preço (ex: 'kg', 'litro')
 
     Returns:
-        Fator de conversão como Decimal
+        Fator de conversão como Decimal (1 para unidades desconhecidas ou incompatíveis)
+    """
+    return UNIT_REGISTRY.conversion_factor(measure_unity, price_unit)
+
+
+# Letras acentuadas e as mesmas letras sem acento, para o translate() do Postgres
+ACCENTED_LETTERS = "áàâãäåéèêëíìîïóòôõöúùûüçñý"
+UNACCENTED_LETTERS = "aaaaaaeeeeiiiiooooouuuucny"
+
+
+class normalized_unit_expression(FunctionElement):
+    """
+    Equivalente SQL de normalize_unit_name: minúsculas, sem espaços nas pontas e sem acentos.
+    No Postgres vira lower/trim/translate; no SQLite (testes e scripts locais) chama a
+    própria normalize_unit_name, registrada como função em cada conexão.
+    """
+    type = String()
+    name = "normalize_unit_name"
+    inherit_cache = True
+
+
+@compiles(normalized_unit_expression)
+def _compile_normalized_unit(element, compiler, **kw):
+    unit = compiler.process(element.clauses, **kw)
+    return f"translate(lower(trim({unit})), '{ACCENTED_LETTERS}', '{UNACCENTED_LETTERS}')"
+
+
+@compiles(normalized_unit_expression, "sqlite")
+def _compile_normalized_unit_sqlite(element, compiler, **kw):
+    return f"normalize_unit_name({compiler.process(element.clauses, **kw)})"
+
+
+@event.listens_for(Engine, "connect")
+def _register_normalize_unit_name(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection) or "sqlite" in type(dbapi_connection).__module__:
+        dbapi_connection.create_function(
+            "normalize_unit_name", 1, lambda unit: None if unit is None else normalize_unit_name(unit)
+        )
+
+
+def _unit_attribute_expression(unit, values: list):
+    """CASE SQL que traduz a grafia da unidade em um atributo do registro (dimensão ou escala)"""
+    return case(
+        {
+            spelling: values[code]
+            for code, spellings in UNIT_REGISTRY.aliases_by_code().items()
+            for spelling in spellings
+        },
+        value=normalized_unit_expression(unit),
+        else_=None
+    )
+
+
+def conversion_factor_expression(measure_unity, price_unit):
+    """
+    Monta a expressão SQL equivalente a get_conversion_factor, para que a
+    conversão de unidades possa ser agregada diretamente no banco
+
+    Args:
+        measure_unity: Coluna/expressão com a unidade de medida do estoque
+        price_unit: Coluna/expressão com a unidade do preço
+
+    Returns:
+        Expressão CASE com o fator de conversão (1 para pares desconhecidos)
     """
-    key = (measure_unity.lower(), price_unit.lower())
-    factor = CONVERSION_MAP.get(key)
-    if factor is None:
-        return Decimal('1')
+    measure_dimension = _unit_attribute_expression(measure_unity, UNIT_REGISTRY.dimensions)
+    price_dimension = _unit_attribute_expression(price_unit, UNIT_REGISTRY.dimensions)
+    measure_scale = _unit_attribute_expression(measure_unity, UNIT_REGISTRY.scales)
+    price_scale = _unit_attribute_expression(price_unit, UNIT_REGISTRY.scales)
 
-    return factor
+    return case(
+        (measure_dimension == price_dimension, price_scale / measure_scale),
+        else_=Decimal('1')
+    )
+
+
+def apply_unit_codes(item) -> None:
+    """
+    Grava no item os códigos canônicos das unidades e o fator de conversão
+    entre elas, para que o valor em estoque vire aritmética simples no banco
+
+    Args:
+        item: Objeto com measure_unity e price_unit (preço ausente vale 'unidade',
+              o padrão da coluna)
+    """
+    item.measure_code = UNIT_REGISTRY.code(item.measure_unity)
+    item.price_code = UNIT_REGISTRY.code(item.price_unit or 'unidade')
+    item.unit_factor = UNIT_REGISTRY.factor(item.measure_code, item.price_code)
+
+
+def unit_factor_expression(unit_factor, measure_unity, price_unit):
+    """
+    Fator de conversão de um item em SQL: usa o fator gravado na linha e só
+    recalcula a partir das unidades em texto quando ele ainda não foi preenchido
+
+    Args:
+        unit_factor: Coluna com o fator gravado
+        measure_unity: Coluna com a unidade de medida do estoque
+        price_unit: Coluna com a unidade do preço
+
+    Returns:
+        Expressão SQL com o fator de conversão
+    """
+    return func.coalesce(unit_factor, conversion_factor_expression(measure_unity, price_unit))
 
 
 def calculate_item_total_value(amount: Decimal, price: Decimal, measure_unity: str, price_unit: str) -> Decimal:
@@ -54,6 +143,64 @@ def calculate_item_total_value(amount: Decimal, price: Decimal, measure_unity: s
     return (amount / factor) * price
 
 
+def _to_decimal(value) -> Decimal:
+    """Converte um valor numérico para Decimal sem perder a representação textual"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def calculate_item_total_values_float(
+        amounts: Sequence,
+        prices: Sequence,
+        measure_unities: Sequence[str],
+        price_units: Sequence[str]
+) -> np.ndarray:
+    """
+    Versão em lote (vetorizada, em float) de calculate_item_total_value.
+    Indicada para relatórios e ordenações, não para valores monetários persistidos
+    (esses são calculados no banco com unit_factor_expression).
+
+    Args:
+        amounts: Quantidades, uma por linha
+        prices: Preços por unidade de price_unit, um por linha
+        measure_unities: Unidades de medida do estoque, uma por linha
+        price_units: Unidades do preço, uma por linha
+
+    Returns:
+        Array float64 com os valores totais na mesma ordem das entradas
+    """
+    factors = UNIT_REGISTRY.float_factors[
+        np.asarray(UNIT_REGISTRY.codes(measure_unities), dtype=np.intp),
+        np.asarray(UNIT_REGISTRY.codes(price_units), dtype=np.intp)
+    ]
+    return (
+        np.asarray(amounts, dtype=np.float64) / factors
+    ) * np.asarray(prices, dtype=np.float64)
+
+
+def calculate_unit_prices(
+        prices: Sequence,
+        price_units: Sequence[str],
+        target_units: Sequence[str]
+) -> list[Decimal]:
+    """
+    Versão em lote de calculate_unit_price
+
+    Args:
+        prices: Preços na unidade original, um por linha
+        price_units: Unidades originais do preço, uma por linha
+        target_units: Unidades desejadas, uma por linha
+
+    Returns:
+        Lista de preços convertidos (Decimal) na mesma ordem das entradas
+    """
+    return [
+        _to_decimal(price) / _unit_price_factor(price_unit, target_unit)
+        for price, price_unit, target_unit in zip(prices, price_units, target_units)
+    ]
+
+
 def calculate_unit_price(price: Decimal, price_unit: str, target_unit: str) -> Decimal:
     """
     Converte o preço de uma unidade para outra
@@ -73,15 +220,10 @@ def calculate_unit_price(price: Decimal, price_unit: str, target_unit: str) -> D
     if not isinstance(price, Decimal):
         price = Decimal(str(price))
     
-    # Tratar valores None
-    if price_unit is None:
-        price_unit = 'unidade'
-    if target_unit is None:
-        target_unit = 'unidade'
-    
-    # Normalizar unidades
-    price_unit_normalized = 'kg' if price_unit.lower() in ['quilograma', 'kg'] else price_unit.lower()
-    target_unit_normalized = target_unit.lower()
-    
-    factor = get_conversion_factor(target_unit_normalized, price_unit_normalized)
-    return price / factor
\ No newline at end of file
+    return price / _unit_price_factor(price_unit, target_unit)
+
+
+def _unit_price_factor(price_unit: str, target_unit: str) -> Decimal:
+    """Fator pelo qual o preço em price_unit é dividido para obter o preço em target_unit"""
+    # Unidades ausentes são tratadas como 'unidade'
+    return UNIT_REGISTRY.conversion_factor(target_unit or 'unidade', price_unit or 'unidade')
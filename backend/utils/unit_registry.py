@@ -0,0 +1,113 @@
+import unicodedata
+from decimal import Decimal
+from typing import Sequence
+import numpy as np
+
+# Dimensão e tamanho de cada unidade em relação à unidade base da dimensão
+# (grama para massa, mililitro para volume, unidade para contagem)
+UNITS = {
+    "miligrama": ("massa", Decimal('0.001')),
+    "grama": ("massa", Decimal('1')),
+    "kg": ("massa", Decimal('1000')),
+    "tonelada": ("massa", Decimal('1000000')),
+    "mililitro": ("volume", Decimal('1')),
+    "litro": ("volume", Decimal('1000')),
+    "unidade": ("contagem", Decimal('1')),
+    "pacote": ("contagem", Decimal('1')),
+    "duzia": ("contagem", Decimal('12')),
+}
+
+# Grafias aceitas para cada unidade, em minúsculas
+ALIASES = {
+    "miligrama": ["mg", "miligrama", "miligramas"],
+    "grama": ["g", "gr", "grama", "gramas"],
+    "kg": ["kg", "kgs", "quilo", "quilos", "quilograma", "quilogramas", "kilo", "kilograma"],
+    "tonelada": ["t", "ton", "tonelada", "toneladas"],
+    "mililitro": ["ml", "mililitro", "mililitros"],
+    "litro": ["l", "lt", "litro", "litros"],
+    "unidade": ["un", "und", "unid", "unidade", "unidades"],
+    "pacote": ["pct", "pacote", "pacotes"],
+    "duzia": ["dz", "duzia", "duzias", "dúzia", "dúzias"],
+}
+
+
+# Limite de grafias livres (ex: " Quilograma ") guardadas no atalho de code()
+MAX_CACHED_SPELLINGS = 1024
+
+
+def normalize_unit_name(name: str) -> str:
+    """
+    Deixa o nome da unidade em minúsculas, sem espaços nas pontas e sem acentos
+    (normalized_unit_expression em utils.unit_converter faz o mesmo em SQL)
+    """
+    folded = unicodedata.normalize("NFKD", name.strip().lower())
+    return "".join(c for c in folded if not unicodedata.combining(c))
+
+
+class UnitRegistry:
+    """
+    Registro de unidades montado uma única vez.
+
+    Cada unidade conhecida recebe um código inteiro pequeno (0 é reservado para
+    unidades desconhecidas) e os fatores de conversão entre todos os pares de
+    códigos ficam pré-calculados em uma matriz densa, incluindo conversões
+    transitivas dentro da mesma dimensão (ex: grama -> kg -> tonelada).
+    Pares desconhecidos ou de dimensões diferentes têm fator 1.
+    """
+
+    UNKNOWN = 0
+
+    def __init__(self, units: dict, aliases: dict):
+        self.names = [None] + list(units)
+        self.dimensions = [None] + [units[name][0] for name in units]
+        self.scales = [None] + [units[name][1] for name in units]
+
+        self._spellings = {}
+        for name, spellings in aliases.items():
+            code = self.names.index(name)
+            for spelling in spellings:
+                self._spellings[spelling] = code
+        self._alias_codes = {normalize_unit_name(spelling): code for spelling, code in self._spellings.items()}
+        self._codes = dict(self._spellings)
+
+        size = len(self.names)
+        self.factors = [[Decimal('1')] * size for _ in range(size)]
+        for measure in range(1, size):
+            for price in range(1, size):
+                if self.dimensions[measure] == self.dimensions[price]:
+                    self.factors[measure][price] = self.scales[price] / self.scales[measure]
+        self.float_factors = np.array(self.factors, dtype=np.float64)
+
+    def code(self, unit: str | None) -> int:
+        """Retorna o código da unidade (UNKNOWN se não for reconhecida)"""
+        if unit is None:
+            return self.UNKNOWN
+        code = self._codes.get(unit)
+        if code is None:
+            code = self._alias_codes.get(normalize_unit_name(unit), self.UNKNOWN)
+            # Texto livre de requisições e agentes: só guarda grafias reconhecidas, até o limite
+            if code != self.UNKNOWN and len(self._codes) < len(self._spellings) + MAX_CACHED_SPELLINGS:
+                self._codes[unit] = code
+        return code
+
+    def codes(self, units: Sequence[str | None]) -> list[int]:
+        """Retorna os códigos de várias unidades"""
+        return [self.code(unit) for unit in units]
+
+    def factor(self, measure_code: int, price_code: int) -> Decimal:
+        """Quantas unidades de measure_code cabem em uma unidade de price_code"""
+        return self.factors[measure_code][price_code]
+
+    def conversion_factor(self, measure_unity: str | None, price_unit: str | None) -> Decimal:
+        """Fator de conversão entre dois nomes de unidade"""
+        return self.factors[self.code(measure_unity)][self.code(price_unit)]
+
+    def aliases_by_code(self) -> dict[int, list[str]]:
+        """Grafias conhecidas de cada código, já normalizadas, usadas para montar expressões SQL"""
+        aliases = {}
+        for spelling, code in self._alias_codes.items():
+            aliases.setdefault(code, []).append(spelling)
+        return aliases
+
+
+UNIT_REGISTRY = UnitRegistry(UNITS, ALIASES)
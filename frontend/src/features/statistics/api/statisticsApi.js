@@ -1,5 +1,8 @@
 import api from '../../../config/api';
 
+// Maior página aceita pelo backend em GET /api/transactions
+const MAX_PAGE_SIZE = 500;
+
 /**
  * Statistics API Service
  * Mapeamento completo das rotas de transactions e dashboard do backend
@@ -8,20 +11,37 @@ import api from '../../../config/api';
 export const statisticsApi = {
   /**
    * GET /api/transactions
-   * Retorna todas as transações ou filtra por item_id
-   * @param {number|null} itemId - ID do item para filtrar (opcional)
-   * @param {number|null} limit - Limite de resultados (opcional)
+   * Retorna uma página de transações (mais recentes primeiro)
+   * @param {Object} options
+   * @param {number|null} options.itemId - ID do item para filtrar (opcional)
+   * @param {number|null} options.limit - Tamanho da página (opcional, padrão do backend: 50)
+   * @param {string|null} options.cursor - Cursor retornado pela página anterior (opcional)
+   * @param {string|null} options.orderType - Tipo da transação (opcional)
+   * @param {string|null} options.startDate - Data inicial 'YYYY-MM-DD' (opcional)
+   * @param {string|null} options.endDate - Data final 'YYYY-MM-DD' (opcional)
+   * @returns {Object} { items, nextCursor } - nextCursor é null na última página
    */
-  getTransactions: async (itemId = null, limit = null) => {
+  getTransactionsPage: async ({
+    itemId = null,
+    limit = null,
+    cursor = null,
+    orderType = null,
+    startDate = null,
+    endDate = null,
+  } = {}) => {
     const params = {};
     if (itemId) params.item_id = itemId;
     if (limit) params.limit = limit;
+    if (cursor) params.cursor = cursor;
+    if (orderType) params.order_type = orderType;
+    if (startDate) params.start_date = startDate;
+    if (endDate) params.end_date = endDate;
 
     const response = await api.get('/api/transactions', { params });
     const data = response.data || [];
 
     // Mapear campos do backend para o frontend
-    return data.map(transaction => ({
+    const items = data.map(transaction => ({
       id: transaction.id,
       item_id: transaction.item_id,
       item_name: transaction.item_name || `Item #${transaction.item_id}`, // Fallback se não houver nome
@@ -36,6 +56,34 @@ export const statisticsApi = {
       created_at: transaction.create_at, // Manter também
       create_at: transaction.create_at, // Manter original
     }));
+
+    return {
+      items,
+      nextCursor: response.headers?.['x-next-cursor'] || null,
+    };
+  },
+
+  /**
+   * GET /api/transactions
+   * Retorna as transações (mais recentes primeiro), opcionalmente filtradas por item_id,
+   * seguindo o cursor X-Next-Cursor até juntar `limit` transações ou chegar à última página
+   * @param {number|null} itemId - ID do item para filtrar (opcional)
+   * @param {number|null} limit - Limite de resultados (opcional, sem limite traz todas)
+   */
+  getTransactions: async (itemId = null, limit = null) => {
+    const transactions = [];
+    let cursor = null;
+    do {
+      const remaining = limit ? limit - transactions.length : MAX_PAGE_SIZE;
+      const page = await statisticsApi.getTransactionsPage({
+        itemId,
+        cursor,
+        limit: Math.min(remaining, MAX_PAGE_SIZE),
+      });
+      transactions.push(...page.items);
+      cursor = page.nextCursor;
+    } while (cursor && (!limit || transactions.length < limit));
+    return transactions;
   },
 
   /**